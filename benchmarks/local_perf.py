@@ -0,0 +1,120 @@
+"""
+End-to-end performance run against the local SQLite stand-in (no network needed).
+
+Loads synthetic players and scores, then times leaderboard requests, score
+ingestion and the mini task queries through the same code paths the bot uses.
+
+Usage:
+    python -m benchmarks.local_perf [--days 180] [--players 20] [--repeat 5]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from bot.functions import sql_helper
+from bot.functions.admin import direct_path_finder
+from bot.functions.local_db import LocalBackend
+
+SAMPLE_SCORES = [
+    ('wordle', "Wordle 1,170 4/6*\n\n⬛⬛⬛⬛⬛\n🟨⬛⬛⬛🟨\n⬛🟩🟩🟩🟩\n🟩🟩🟩🟩🟩"),
+    ('crosswordle', "Daily Crosswordle 961: 1m 49s <https://crosswordle.vercel.app/?daily=1>"),
+    ('connections', "Connections\nPuzzle #453\n🟪🟩🟦🟨\n🟪🟪🟪🟪\n🟦🟦🟦🟦\n🟩🟩🟩🟩\n🟨🟨🟨🟨"),
+]
+
+def _report(label, timings):
+    timings_ms = [t * 1000 for t in timings]
+    print(f"{label:<45} n={len(timings_ms):<4} "
+          f"mean={statistics.mean(timings_ms):8.2f}ms  "
+          f"p50={statistics.median(timings_ms):8.2f}ms  "
+          f"max={max(timings_ms):8.2f}ms")
+
+async def _time(coro_fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await coro_fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+async def run(days: int, players: int, repeat: int, path: str):
+    backend = LocalBackend(path)
+    start = time.perf_counter()
+    counts = backend.load_synthetic_data(days=days, players=players)
+    print(f"Loaded synthetic data in {time.perf_counter() - start:.2f}s: {counts}")
+    sql_helper.set_backend(backend)
+
+    from bot.functions.daily_standings import reconcile_standings
+    start = time.perf_counter()
+    partitions = await reconcile_standings(days=None)
+    print(f"Built daily standings ({partitions} partitions) in {time.perf_counter() - start:.2f}s")
+
+    from bot.functions import ranking_engine
+    from bot.functions.daily_standings import RECONCILE_DAYS
+    start = time.perf_counter()
+    loaded = await ranking_engine.reload(days=RECONCILE_DAYS)
+    print(f"Loaded {loaded} standings rows into the ranking engine in {time.perf_counter() - start:.2f}s")
+
+    # Imported after the backend is set so nothing tries to reach MySQL
+    from bot.commands.leaderboards import Leaderboards
+    from bot.functions.save_scores import process_game_score
+    from bot.functions.save_messages import is_game_score
+    from bot.functions.mini_warning import get_current_mini_date, find_users_to_warn
+    from bot.functions.df_to_image import render_cache_stats
+
+    Leaderboards._commands_loaded = True  # no command tree offline
+    leaderboards = Leaderboards(client=None, tree=None)
+
+    for game, timeframe in [('mini', 'today'), ('wordle', 'today'), ('winners', 'today'),
+                            ('wordle', 'this month'), ('mini', 'this year'), ('wordle', 'all time'),
+                            ('winners', 'last month')]:
+        timings = await _time(lambda: leaderboards.show_leaderboard(game=game, timeframe=timeframe), repeat)
+        _report(f"leaderboard {game} / {timeframe}", timings)
+    print(f"Render cache: {render_cache_stats()}")
+
+    today = datetime.now().date()
+    with open(direct_path_finder('files', 'queries', 'active', 'daily_games.sql'), 'r', encoding='utf-8') as file:
+        daily_query = file.read()
+    daily_params = {'game_date': today, 'game_name': 'wordle', 'limit': 15, 'offset': 0, 'member_nm': 'player01'}
+    _report("daily board query (wordle)", await _time(lambda: sql_helper.execute_query(daily_query, daily_params), repeat))
+
+    async def engine_page():
+        ranking_engine.board_page('wordle', today, 15, 0, 'player01')
+    _report("daily board from ranking engine (wordle)", await _time(engine_page, repeat))
+
+    mini_date = get_current_mini_date()
+    with open(direct_path_finder('files', 'queries', 'active', 'mini_leaders.sql'), 'r', encoding='utf-8') as file:
+        leader_query = file.read()
+    _report("mini leader query", await _time(lambda: sql_helper.execute_query(leader_query, {'game_date': mini_date}), repeat))
+    _report("find_users_to_warn", await _time(find_users_to_warn, repeat))
+
+    timings = []
+    now = datetime.now(timezone.utc)
+    for i in range(repeat * len(SAMPLE_SCORES)):
+        _, content = SAMPLE_SCORES[i % len(SAMPLE_SCORES)]
+        message = SimpleNamespace(
+            content=content,
+            created_at=now - timedelta(seconds=i),
+            author=SimpleNamespace(name=f"player{(i % players) + 1:02d}"),
+        )
+        is_score, game_name, game_info = is_game_score(message.content)
+        start = time.perf_counter()
+        await process_game_score(message, game_name, game_info)
+        timings.append(time.perf_counter() - start)
+    _report("process_game_score", timings)
+
+    backend.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=180)
+    parser.add_argument('--players', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--path', default=':memory:', help="SQLite file to use (default: in-memory)")
+    args = parser.parse_args()
+    asyncio.run(run(args.days, args.players, args.repeat, args.path))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Before/after timings for the leaderboard queries that filter inside the view chain.
+
+Runs each old query (files/queries/inactive/*_view.sql, filtering the finished view)
+and its replacement (files/queries/active/*.sql, filtering the base tables first, or
+for daily_games reading games.daily_standings) with the same arguments, checks they
+return the same rows and reports the timings. Locally, game_aggregate_stats also adds
+up whole months from games.monthly_rollups; with --mysql it ranks every day, since
+building the rollups would write to the database.
+
+Uses the local SQLite stand-in with synthetic data by default; pass --mysql to run
+against the database configured in .env instead (read only).
+
+Usage:
+    python -m benchmarks.pushdown_queries [--days 365] [--players 20] [--repeat 5] [--mysql]
+"""
+import argparse
+import asyncio
+import time
+from datetime import date, timedelta
+
+from benchmarks.local_perf import _report
+from bot.functions import sql_helper
+from bot.functions.admin import direct_path_finder
+from bot.functions import monthly_rollups
+from bot.functions.daily_standings import reconcile_standings
+from bot.functions.local_db import LocalBackend
+
+# (label, old query file, new query file, old positional params, new named params)
+def _cases(today: date):
+    month_start = today.replace(day=1)
+    year_start = today.replace(month=1, day=1)
+    # One page big enough for every row, nobody pinned
+    page = {'limit': 10000, 'offset': 0, 'member_nm': None}
+    cases = []
+    for game in ['wordle', 'mini', 'daily', 'connections']:
+        cases.append((f"daily_games {game}", 'inactive/daily_games_view.sql', 'active/daily_games.sql',
+                      [today, game], {'game_date': today, 'game_name': game, **page}))
+    last_month_end = month_start - timedelta(days=1)
+    for game, start, end in [('wordle', month_start, today), ('mini', year_start, today), ('daily', year_start, today),
+                             ('wordle', date(2020, 1, 1), today), ('mini', last_month_end.replace(day=1), last_month_end),
+                             ('wordle', year_start, today.replace(month=12, day=31))]:
+        cases.append((f"game_aggregate_stats {game} {start}..{end}",
+                      'inactive/game_aggregate_stats_view.sql', 'active/game_aggregate_stats.sql',
+                      [start, end, game], {'start_date': start, 'end_date': end, 'game_name': game, **page}))
+    cases.append(("mini leaders", 'inactive/mini_leaders_view.sql', 'active/mini_leaders.sql',
+                  [today], {'game_date': today}))
+    return cases
+
+def _read(relative_path: str) -> str:
+    with open(direct_path_finder('files', 'queries', *relative_path.split('/')), 'r', encoding='utf-8') as file:
+        return file.read()
+
+def _normalize(rows, columns=None):
+    # columns: compare only these (the paged queries add pos/total_rows)
+    return sorted(tuple(str(row[c]) for c in (columns or row.keys())) for row in rows)
+
+async def _time(query, params, repeat):
+    timings, rows = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = await sql_helper.execute_query(query, params, lane='background')
+        timings.append(time.perf_counter() - start)
+    return timings, rows
+
+async def run(days: int, players: int, repeat: int, use_mysql: bool):
+    backend = None
+    if not use_mysql:
+        backend = LocalBackend()
+        print(f"Loaded synthetic data: {backend.load_synthetic_data(days=days, players=players)}")
+        sql_helper.set_backend(backend)
+
+        # daily_games.sql reads games.daily_standings
+        start = time.perf_counter()
+        partitions = await reconcile_standings(days=None)
+        print(f"Built daily standings ({partitions} partitions) in {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        months = await monthly_rollups.backfill_rollups()
+        print(f"Built monthly rollups ({months} months) in {time.perf_counter() - start:.2f}s")
+
+    mismatches = 0
+    for label, old_file, new_file, old_params, new_params in _cases(date.today() - timedelta(days=1)):
+        if new_file == 'active/game_aggregate_stats.sql':
+            if use_mysql:
+                new_params.update(monthly_rollups.no_rollup_params(new_params['start_date'], new_params['end_date']))
+            else:
+                new_params.update(await monthly_rollups.rollup_params(
+                    new_params['game_name'], new_params['start_date'], new_params['end_date']))
+        old_timings, old_rows = await _time(_read(old_file), old_params, repeat)
+        new_timings, new_rows = await _time(_read(new_file), new_params, repeat)
+        _report(f"{label} (view)", old_timings)
+        _report(f"{label} (pushdown)", new_timings)
+        columns = list(old_rows[0].keys()) if old_rows else None
+        if _normalize(old_rows, columns) != _normalize(new_rows, columns):
+            mismatches += 1
+            print(f"  MISMATCH: {len(old_rows)} row(s) from the view, {len(new_rows)} from the pushdown query")
+        else:
+            print(f"  same {len(new_rows)} row(s)")
+
+    if backend:
+        backend.close()
+    else:
+        await sql_helper.close_pool()
+    print("All results match" if mismatches == 0 else f"{mismatches} result mismatch(es)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--players', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--mysql', action='store_true', help="run against the configured MySQL server")
+    args = parser.parse_args()
+    asyncio.run(run(args.days, args.players, args.repeat, args.mysql))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Per-render CPU cost of leaderboard images, with and without the font/text-width caches.
+
+"cold" loads the font and measures every string from scratch on each render, like
+df_to_image used to; "warm" reuses one LeaderboardRenderer. The content-keyed
+render cache is bypassed in both, so every iteration really draws the image.
+
+Then compares encoded size and encode time of a plain full-RGB PNG with the configured
+encoding (IMAGE_FORMAT, IMAGE_COLORS, IMAGE_OPTIMIZE).
+
+Usage:
+    python -m benchmarks.render_perf [--rows 20] [--repeat 50]
+"""
+import argparse
+import io
+import statistics
+import time
+
+import pandas as pd
+
+from bot.functions.df_to_image import (LeaderboardRenderer, LEFT_ALIGNED_COLUMNS, RIGHT_ALIGNED_COLUMNS, get_font,
+                                       encode_image, IMAGE_FORMAT, IMAGE_COLORS, IMAGE_OPTIMIZE)
+
+def _sample_frames(rows: int):
+    players = [f"Player{i:02d}" for i in range(rows)]
+    daily = pd.DataFrame({
+        'rnk': range(1, rows + 1),
+        'player': players,
+        'score': [f"{i // 60}:{i % 60:02d}" for i in range(30, 30 + rows)],
+        'added_at': [f"{(i % 12) + 1}:{i % 60:02d}PM" for i in range(rows)],
+    })
+    aggregate = pd.DataFrame({
+        'rank': range(1, rows + 1),
+        'player': players,
+        'points': range(3000, 3000 - rows, -1),
+        'avg': [round(30 + i * 1.7, 1) for i in range(rows)],
+        '1st': [rows - i for i in range(rows)],
+        '2nd': [i % 7 for i in range(rows)],
+        '3rd': [i % 5 for i in range(rows)],
+        '4th': [i % 4 for i in range(rows)],
+        '5th': [i % 3 for i in range(rows)],
+        'games': [200 - i for i in range(rows)],
+    })
+    return [('daily', daily), ('aggregate', aggregate)]
+
+def _rgb_png(img) -> bytes:
+    # What the renderer used to produce
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+def _cpu_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        timings.append((time.process_time() - start) * 1000)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    title, subtitle = "Mini Leaderboard", "Date Range: 2026-01-01 to 2026-10-18"
+    warm = LeaderboardRenderer()
+
+    def cold_render(df):
+        get_font.cache_clear()
+        LeaderboardRenderer().render(df, title, subtitle, LEFT_ALIGNED_COLUMNS, RIGHT_ALIGNED_COLUMNS)
+
+    for label, df in _sample_frames(args.rows):
+        cold = _cpu_ms(lambda: cold_render(df), args.repeat)
+        hot = _cpu_ms(lambda: warm.render(df, title, subtitle, LEFT_ALIGNED_COLUMNS, RIGHT_ALIGNED_COLUMNS), args.repeat)
+        saving = 1 - statistics.mean(hot) / statistics.mean(cold)
+        print(f"{label:<10} {len(df)} rows  cold={statistics.mean(cold):7.2f}ms  "
+              f"warm={statistics.mean(hot):7.2f}ms  cpu saving={saving:.0%}")
+
+    print(f"Encoding: {IMAGE_FORMAT}, {IMAGE_COLORS or 'full RGB'} colors, optimize={IMAGE_OPTIMIZE}")
+    for label, df in _sample_frames(args.rows):
+        img = warm.draw(df, title, subtitle, LEFT_ALIGNED_COLUMNS, RIGHT_ALIGNED_COLUMNS)
+        plain = _cpu_ms(lambda: _rgb_png(img), args.repeat)
+        tuned = _cpu_ms(lambda: encode_image(img), args.repeat)
+        print(f"{label:<10} rgb png={len(_rgb_png(img)):>7} bytes {statistics.mean(plain):6.2f}ms  "
+              f"encoded={len(encode_image(img)):>7} bytes {statistics.mean(tuned):6.2f}ms")
+
+if __name__ == '__main__':
+    main()
@@ -4,12 +4,16 @@ from datetime import datetime
 import discord
 from discord import app_commands
 from bot.functions.admin import direct_path_finder
+from bot.functions.state_store import get_state, update_state, guild_key
 from bot.connections.config import DEBUG_MODE, BOT_NAME, SYSTEM_NAME
 import openai
 from typing import Dict, List, Tuple
 import tiktoken
 import re
 
+# Usage log of every /gpt request (state store key)
+GPT_HISTORY_KEY = 'gpt/gpt_history.json'
+
 class GPT:
     def __init__(self, client, tree):
         self.client = client
@@ -140,18 +144,14 @@ class GPT:
                 # Get user's display name
                 user_display = interaction.user.display_name
                 
-                # Load daily totals from history file
-                history_file = direct_path_finder('files', 'gpt', 'gpt_history.json')
+                # Load daily totals from the usage log
                 daily_tokens = 0
                 daily_cost = 0.0
-                if os.path.exists(history_file):
-                    with open(history_file, 'r', encoding='utf-8') as f:
-                        logs = json.load(f)
-                        current_date = datetime.now().strftime('%Y-%m-%d')
-                        for log in logs:
-                            if log.get('timestamp', '').startswith(current_date):
-                                daily_tokens += log.get('context_info', {}).get('total_tokens', 0)
-                                daily_cost += log.get('context_info', {}).get('cost', 0.0)
+                current_date = datetime.now().strftime('%Y-%m-%d')
+                for log in get_state(GPT_HISTORY_KEY, []):
+                    if log.get('timestamp', '').startswith(current_date):
+                        daily_tokens += log.get('context_info', {}).get('total_tokens', 0)
+                        daily_cost += log.get('context_info', {}).get('cost', 0.0)
                 
                 # Round up daily cost to nearest penny
                 daily_cost = round(daily_cost + 0.005, 2)
@@ -326,18 +326,8 @@ class GPT:
     def log_prompt_analysis(self, interaction: discord.Interaction, message_count: int = 0, filter_params: Dict = None, input_tokens: int = 0, output_tokens: int = 0, total_tokens: int = 0, cost: float = 0.0, request_id: str = None):
         """Log the prompt analysis to a JSON file."""
         try:
-            # Use central history file
-            log_file = direct_path_finder('files', 'gpt', 'gpt_history.json')
-            
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(log_file), exist_ok=True)
-            
-            # Load existing logs or create new
-            if os.path.exists(log_file):
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    logs = json.load(f)
-            else:
-                logs = []
+            # Central usage log
+            logs = get_state(GPT_HISTORY_KEY, [])
             
             # Get current date for daily totals
             current_date = datetime.now().strftime('%Y-%m-%d')
@@ -388,11 +378,8 @@ class GPT:
                 "filter_params": filter_params
             }
             
-            logs.append(new_entry)
-            
             # Save updated logs
-            with open(log_file, 'w', encoding='utf-8') as f:
-                json.dump(logs, f, indent=2)
+            update_state(GPT_HISTORY_KEY, lambda logs: logs + [new_entry], [])
                 
         except Exception as e:
             print(f"[ERROR] Error logging prompt analysis: {str(e)}")
@@ -409,11 +396,7 @@ class GPT:
             if not guild_name:
                 raise ValueError("Guild name is required for GPT responses")
                 
-            config_path = direct_path_finder('files', 'guilds', guild_name, 'config.json')
-            guild_config = {}
-            if os.path.exists(config_path):
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    guild_config = json.load(f)
+            guild_config = get_state(guild_key(guild_name, 'config.json'), {})
             
             # Preprocess the prompt to replace channel IDs with names
             import re
@@ -496,18 +479,14 @@ class GPT:
                 messages = self._trim_messages_to_token_limit(messages)
                 input_tokens = sum(self._count_tokens(msg["content"]) for msg in messages)
 
-            # Load daily totals from history file
-            history_file = direct_path_finder('files', 'gpt', 'gpt_history.json')
+            # Load daily totals from the usage log
             daily_tokens = 0
             daily_cost = 0.0
-            if os.path.exists(history_file):
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    logs = json.load(f)
-                    current_date = datetime.now().strftime('%Y-%m-%d')
-                    for log in logs:
-                        if log.get('timestamp', '').startswith(current_date):
-                            daily_tokens += log.get('context_info', {}).get('total_tokens', 0)
-                            daily_cost += log.get('context_info', {}).get('cost', 0.0)
+            current_date = datetime.now().strftime('%Y-%m-%d')
+            for log in get_state(GPT_HISTORY_KEY, []):
+                if log.get('timestamp', '').startswith(current_date):
+                    daily_tokens += log.get('context_info', {}).get('total_tokens', 0)
+                    daily_cost += log.get('context_info', {}).get('cost', 0.0)
             daily_cost = round(daily_cost + 0.005, 2)
 
             response = await client.chat.completions.create(
@@ -1,3 +1,5 @@
+import asyncio
+import io
 import json
 import os
 import discord
@@ -5,18 +7,107 @@ from discord import app_commands
 from discord.ext import commands
 from bot.functions import execute_query
 from bot.functions.admin import direct_path_finder
-from bot.functions.df_to_image import df_to_image
+from bot.functions.render_executor import render_buffer
+from bot.functions.df_to_image import TextTable, df_to_table, fits_as_text, IMAGE_EXTENSION
+from bot.functions import ranking_engine, monthly_rollups
+from bot.functions.daily_standings import IMPORTED_GAMES
+from bot.connections.config import DEBUG_MODE
 from datetime import datetime, timedelta
 import pandas as pd
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 # Actorle analysis removed - keeping actorle as regular game only
 
+LEADERBOARD_FILENAME = f'leaderboard.{IMAGE_EXTENSION}'
+# Rows per leaderboard image; larger boards get page buttons
+LEADERBOARD_PAGE_SIZE = 15
+# How a board is sent: 'auto' uses an embed for boards that fit as text, else an image
+RENDER_MODES = ('auto', 'image', 'text', 'embed')
+# Places per game shown in the daily digest
+DIGEST_TOP_N = 3
+# Discord allows 25 fields per embed
+EMBED_MAX_FIELDS = 25
+
+def leaderboard_message(result) -> dict:
+    """send() keyword arguments for a rendered leaderboard (image, text table or error message)."""
+    if isinstance(result, io.BytesIO):
+        return {'file': discord.File(result, filename=LEADERBOARD_FILENAME)}
+    if isinstance(result, list):  # daily digest embeds
+        return {'embeds': result}
+    if isinstance(result, TextTable):
+        if result.as_embed:
+            return {'embed': discord.Embed(title=result.title, description=f"{result.subtitle}\n{result.code_block}")}
+        return {'content': result.content()}
+    return {'content': str(result)}
+
+def _edit_message(result) -> dict:
+    # Replaces whatever the previous page was sent as
+    message = {'attachments': [], 'embed': None, 'content': None}
+    if isinstance(result, bytes):
+        result = io.BytesIO(result)
+    sent = leaderboard_message(result)
+    if 'file' in sent:
+        message['attachments'] = [sent.pop('file')]
+    message.update(sent)
+    return message
+
+class LeaderboardPager(discord.ui.View):
+    """Previous/next buttons for a multi-page leaderboard; pages are rendered on demand and kept."""
+
+    def __init__(self, leaderboards, game: str, timeframe: str, member_nm: str, page_count: int, first_page,
+                 render_mode: str = 'auto'):
+        super().__init__(timeout=300)
+        self.leaderboards = leaderboards
+        self.game = game
+        self.timeframe = timeframe
+        self.member_nm = member_nm
+        self.page_count = page_count
+        self.render_mode = render_mode
+        self.page = 0
+        self.pages = {0: first_page}  # image bytes or a TextTable
+        self.message = None
+        self._update_buttons()
+
+    def _update_buttons(self):
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= self.page_count - 1
+
+    async def _show(self, interaction: discord.Interaction, page: int):
+        await interaction.response.defer()
+        if page not in self.pages:
+            image, _ = await self.leaderboards.render_leaderboard(
+                game=self.game, timeframe=self.timeframe, page=page, member_nm=self.member_nm,
+                render_mode=self.render_mode)
+            if isinstance(image, str):
+                await interaction.followup.send(image, ephemeral=True)
+                return
+            self.pages[page] = image.getvalue() if isinstance(image, io.BytesIO) else image
+        self.page = page
+        self._update_buttons()
+        await interaction.edit_original_response(**_edit_message(self.pages[page]), view=self)
+
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page - 1)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page + 1)
+
+    async def on_timeout(self):
+        if self.message:
+            try:
+                await self.message.edit(view=None)
+            except discord.HTTPException:
+                pass
+
 class Leaderboards(commands.Cog):
     _commands_loaded = False  # Class variable to track if commands are already loaded
     
     def __init__(self, client, tree):
         self.client = client
         self.tree = tree
+        # Identical requests in flight at the same time share one query and render
+        self._inflight = {}
         # Only load commands if they haven't been loaded yet
         if not Leaderboards._commands_loaded:
             self.load_commands()
@@ -35,6 +126,8 @@ class Leaderboards(commands.Cog):
             # Special description for my_scores command
             if command_name == "my_scores":
                 command_description = "Show your personal scores for a specific date (default: today)"
+            elif command_name == "digest":
+                command_description = "Show the top players of every game for a day (default: today)"
             else:
                 command_description = f"Show {command_name.capitalize()} leaderboard"
             
@@ -58,13 +151,24 @@ class Leaderboards(commands.Cog):
                 
                 # Get the leaderboard
                 try:
-                    img_path = await self.show_leaderboard(game=name, interaction=interaction, timeframe=timeframe)
+                    image, page_count = await self.render_leaderboard(
+                        game=name, interaction=interaction, timeframe=timeframe, member_nm=interaction.user.name)
                     
-                    # Send the image file
-                    if os.path.exists(img_path):
-                        await interaction.followup.send(file=discord.File(img_path))
+                    # Send the leaderboard (or the message explaining why there isn't one)
+                    if isinstance(image, str):
+                        await interaction.followup.send(image)
+                    elif page_count > 1:
+                        # Other pages are rendered when someone asks for them
+                        # Later pages are sent the same way as the first
+                        if isinstance(image, io.BytesIO):
+                            first_page, render_mode = image.getvalue(), 'image'
+                        else:
+                            first_page, render_mode = image, 'embed' if image.as_embed else 'text'
+                        pager = LeaderboardPager(self, name, timeframe, interaction.user.name, page_count,
+                                                 first_page, render_mode)
+                        pager.message = await interaction.followup.send(**leaderboard_message(image), view=pager, wait=True)
                     else:
-                        await interaction.followup.send(f"Error: Could not find leaderboard image at {img_path}")
+                        await interaction.followup.send(**leaderboard_message(image))
                 except Exception as e:
                     await interaction.followup.send(f"Error: {str(e)}", ephemeral=True)
                 
@@ -155,144 +259,309 @@ class Leaderboards(commands.Cog):
         today = datetime.now().date()
         return today, today
 
-    # leaderboard for any game
+    @staticmethod
+    def _page_params(page: int, member_nm: Optional[str], limit: int = LEADERBOARD_PAGE_SIZE) -> dict:
+        return {'limit': limit, 'offset': page * LEADERBOARD_PAGE_SIZE, 'member_nm': member_nm}
+
+    @staticmethod
+    def _paginate(df: pd.DataFrame, page: int) -> Tuple[pd.DataFrame, int]:
+        """Drop the paging columns, and put a separator above a pinned row that isn't on this page."""
+        total_rows = int(df['total_rows'].iloc[0])
+        page_count = max(1, -(-total_rows // LEADERBOARD_PAGE_SIZE))
+        position = df['pos'] if 'pos' in df.columns else df['rank']
+        on_page = (position > page * LEADERBOARD_PAGE_SIZE) & (position <= (page + 1) * LEADERBOARD_PAGE_SIZE)
+        df = df.drop(columns=[c for c in ['pos', 'total_rows'] if c in df.columns])
+
+        if not on_page.all():
+            separator = pd.DataFrame([{col: '...' for col in df.columns}])
+            df = pd.concat([df[on_page.values], separator, df[~on_page.values]], ignore_index=True)
+        return df, page_count
+
+    # leaderboard for any game (first page, nobody pinned)
     async def show_leaderboard(self, interaction: Optional[discord.Interaction] = None, game: str = None, 
-                             timeframe: Optional[str] = 'today') -> str:
+                             timeframe: Optional[str] = 'today', lane: str = 'interactive',
+                             render_mode: str = 'auto') -> Union[io.BytesIO, TextTable, str]:
+        image, _ = await self.render_leaderboard(interaction=interaction, game=game, timeframe=timeframe, lane=lane,
+                                                 render_mode=render_mode)
+        return image
+
+    async def _shared(self, key, start):
+        """Await the in-flight task for key, starting it with start() if there isn't one."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(start())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: one caller giving up mustn't cancel the work the others are waiting on
+        return await asyncio.shield(task)
+
+    async def render_leaderboard(self, interaction: Optional[discord.Interaction] = None, game: str = None,
+                                 timeframe: Optional[str] = 'today', lane: str = 'interactive',
+                                 page: int = 0, member_nm: Optional[str] = None,
+                                 render_mode: str = 'auto') -> Tuple[Union[io.BytesIO, TextTable, str], int]:
+        """
+        Render one page of a leaderboard. Returns (image, text table or error message, page count).
+
+        render_mode is one of RENDER_MODES; 'auto' sends small boards as an embed
+        (see df_to_image.fits_as_text) and everything else as an image.
+
+        Daily and aggregate boards are paged in SQL (LEADERBOARD_PAGE_SIZE rows per page),
+        with member_nm's own row pinned underneath when it isn't on the page.
+        Concurrent calls for the same page (game, resolved dates, and the user for my_scores)
+        share one in-flight query; each caller's pinned row is looked up separately, and
+        callers left with the same rows share one render.
+        """
+        start_date, end_date = self.parse_timeframe_or_date(timeframe)
+        user_nm = interaction.user.name if (game == "my_scores" and interaction) else None
+        if render_mode not in RENDER_MODES:
+            raise ValueError(f"render_mode must be one of {RENDER_MODES}")
+        board_key = (game, start_date, end_date, page, user_nm)
+
+        try:
+            # Every game's board for one day, in one query and one render
+            if game == "digest":
+                image = await self._shared(board_key + (render_mode,), lambda: self._render_digest(
+                    lane, start_date, end_date, render_mode))
+                page_count = 1
+            else:
+                df = await self._shared(board_key, lambda: self._load_board(
+                    interaction, game, lane, page, start_date, end_date))
+                if isinstance(df, str):
+                    return df, 1
+                pinned = await self._pinned_rows(df, game, lane, start_date, end_date, member_nm)
+                if not pinned.empty:
+                    df = pd.concat([df, pinned], ignore_index=True)
+                pinned_players = tuple(pinned['player']) if not pinned.empty else ()
+                image, page_count = await self._shared(board_key + (render_mode, pinned_players), lambda: self._render_board(
+                    df, interaction, game, page, start_date, end_date, render_mode))
+        except Exception as e:
+            error_message = f"Error showing leaderboard: {str(e)}"
+            print(error_message)
+            raise Exception(error_message)
+
+        # Each caller gets its own buffer to hand to discord.File
+        if isinstance(image, io.BytesIO):
+            image = io.BytesIO(image.getvalue())
+        return image, page_count
+
+    @staticmethod
+    def _clean(result) -> pd.DataFrame:
+        df = pd.DataFrame(result)
+        # Clean any NaN values that might have been introduced during DataFrame processing
+        df = df.fillna("-")
+        # Also clean any string representations of None/nan
+        return df.replace(['None', 'nan', 'NaN', 'null', 'NULL'], "-")
+
+    async def _board_rows(self, interaction, game, lane, page, start_date, end_date,
+                          member_nm: Optional[str] = None, limit: int = LEADERBOARD_PAGE_SIZE) -> Union[list, str]:
+        """The query result for one page of a board (limit 0: only member_nm's rows), or an error message."""
+        # Special case for my_scores command
+        if game == "my_scores":
+            # For my_scores, we need to use the daily_myscores.sql query
+            # and pass the discord username and game_date as parameters
+            sql_file = "daily_myscores.sql"
+            if interaction:
+                # Get the discord username from the interaction
+                params = [interaction.user.name, start_date]
+            else:
+                # If no interaction provided, we can't determine the user
+                raise ValueError("my_scores command requires user interaction to determine discord username")
+
+        # Special case for winners - use different queries based on timeframe
+        elif game == "winners":
+            if start_date == end_date:
+                # Single day winners
+                sql_file = "daily_winners.sql"
+                params = [start_date]
+            else:
+                # Date range winners (aggregate)
+                sql_file = "aggregate_winners.sql"
+                params = [start_date, end_date]
+        # Determine if we need daily scores or aggregate stats for other games
+        elif start_date == end_date:
+            # Use daily scores query for single days
+            sql_file = "daily_games.sql"
+            params = {'game_date': start_date, 'game_name': game}
+            params.update(self._page_params(page, member_nm, limit))
+        else:
+            # Use aggregate stats query for date ranges
+            sql_file = "game_aggregate_stats.sql"
+            params = {'start_date': start_date, 'end_date': end_date, 'game_name': game}
+            params.update(self._page_params(page, member_nm, limit))
+            params.update(await monthly_rollups.rollup_params(game, start_date, end_date, lane=lane))
+
+        # Recent daily boards are held in memory, so skip the database for them
+        if sql_file == "daily_games.sql":
+            result = ranking_engine.board_page(game, start_date, params['limit'], params['offset'], member_nm)
+            if result is not None:
+                return result
+
+        # Check if the SQL file exists
+        sql_file_path = direct_path_finder('files', 'queries', 'active', sql_file)
+        if not os.path.exists(sql_file_path):
+            error_message = f"Error: SQL file '{sql_file}' not found."
+            print(error_message)
+            return error_message
+
+        # Read the SQL query from the file
+        with open(sql_file_path, 'r', encoding='utf-8') as file:
+            query = file.read()
+
+        try:
+            return await execute_query(query, params, lane=lane)
+        except Exception as e:
+            print(f"Error executing query: {str(e)}")
+            return f"Error executing query: {str(e)}"
+
+    async def _load_board(self, interaction, game, lane, page, start_date, end_date) -> Union[pd.DataFrame, str]:
+        """One page of a board with nobody pinned, or the message explaining why there isn't one."""
+        result = await self._board_rows(interaction, game, lane, page, start_date, end_date)
+        if isinstance(result, str):
+            return result
+        df = self._clean(result)
+
+        # Check if DataFrame is empty
+        if df.empty:
+            print(f"No data found for {game}")
+            return f"No data available for {game}"
+        return df
+
+    async def _pinned_rows(self, board: pd.DataFrame, game, lane, start_date, end_date,
+                           member_nm: Optional[str]) -> pd.DataFrame:
+        """member_nm's own rows on a paged board that aren't already on the page."""
+        if not member_nm or 'total_rows' not in board.columns:
+            return pd.DataFrame()
+        result = await self._board_rows(None, game, lane, 0, start_date, end_date, member_nm, limit=0)
+        if isinstance(result, str) or not result:
+            return pd.DataFrame()
+        pinned = self._clean(result)
+        position = 'pos' if 'pos' in board.columns else 'rank'
+        return pinned[~pinned[position].isin(board[position])].reset_index(drop=True)
+
+    @staticmethod
+    def _day_label(day) -> Optional[str]:
+        """'Today' or 'Yesterday' for those dates, else None."""
+        today = datetime.now().date()
+        return {today: "Today", today - timedelta(days=1): "Yesterday"}.get(day)
+
+    async def _render_board(self, df, interaction, game, page, start_date, end_date,
+                            render_mode) -> Tuple[Union[io.BytesIO, TextTable], int]:
+        page_count = 1
+        # Paged queries: work out the page count and mark the pinned row
+        if 'total_rows' in df.columns:
+            df, page_count = self._paginate(df, page)
+
+        # Create and return the image
         try:
-            # Parse timeframe or custom date
-            start_date, end_date = self.parse_timeframe_or_date(timeframe)
+            # Get game detail from the first row if available - check both 'detail' and 'game_detail' columns
+            game_detail = None
+            detail_column = None
             
-            # Special case for my_scores command
-            if game == "my_scores":
-                # For my_scores, we need to use the daily_myscores.sql query
-                # and pass member_nm (discord username) and game_date as parameters
-                sql_file = "daily_myscores.sql"
-                if interaction:
-                    # Get the discord username from the interaction
-                    member_nm = interaction.user.name
-                    params = [member_nm, start_date]
-                else:
-                    # If no interaction provided, we can't determine the user
-                    raise ValueError("my_scores command requires user interaction to determine discord username")
+            if 'detail' in df.columns and not df.empty:
+                game_detail = df['detail'].iloc[0]
+                detail_column = 'detail'
+            elif 'game_detail' in df.columns and not df.empty:
+                game_detail = df['game_detail'].iloc[0]
+                detail_column = 'game_detail'
             
-            # Special case for winners - use different queries based on timeframe
-            elif game == "winners":
-                if timeframe.lower() in ["today", "yesterday"] or start_date == end_date:
-                    # Single day winners
-                    sql_file = "daily_winners.sql"
-                    params = [start_date]
+            # Drop the detail column before creating the image
+            if detail_column:
+                df = df.drop(columns=[detail_column])
+            
+            # Customize title and subtitle with proper date information
+            if game == "my_scores" and interaction:
+                title = f"{interaction.user.display_name}'s Scores"
+                if start_date == end_date:
+                    subtitle = f"Date: {start_date}"
                 else:
-                    # Date range winners (aggregate)
-                    sql_file = "aggregate_winners.sql"
-                    params = [start_date, end_date]
-            # Determine if we need daily scores or aggregate stats for other games
-            elif timeframe.lower() in ["today", "yesterday"] or start_date == end_date:
-                # Use daily scores query for single days
-                sql_file = "daily_games.sql"
-                params = [start_date, game]
+                    subtitle = f"Date Range: {start_date} to {end_date}"
             else:
-                # Use aggregate stats query for date ranges
-                sql_file = "game_aggregate_stats.sql"
-                params = [start_date, end_date, game]
-
-            # Check if the SQL file exists
-            sql_file_path = direct_path_finder('files', 'queries', 'active', sql_file)
-            if not os.path.exists(sql_file_path):
-                error_message = f"Error: SQL file '{sql_file}' not found."
-                print(error_message)
-                return error_message
-
-            # Read the SQL query from the file
-            with open(sql_file_path, 'r', encoding='utf-8') as file:
-                query = file.read()
-
-            # Get the leaderboard
-            try:
-                result = await execute_query(query, params)
-                df = pd.DataFrame(result)
+                title = f"{game.replace('_', ' ').title()} Leaderboard"
                 
-                # Clean any NaN values that might have been introduced during DataFrame processing
-                df = df.fillna("-")
-                
-                # Also clean any string representations of None/nan
-                df = df.replace(['None', 'nan', 'NaN', 'null', 'NULL'], "-")
-                
-            except Exception as e:
-                print(f"Error executing query: {str(e)}")
-                return f"Error executing query: {str(e)}"
-
-            # Check if DataFrame is empty
-            if df.empty:
-                print(f"No data found for {game}")
-                return f"No data available for {game}"
-
-            # Create and return the image
-            try:
-                # Get game detail from the first row if available - check both 'detail' and 'game_detail' columns
-                game_detail = None
-                detail_column = None
-                
-                if 'detail' in df.columns and not df.empty:
-                    game_detail = df['detail'].iloc[0]
-                    detail_column = 'detail'
-                elif 'game_detail' in df.columns and not df.empty:
-                    game_detail = df['game_detail'].iloc[0]
-                    detail_column = 'game_detail'
-                
-                # Drop the detail column before creating the image
-                if detail_column:
-                    df = df.drop(columns=[detail_column])
-                
-                # Customize title and subtitle with proper date information
-                if game == "my_scores" and interaction:
-                    title = f"{interaction.user.display_name}'s Scores"
-                    if start_date == end_date:
-                        subtitle = f"Date: {start_date}"
-                    else:
-                        subtitle = f"Date Range: {start_date} to {end_date}"
+                # Create date-based subtitle (from the dates, so 'today' and today's date render alike)
+                if start_date == end_date:
+                    # Single day
+                    day_label = self._day_label(start_date)
+                    subtitle = f"{day_label} - {start_date}" if day_label else f"Date: {start_date}"
                 else:
-                    title = f"{game.replace('_', ' ').title()} Leaderboard"
-                    
-                    # Create date-based subtitle
-                    if start_date == end_date:
-                        # Single day
-                        if timeframe.lower() == "today":
-                            subtitle = f"Today - {start_date}"
-                        elif timeframe.lower() == "yesterday":
-                            subtitle = f"Yesterday - {start_date}"
-                        else:
-                            subtitle = f"Date: {start_date}"
+                    # Date range; a whole calendar month gets its name
+                    if start_date.day == 1 and end_date + timedelta(days=1) == (start_date + timedelta(days=32)).replace(day=1):
+                        month_name = start_date.strftime('%B %Y')
+                        subtitle = f"{month_name} ({start_date} to {end_date})"
                     else:
-                        # Date range
-                        if timeframe.lower() == "this_month":
-                            month_name = datetime.strptime(str(start_date), '%Y-%m-%d').strftime('%B %Y')
-                            subtitle = f"{month_name} ({start_date} to {end_date})"
-                        elif timeframe.lower() == "last_month":
-                            month_name = datetime.strptime(str(start_date), '%Y-%m-%d').strftime('%B %Y')
-                            subtitle = f"{month_name} ({start_date} to {end_date})"
-                        else:
-                            subtitle = f"Date Range: {start_date} to {end_date}"
-                
-                img_path = df_to_image(
-                    df, 
-                    "files/images/leaderboard.png", 
-                    title,
-                    img_subtitle=subtitle
-                )
-                if not os.path.exists(img_path):
-                    raise FileNotFoundError(f"Image file was not created at {img_path}")
-                return img_path
-            except Exception as e:
-                print(f"Error in image creation process: {str(e)}")
-                raise Exception(f"Failed to create leaderboard image: {str(e)}")
+                        subtitle = f"Date Range: {start_date} to {end_date}"
+
+            if page_count > 1:
+                subtitle = f"{subtitle} (page {page + 1} of {page_count})"
 
+            # Small boards skip the image entirely
+            if render_mode == 'auto':
+                render_mode = 'embed' if fits_as_text(df) else 'image'
+            if render_mode in ('text', 'embed'):
+                return TextTable(title, subtitle, df_to_table(df), as_embed=render_mode == 'embed'), page_count
+            
+            # Rendered in memory per request, off the event loop; the shared file on disk
+            # is only written for debugging
+            image = await render_buffer(
+                df, 
+                title,
+                img_subtitle=subtitle,
+                debug_filepath=f"files/images/{LEADERBOARD_FILENAME}" if DEBUG_MODE else None
+            )
+            return image, page_count
         except Exception as e:
-            error_message = f"Error showing leaderboard: {str(e)}"
-            print(error_message)
-            raise Exception(error_message)
+            print(f"Error in image creation process: {str(e)}")
+            raise Exception(f"Failed to create leaderboard image: {str(e)}")
+
+
+    async def _render_digest(self, lane, start_date, end_date, render_mode):
+        """The top DIGEST_TOP_N of every game on one day, as one image or a set of embeds."""
+        if start_date != end_date:
+            return "The digest covers a single day, e.g. today, yesterday or 2024-01-15"
+
+        # Recent days come from the in-memory boards (plus the importer-fed games, which
+        # aren't held there), older ones from one query
+        rows = ranking_engine.digest_rows(start_date, DIGEST_TOP_N)
+        with open(direct_path_finder('files', 'queries', 'active', 'daily_digest.sql'), 'r', encoding='utf-8') as file:
+            query = file.read()
+        params = {'game_date': start_date, 'top_n': DIGEST_TOP_N, 'imported_only': 0 if rows is None else 1,
+                  'imported_games': ','.join(IMPORTED_GAMES)}
+        rows = (rows or []) + await execute_query(query, params, lane=lane)
+        if not rows:
+            return f"No scores found for {start_date}"
+
+        df = pd.DataFrame(rows)
+        sections = [(game_name.replace('_', ' ').title(), game_df.drop(columns=['game_name']).reset_index(drop=True))
+                    for game_name, game_df in df.groupby('game_name', sort=True)]
+        title = "Daily Digest"
+        day_label = self._day_label(start_date)
+        subtitle = f"{day_label + ' - ' if day_label else ''}{start_date}"
+
+        if render_mode in ('text', 'embed'):
+            embeds = []
+            for i in range(0, len(sections), EMBED_MAX_FIELDS):
+                embed = discord.Embed(title=title if i == 0 else None, description=subtitle if i == 0 else None)
+                for section_title, section_df in sections[i:i + EMBED_MAX_FIELDS]:
+                    lines = [f"{row.rnk}. {row.player} ({row.score})" for row in section_df.itertuples()]
+                    embed.add_field(name=section_title, value="\n".join(lines), inline=True)
+                embeds.append(embed)
+            return embeds
+
+        return await render_buffer(
+            sections, title, img_subtitle=subtitle,
+            debug_filepath=f"files/images/{LEADERBOARD_FILENAME}" if DEBUG_MODE else None
+        )
+
 
+_service = None
 
+def get_leaderboard_service(client, tree) -> Leaderboards:
+    """The long-lived Leaderboards instance shared by the commands and the scheduled tasks."""
+    global _service
+    if _service is None:
+        _service = Leaderboards(client, tree)
+    return _service
 
 async def setup(client, tree):
-    leaderboards = Leaderboards(client, tree)
+    leaderboards = get_leaderboard_service(client, tree)
     # No need to manually add commands here, they are added dynamically
\ No newline at end of file
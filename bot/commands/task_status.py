@@ -0,0 +1,53 @@
+import discord
+from discord import app_commands
+from bot.connections.task_supervisor import task_metrics
+from bot.connections.task_leader import leader_status
+
+def _format_ms(value) -> str:
+    if value is None:
+        return '-'
+    return f"{value / 1000:.1f}s" if value >= 1000 else f"{value:.0f}ms"
+
+def format_task_status() -> str:
+    """One line per background loop: state, runs, timings and failures."""
+    metrics = task_metrics()
+    if not metrics:
+        return "No background tasks have been started."
+
+    lines = [f"{'task':<26} {'state':<7} {'runs':>5} {'avg':>7} {'max':>7} {'drift':>7} {'fail':>4} {'over':>4}"]
+    for name, m in sorted(metrics.items()):
+        state = 'running' if m['running'] else ('STOPPED' if m['supervised'] else 'standby')
+        failures = f"{m['failures']}" + (f"/{m['consecutive_failures']}" if m['consecutive_failures'] else '')
+        lines.append(f"{name:<26} {state:<7} {m['runs']:>5} {_format_ms(m['avg_duration_ms']):>7} "
+                     f"{_format_ms(m['max_duration_ms']):>7} {_format_ms(m['last_drift_ms']):>7} "
+                     f"{failures:>4} {m['overruns']:>4}")
+
+    details = []
+    for name, m in sorted(metrics.items()):
+        details.append(f"{name}: last success {m['last_success'] or 'never'}, next {m['next_run'] or '-'}"
+                       + (f", restarts {m['restarts']}" if m['restarts'] else ''))
+        if m['last_error']:
+            details.append(f"  last error {m['last_error'][:150]}")
+
+    leader = leader_status()
+    details.append(f"Task leader: {'this process since ' + leader['since'] if leader['leader'] else 'another process (standby)'}")
+
+    text = "```\n" + "\n".join(lines) + "\n```\n" + "\n".join(details)
+    return text[:1990]
+
+async def setup(client, tree):
+    if tree.get_command('task_status'):
+        return
+
+    async def task_status(interaction: discord.Interaction):
+        print(f"/task_status called by {interaction.user.name} in {interaction.guild.name}")
+        await interaction.response.send_message(format_task_status(), ephemeral=True)
+
+    command = app_commands.Command(
+        name='task_status',
+        callback=task_status,
+        description="Background task health: run times, drift, failures and restarts"
+    )
+    # Server admins only
+    command = app_commands.default_permissions(administrator=True)(command)
+    tree.add_command(command)
@@ -0,0 +1,84 @@
+import asyncio
+import io
+import os
+import time
+from typing import Callable, Dict, Union
+import discord
+from bot.functions.admin import get_default_channel_id
+from bot.commands.leaderboards import leaderboard_message
+from bot.connections.logging_config import get_logger, log_exception
+
+broadcast_logger = get_logger('broadcast')
+
+# Scheduled posts go to every connected guild's default channel. The content is
+# rendered once by the caller and the channels are sent to concurrently, at most
+# BROADCAST_CONCURRENCY at a time. Each channel is its own rate limit bucket and
+# discord.py waits out 429s per bucket (and the global limit) itself; the bound
+# keeps a large fan-out from queueing all of them at once.
+BROADCAST_CONCURRENCY = int(os.getenv('BROADCAST_CONCURRENCY', 4))
+
+def _send_kwargs(part) -> dict:
+    # A rendered image is a BytesIO that discord.File reads to the end, so every send gets its own copy
+    if isinstance(part, io.BytesIO):
+        part = io.BytesIO(part.getvalue())
+    return leaderboard_message(part)
+
+async def _send_to_guild(client: discord.Client, guild: discord.Guild, parts: list, slots: asyncio.Semaphore) -> dict:
+    channel_id = get_default_channel_id(guild.name)
+    if not channel_id:
+        return {'status': 'skipped', 'error': 'no default channel'}
+    channel = client.get_channel(channel_id)
+    if not channel:
+        return {'status': 'failed', 'error': f'channel {channel_id} not found'}
+
+    async with slots:
+        started = time.monotonic()
+        sent = 0
+        try:
+            # In order: an announcement is followed by its leaderboard
+            for part in parts:
+                await channel.send(**_send_kwargs(part))
+                sent += 1
+        except Exception as e:
+            return {'status': 'failed', 'error': f'{type(e).__name__}: {e}', 'sent': sent,
+                    'ms': round((time.monotonic() - started) * 1000)}
+        return {'status': 'sent', 'sent': sent, 'ms': round((time.monotonic() - started) * 1000)}
+
+async def broadcast(client: discord.Client, messages: Union[list, Callable[[discord.Guild], list]],
+                    description: str, logger=broadcast_logger) -> Dict[str, dict]:
+    """
+    Send messages to the default channel of every connected guild, concurrently.
+
+    messages is a list of parts sent in order (strings or rendered leaderboards, see
+    leaderboard_message), or a function of the guild returning that guild's parts
+    (nothing to skip it). Returns {guild_name: result}, where result['status'] is
+    'sent', 'skipped' or 'failed'.
+    """
+    slots = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+    targets = []
+    for guild in client.guilds:
+        parts = messages(guild) if callable(messages) else messages
+        if parts:
+            targets.append((guild, parts))
+
+    started = time.monotonic()
+    outcomes = await asyncio.gather(*(_send_to_guild(client, guild, parts, slots) for guild, parts in targets),
+                                    return_exceptions=True)
+
+    results = {}
+    for (guild, _), outcome in zip(targets, outcomes):
+        if isinstance(outcome, BaseException):
+            log_exception(logger, outcome, f"broadcasting {description} to {guild.name}")
+            outcome = {'status': 'failed', 'error': f'{type(outcome).__name__}: {outcome}'}
+        results[guild.name] = outcome
+        if outcome['status'] == 'sent':
+            logger.info(f"Posted {description} to {guild.name} in {outcome['ms']}ms")
+        elif outcome['status'] == 'skipped':
+            logger.warning(f"Skipped {description} for {guild.name}: {outcome['error']}")
+        else:
+            logger.error(f"Failed to post {description} to {guild.name}: {outcome['error']}")
+
+    counts = {status: sum(1 for r in results.values() if r['status'] == status) for status in ('sent', 'skipped', 'failed')}
+    logger.info(f"Broadcast {description} to {len(results)} guild(s) in "
+                f"{(time.monotonic() - started) * 1000:.0f}ms: {counts}")
+    return results
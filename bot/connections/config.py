@@ -4,6 +4,7 @@ import discord
 import platform
 from dotenv import load_dotenv
 from bot.functions.admin import direct_path_finder
+from bot.functions.state_store import update_state, guild_key
 
 # Load environment variables
 load_dotenv()
@@ -32,7 +33,7 @@ FONT_PATHS = {
     'Darwin': '/Library/Fonts/Arial.ttf',  # macOS
     'Linux': '/usr/share/fonts/truetype/ARIAL.TTF'
 }
-FONT_PATH = FONT_PATHS.get(platform.system(), FONT_PATHS['Linux'])
+FONT_PATH = os.getenv('FONT_PATH') or FONT_PATHS.get(platform.system(), FONT_PATHS['Linux'])  # env override for CI/offline runs
 
 async def save_guild_config(guild: discord.Guild):
     guild_info = {
@@ -78,11 +79,13 @@ async def save_guild_config(guild: discord.Guild):
             "available": emoji.available
         }
 
-    # Save to file
-    config_file = direct_path_finder('files', 'guilds', guild.name, 'config.json')
-    os.makedirs(os.path.dirname(config_file), exist_ok=True)
-    with open(config_file, 'w', encoding='utf-8') as f:
-        json.dump(guild_info, f, indent=2, ensure_ascii=False)
+    # Merge into the stored entry: fields set by hand or by other code (e.g. a
+    # default_channel_id chosen by an admin, "games") are kept
+    def merge(config):
+        default_channel_id = config.get("default_channel_id") or guild_info["default_channel_id"]
+        config.update(guild_info, default_channel_id=default_channel_id)
+        return config
+    update_state(guild_key(guild.name, 'config.json'), merge, {})
     
     print(f"✓ Saved config for {guild.name} ({len(guild_info['channels'])} channels, {len(guild_info['users'])} users)")
 
@@ -14,8 +14,9 @@ from bot.functions import process_game_score, is_game_score
 from bot.connections.tasks import setup_tasks
 from bot.connections.config import save_all_guild_configs
 from bot.functions.message_history import initialize_message_history
-from bot.functions.sql_helper import get_pool
+from bot.functions.sql_helper import warm_pools
 from bot.functions.admin import direct_path_finder
+from bot.functions.state_store import get_state, guild_key
 from bot.connections.logging_config import get_logger, log_exception, log_asyncio_context
 
 # Get loggers for different components
@@ -330,7 +331,7 @@ async def setup_events(client, tree):
             import asyncio
             results = await asyncio.gather(
                 save_all_guild_configs(client),
-                get_pool(),  # Start database connection early
+                warm_pools(),  # Start database connections early
                 return_exceptions=True
             )
             
@@ -536,21 +537,18 @@ async def smart_emoji_reaction(message, emoji_str):
                 
             # If not found, check guild config for available emojis
             try:
-                guild_config_path = direct_path_finder('files', 'guilds', message.guild.name, 'config.json')
-                if os.path.exists(guild_config_path):
-                    with open(guild_config_path, 'r', encoding='utf-8') as f:
-                        config = json.load(f)
-                        custom_emojis = config.get('custom_emojis', {})
-                        if emoji_name in custom_emojis:
-                            emoji_data = custom_emojis[emoji_name]
-                            # Check if emoji is available
-                            if emoji_data.get('available', True):
-                                full_emoji = emoji_data['full_format']
-                                await message.add_reaction(full_emoji)
-                                return True
-                            else:
-                                print(f"Custom emoji '{emoji_name}' is not available in guild '{message.guild.name}'")
-                                return False
+                config = get_state(guild_key(message.guild.name, 'config.json'), {})
+                custom_emojis = config.get('custom_emojis', {})
+                if emoji_name in custom_emojis:
+                    emoji_data = custom_emojis[emoji_name]
+                    # Check if emoji is available
+                    if emoji_data.get('available', True):
+                        full_emoji = emoji_data['full_format']
+                        await message.add_reaction(full_emoji)
+                        return True
+                    else:
+                        print(f"Custom emoji '{emoji_name}' is not available in guild '{message.guild.name}'")
+                        return False
             except Exception as e:
                 print(f"Error checking guild config for emoji: {e}")
                 
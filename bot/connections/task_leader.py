@@ -0,0 +1,129 @@
+import asyncio
+import os
+from datetime import datetime
+import aiomysql
+from discord.ext import tasks
+from bot.functions.sql_helper import get_backend, get_db_config
+from bot.connections.task_supervisor import supervised, start_supervised
+from bot.connections.logging_config import get_task_logger, log_exception
+
+leader_logger = get_task_logger('task_leader')
+
+# Only one bot process may run the posting tasks (leader announcements, resets,
+# daily summaries), or a second process against the same database (a TEST_BOT run,
+# a systemd restart overlap) posts everything twice. The process holding the MySQL
+# advisory lock LEADER_LOCK_NAME is the leader. The lock lives on a dedicated
+# connection outside the pools: MySQL releases it as soon as that connection
+# closes, so when the leader exits or dies a standby takes over on its next
+# attempt, within LEADER_HEARTBEAT_SECONDS.
+#
+# A leader that can't reach the database steps down at its first failed heartbeat.
+# Its connection has wait_timeout LEADER_SESSION_TIMEOUT, so the server drops the
+# lock that long after the leader was last heard from, well after it stopped posting.
+
+LEADER_LOCK_NAME = os.getenv('TASK_LEADER_LOCK', 'bot_scheduled_tasks')
+LEADER_HEARTBEAT_SECONDS = 5
+LEADER_SESSION_TIMEOUT = 30
+
+_conn = None
+_is_leader = False
+_leader_since = None
+_callbacks = {'elected': None, 'deposed': None}
+
+def is_leader() -> bool:
+    return _is_leader
+
+def leader_status() -> dict:
+    """Whether this process runs the posting tasks, and since when."""
+    return {'leader': _is_leader, 'since': _leader_since, 'lock': LEADER_LOCK_NAME}
+
+async def _connect():
+    config = await get_db_config()
+    config.pop('pool_recycle', None)  # a pool setting
+    conn = await aiomysql.connect(**config)
+    async with conn.cursor() as cur:
+        await cur.execute("SET SESSION wait_timeout = %s", (LEADER_SESSION_TIMEOUT,))
+    return conn
+
+async def _close():
+    global _conn
+    if _conn is not None:
+        _conn.close()  # releases the lock server side
+        _conn = None
+
+async def _scalar(query: str, params: tuple):
+    async def run():
+        async with _conn.cursor() as cur:
+            await cur.execute(query, params)
+            row = await cur.fetchone()
+            return row[0] if row else None
+    return await asyncio.wait_for(run(), timeout=LEADER_HEARTBEAT_SECONDS)
+
+async def _elected():
+    global _is_leader, _leader_since
+    _is_leader = True
+    _leader_since = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    leader_logger.info(f"Took the task leadership lock '{LEADER_LOCK_NAME}', starting the posting tasks")
+    try:
+        await _callbacks['elected']()
+    except Exception as e:
+        # Step down (releasing the lock) and try again at the next heartbeat
+        log_exception(leader_logger, e, "starting the posting tasks")
+        await _close()
+        _deposed(f"couldn't start the posting tasks: {type(e).__name__}: {e}")
+
+def _deposed(reason: str):
+    global _is_leader, _leader_since
+    if not _is_leader:
+        return
+    _is_leader = False
+    _leader_since = None
+    leader_logger.error(f"Lost task leadership ({reason}), stopping the posting tasks")
+    _callbacks['deposed']()
+
+async def _hold_or_acquire() -> bool:
+    global _conn
+    if _conn is None:
+        _conn = await _connect()
+    if _is_leader:
+        # Heartbeat: still ours on this connection (also keeps the session alive)
+        return await _scalar("SELECT IS_USED_LOCK(%s) = CONNECTION_ID()", (LEADER_LOCK_NAME,)) == 1
+    return await _scalar("SELECT GET_LOCK(%s, 0)", (LEADER_LOCK_NAME,)) == 1
+
+@tasks.loop(seconds=LEADER_HEARTBEAT_SECONDS)
+@supervised('task_leader')
+async def task_leader():
+    if get_backend() is not None:
+        # Local SQLite stand-in: a single process, nothing to elect
+        if not _is_leader:
+            await _elected()
+        return
+    try:
+        holding = await _hold_or_acquire()
+    except Exception as e:
+        log_exception(leader_logger, e, "task leadership heartbeat")
+        await _close()
+        _deposed(f"{type(e).__name__}: {e}")
+        return
+    if holding and not _is_leader:
+        await _elected()
+    elif not holding and _is_leader:
+        await _close()
+        _deposed("lock held by another connection")
+
+@task_leader.after_loop
+async def after_task_leader():
+    # Stopping (shutdown) hands the lock to a standby right away
+    await _close()
+    _deposed("election loop stopped")
+
+def start_leader_election(on_elected, on_deposed):
+    """
+    Compete for task leadership: on_elected() (a coroutine function) is awaited when
+    this process becomes the leader, on_deposed() called when it stops being the leader.
+    If on_elected() raises, the process steps down and competes again at the next heartbeat.
+    """
+    _callbacks['elected'] = on_elected
+    _callbacks['deposed'] = on_deposed
+    if not task_leader.is_running():  # setup runs again on reconnect; keep the lock we hold
+        start_supervised('task_leader', task_leader)
@@ -0,0 +1,178 @@
+import functools
+import time
+from datetime import datetime
+from discord.ext import tasks
+from bot.functions.admin import write_json, direct_path_finder
+from bot.connections.logging_config import get_task_logger, log_exception
+
+supervisor_logger = get_task_logger('task_supervisor')
+
+# Per-run telemetry for the background loops in tasks.py, and a watchdog that
+# restarts a loop that has stopped. Each loop body is wrapped with @supervised,
+# which times the run and counts failures (bodies re-raise after logging). The
+# numbers are served by /task_status and written to METRICS_PATH every check.
+
+METRICS_PATH = direct_path_finder('files', 'state', 'task_metrics.json')
+WATCHDOG_SECONDS = 30
+RESTART_BACKOFF = [30, 60, 120, 300, 900]   # seconds before each successive restart of a loop
+RESTART_STABLE_SECONDS = 600                # running this long after a restart resets the backoff
+
+_metrics = {}       # task name -> counters, see _new_metrics
+_loops = {}         # task name -> (Loop, start args)
+_restarts = {}      # task name -> {'attempts', 'stopped_at', 'restarted_at'} (monotonic times)
+_expected = {}      # task name -> when its next run is due (aware), noted at the end of each run
+
+def _new_metrics() -> dict:
+    return {
+        'runs': 0,
+        'failures': 0,
+        'consecutive_failures': 0,
+        'overruns': 0,              # runs that took longer than the loop's interval
+        'last_duration_ms': None,
+        'max_duration_ms': 0.0,
+        'total_duration_ms': 0.0,
+        'last_drift_ms': None,      # how late the run started against its schedule
+        'max_drift_ms': 0.0,
+        'last_start': None,
+        'last_success': None,
+        'last_error': None,
+        'restarts': 0,
+        '_started': None,           # monotonic start of the current run
+    }
+
+def _interval_seconds(loop: tasks.Loop):
+    if loop.seconds is None:  # explicit times
+        return None
+    # 0 for the scheduled tasks, which sleep inside the run instead
+    return loop.hours * 3600 + loop.minutes * 60 + loop.seconds or None
+
+def _now_str() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+def supervised(name: str):
+    """Wrap a loop body so each run is timed and its failures counted."""
+    def decorator(fn):
+        metrics = _metrics.setdefault(name, _new_metrics())
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            run_started(name)
+            try:
+                await fn(*args, **kwargs)
+            except Exception as e:
+                # The body already logged it; keep the loop running
+                metrics['failures'] += 1
+                metrics['consecutive_failures'] += 1
+                metrics['last_error'] = f"{_now_str()} {type(e).__name__}: {e}"
+            else:
+                metrics['consecutive_failures'] = 0
+                metrics['last_success'] = _now_str()
+            finally:
+                _run_finished(name)
+        return wrapper
+    return decorator
+
+def run_started(name: str, scheduled_at: datetime = None):
+    """
+    Mark the start of a run. Called by @supervised; scheduled tasks call it again once
+    their fire time arrives (with that time), so sleeping until then isn't counted.
+    """
+    metrics = _metrics.setdefault(name, _new_metrics())
+    metrics['_started'] = time.monotonic()
+    metrics['last_start'] = _now_str()
+    if scheduled_at is None:
+        scheduled_at = _expected.pop(name, None)
+    if scheduled_at is not None:
+        drift_ms = max((datetime.now(scheduled_at.tzinfo) - scheduled_at).total_seconds() * 1000, 0.0)
+        metrics['last_drift_ms'] = round(drift_ms, 1)
+        metrics['max_drift_ms'] = round(max(metrics['max_drift_ms'], drift_ms), 1)
+
+def _run_finished(name: str):
+    metrics = _metrics[name]
+    duration_ms = (time.monotonic() - metrics['_started']) * 1000
+    metrics['runs'] += 1
+    metrics['last_duration_ms'] = round(duration_ms, 1)
+    metrics['max_duration_ms'] = round(max(metrics['max_duration_ms'], duration_ms), 1)
+    metrics['total_duration_ms'] += duration_ms
+    loop = _loops[name][0] if name in _loops else None
+    interval = _interval_seconds(loop) if loop else None
+    if interval and loop.next_iteration is not None:
+        # The loop has already scheduled its next run (from this run's start); drift is measured
+        # against it. Scheduled tasks pass their fire time to run_started instead.
+        _expected[name] = loop.next_iteration
+    if interval and duration_ms > interval * 1000:
+        metrics['overruns'] += 1
+        supervisor_logger.warning(f"{name} took {duration_ms / 1000:.1f}s, longer than its {interval}s interval")
+
+def start_supervised(name: str, loop: tasks.Loop, *args):
+    """Start a loop (stopping it first if it's running) and have the watchdog keep it running."""
+    if loop.is_running():
+        supervisor_logger.warning(f"{name} already running, stopping first")
+        loop.stop()
+    _metrics.setdefault(name, _new_metrics())
+    _loops[name] = (loop, args)
+    _restarts.pop(name, None)
+    _expected.pop(name, None)
+    loop.start(*args)
+    if not task_watchdog.is_running():
+        task_watchdog.start()
+
+def stop_supervised(name: str):
+    """Cancel a loop and stop the watchdog restarting it (it can be started again later)."""
+    entry = _loops.pop(name, None)
+    _restarts.pop(name, None)
+    _expected.pop(name, None)
+    if entry and entry[0].is_running():
+        entry[0].cancel()
+
+def task_metrics() -> dict:
+    """{task name: telemetry} for every supervised loop."""
+    result = {}
+    for name, metrics in _metrics.items():
+        loop = _loops.get(name, (None,))[0]  # None once stopped with stop_supervised
+        runs = metrics['runs']
+        result[name] = {
+            **{k: v for k, v in metrics.items() if not k.startswith('_') and k != 'total_duration_ms'},
+            'avg_duration_ms': round(metrics['total_duration_ms'] / runs, 1) if runs else None,
+            'interval_s': _interval_seconds(loop) if loop else None,
+            'running': loop.is_running() if loop else False,
+            'supervised': loop is not None,   # False: stopped on purpose (stop_supervised)
+            'next_run': loop.next_iteration.astimezone().strftime("%Y-%m-%d %H:%M:%S")
+                        if loop and loop.next_iteration else None,
+        }
+    return result
+
+def write_metrics_file():
+    write_json(METRICS_PATH, {'updated': _now_str(), 'tasks': task_metrics()})
+
+@tasks.loop(seconds=WATCHDOG_SECONDS)
+async def task_watchdog():
+    try:
+        now = time.monotonic()
+        for name, (loop, args) in _loops.items():
+            state = _restarts.setdefault(name, {'attempts': 0, 'stopped_at': None, 'restarted_at': None})
+            if loop.is_running():
+                state['stopped_at'] = None
+                if state['attempts'] and now - state['restarted_at'] > RESTART_STABLE_SECONDS:
+                    state['attempts'] = 0
+                continue
+
+            if state['stopped_at'] is None:
+                supervisor_logger.error(f"{name} is not running")
+                state['stopped_at'] = now
+                continue
+            delay = RESTART_BACKOFF[min(state['attempts'], len(RESTART_BACKOFF) - 1)]
+            if now - state['stopped_at'] < delay:
+                continue
+
+            supervisor_logger.warning(f"Restarting {name} (attempt {state['attempts'] + 1}, stopped {delay}s+ ago)")
+            _metrics[name]['restarts'] += 1
+            state.update(attempts=state['attempts'] + 1, stopped_at=None, restarted_at=now)
+            try:
+                loop.start(*args)
+            except Exception as e:
+                log_exception(supervisor_logger, e, f"restarting {name}")
+
+        write_metrics_file()
+    except Exception as e:
+        log_exception(supervisor_logger, e, "task_watchdog execution")
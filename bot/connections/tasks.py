@@ -4,16 +4,26 @@ from datetime import datetime, timedelta
 import pandas as pd
 import os
 import json
-import pytz
 
 from bot.functions import find_users_to_warn
 from bot.functions import send_df_to_sql, execute_query
 from bot.functions import check_mini_leaders
-from bot.functions import track_warning_attempt
-from bot.functions import write_json
-from bot.commands import Leaderboards
-from bot.functions.admin import get_default_channel_id
-from bot.functions.admin import direct_path_finder
+from bot.functions.mini_warning import mini_poll_interval, mini_probe_stats, MINI_LEADERS_KEY
+from bot.functions.mini_warning import reset_leader_tracking, record_leader_change, due_leader_announcement, leader_change_summary
+from bot.functions.shared_state import publish_state, load_shared_state
+from bot.functions.scheduler import STATE_KEY as SCHEDULER_STATE_KEY
+from bot.functions.scheduler import wait_for_next_run, next_fire_time, sleep_until, eastern_now, mini_game_date, in_mini_reset_window, SCHEDULE, SCHEDULE_TZ
+from bot.functions.mini_warning import warning_messages, track_warning_attempts
+from bot.commands.leaderboards import get_leaderboard_service
+from bot.functions.df_to_image import render_cache_stats
+from bot.functions.render_executor import render_executor_stats
+from bot.functions.precompute import precompute, prepared, PRECOMPUTE_LEAD
+from bot.functions.score_spool import replay_spool, pending_count
+from bot.functions.daily_standings import reconcile_standings, refresh_imported, RECONCILE_DAYS, STARTUP_RECONCILE_DAYS
+from bot.functions import ranking_engine, monthly_rollups
+from bot.connections.broadcast import broadcast
+from bot.connections.task_supervisor import supervised, run_started, start_supervised, stop_supervised
+from bot.connections.task_leader import start_leader_election
 from bot.connections.logging_config import get_task_logger, log_exception, log_asyncio_context
 
 # Get task-specific loggers
@@ -21,85 +31,73 @@ mini_leaders_logger = get_task_logger('post_new_mini_leaders')
 reset_leaders_logger = get_task_logger('reset_mini_leaders')
 daily_summary_logger = get_task_logger('daily_mini_summary')
 daily_winners_logger = get_task_logger('daily_winners_summary')
+score_spool_logger = get_task_logger('replay_score_spool')
+standings_logger = get_task_logger('reconcile_daily_standings')
 setup_logger = get_task_logger('setup_tasks')
 
+# Run only on the process holding task leadership, so a second bot process doesn't double-post
+LEADER_TASKS = ['post_new_mini_leaders', 'reset_mini_leaders', 'daily_mini_summary', 'daily_winners_summary']
+
 # Removed redundant send_warning_loop - functionality moved to daily_mini_summary task
 
-# task 1 - check for new mini leaders and post to discord
+async def _render_for_broadcast(client, tree, game: str, timeframe: str, logger, error_text: str):
+    """Render a leaderboard once for every guild; on failure the guilds get error_text instead."""
+    leaderboards = get_leaderboard_service(client, tree)
+    image = await leaderboards.show_leaderboard(game=game, timeframe=timeframe, lane='background')
+    # Check if we got a leaderboard (otherwise it's an error message)
+    if isinstance(image, str):
+        logger.error(f"Failed to generate {game} leaderboard for {timeframe}: {image}")
+        return error_text
+    return image
+
+def _update_poll_interval(now: datetime):
+    interval = mini_poll_interval(now)
+    if post_new_mini_leaders.seconds != interval:
+        mini_leaders_logger.debug(f"Mini leader poll interval now {interval}s, probe stats: {mini_probe_stats()}")
+        post_new_mini_leaders.change_interval(seconds=interval)
+
+# task 1 - check for new mini leaders and post to discord (interval adapts, see mini_poll_interval)
 @tasks.loop(seconds=60)
+@supervised('post_new_mini_leaders')
 async def post_new_mini_leaders(client: discord.Client, tree: discord.app_commands.CommandTree):
     try:
-        now = datetime.now()
-        mini_reset_hour = 18 if now.weekday() >= 5 else 22  # 6pm weekends, 10pm weekdays
+        now = eastern_now()
         
         # Skip leader checks during mini expiration/reset window to avoid false positives
-        if now.hour == mini_reset_hour and now.minute <= 9:
+        if in_mini_reset_window(now):
             mini_leaders_logger.debug(f"Skipping leader check during mini expiration window at {now}")
+            _update_poll_interval(now)
             return
         
-        # check for global leader changes (returns True/False instead of guild dict)
-        has_new_leader = await check_mini_leaders()
+        # check for global leader changes; changes are held for MINI_LEADER_COALESCE and
+        # announced together, so a burst of solves is one post
+        change = await check_mini_leaders()
+        if change:
+            record_leader_change(change, now)
+        # Takes effect from the next run (sooner while an announcement is pending)
+        _update_poll_interval(now)
 
-        if not has_new_leader:
+        change = due_leader_announcement(now)
+        if not change:
             return
 
-        mini_leaders_logger.info("NEW MINI LEADER DETECTED! Processing announcement...")
+        mini_leaders_logger.info(f"NEW MINI LEADER! Announcing {change['old']} -> {change['new']} "
+                                 f"({change['changes']} change(s))")
 
         # Post to ALL connected guilds since mini leaderboard is now global
-        connected_guilds = {guild.name for guild in client.guilds}
-        mini_leaders_logger.info(f"Connected guilds: {connected_guilds}")
-        
-        for guild_name in connected_guilds:
-            # Get the default channel ID
-            channel_id = get_default_channel_id(guild_name)
-            
-            if not channel_id:
-                mini_leaders_logger.warning(f"No default channel ID found for {guild_name}, skipping")
-                continue
+        # If it's past the reset time, we're showing tomorrow's mini
+        game_date = mini_game_date().strftime('%Y-%m-%d')
+        # The summary comes from the live leader query; bring the board up to the same rows
+        await refresh_imported(game_date, ('mini',))
+        image = await _render_for_broadcast(client, tree, 'mini', game_date, mini_leaders_logger,
+                                            "Error: Could not generate mini leaderboard image")
+        await broadcast(client, [leader_change_summary(change), image], "mini leader announcement", mini_leaders_logger)
 
-            basic_message = "There's a new mini leader!"
-            channel = client.get_channel(channel_id)
-            
-            if channel:
-                try:
-                    mini_leaders_logger.info(f"Sending announcement to {guild_name} in #{channel.name}")
-                    await channel.send(basic_message)
-                    
-                    # Create leaderboard and send as image file
-                    leaderboards = Leaderboards(client, tree)
-                    
-                    # Calculate correct mini game date (mini resets at 10pm weekdays, 6pm weekends)
-                    now = datetime.now()
-                    mini_reset_hour = 18 if now.weekday() >= 5 else 22
-                    
-                    # If it's past the reset time, we're showing tomorrow's mini
-                    if now.hour >= mini_reset_hour:
-                        mini_game_date = (now + timedelta(days=1)).strftime('%Y-%m-%d')
-                    else:
-                        mini_game_date = now.strftime('%Y-%m-%d')
-                    
-                    img_path = await leaderboards.show_leaderboard(game='mini', timeframe=mini_game_date)
-                    
-                    # Check if we got a valid file path (should end with .png and exist)
-                    if (img_path and isinstance(img_path, str) and 
-                        img_path.endswith('.png') and 
-                        os.path.exists(img_path)):
-                        mini_leaders_logger.info(f"Sending leaderboard image to {guild_name}: {img_path}")
-                        await channel.send(file=discord.File(img_path))
-                        mini_leaders_logger.info(f"Successfully posted mini leader announcement to {guild_name}")
-                    else:
-                        # Either got an error message or file doesn't exist
-                        error_msg = img_path if isinstance(img_path, str) else "Unknown error generating leaderboard"
-                        mini_leaders_logger.error(f"Failed to generate mini leaderboard for {guild_name}: {error_msg}")
-                        await channel.send("Error: Could not generate mini leaderboard image")
-                        
-                except Exception as e:
-                    log_exception(mini_leaders_logger, e, f"posting mini leader update to {guild_name}")
-            else:
-                mini_leaders_logger.error(f"Could not get channel object for channel ID {channel_id} in {guild_name}")
+        mini_leaders_logger.info(f"Render cache: {render_cache_stats()}, executor: {render_executor_stats()}")
                     
     except Exception as e:
         log_exception(mini_leaders_logger, e, "post_new_mini_leaders task execution")
+        raise  # counted by the task supervisor
 
 @post_new_mini_leaders.before_loop
 async def before_post_new_mini_leaders():
@@ -112,27 +110,24 @@ async def after_post_new_mini_leaders():
     else:
         mini_leaders_logger.error("Mini leaders monitoring task stopped unexpectedly")
 
+# Tasks 2-4 run once per scheduled time (see SCHEDULE): each run sleeps until it's due
+
 # task 2 - reset leaders when mini resets
-@tasks.loop(minutes=10)
+@tasks.loop()
+@supervised('reset_mini_leaders')
 async def reset_mini_leaders(client: discord.Client):
     try:
-        now = datetime.now()
-        mini_reset_hour = 18 if now.weekday() >= 5 else 22  # Fixed: 6pm weekends, 10pm weekdays
+        fire_at = await wait_for_next_run('reset_mini_leaders')
+        run_started('reset_mini_leaders', SCHEDULE_TZ.localize(fire_at))
+        reset_leaders_logger.info(f"MINI RESET TIME! Resetting global mini leaders at {fire_at}")
         
-        reset_leaders_logger.debug(f"Reset check at {now} - reset hour is {mini_reset_hour}")
-        
-        if now.hour == mini_reset_hour and now.minute <= 1:  # reset window
-            reset_leaders_logger.info(f"MINI RESET TIME! Resetting global mini leaders at {now}")
-            
-            # Reset global mini leaders file (not per-guild anymore)
-            leader_filepath = direct_path_finder('files', 'config', 'global_mini_leaders.json')
-            write_json(leader_filepath, [])  # makes it an empty list
-            reset_leaders_logger.info(f"Successfully reset global mini leaders file: {leader_filepath}")
-        else:
-            reset_leaders_logger.debug(f"Not reset time - current: {now.hour}:{now.minute:02d}, reset: {mini_reset_hour}:00-01")
+        # Reset global mini leaders (not per-guild anymore)
+        await publish_state(MINI_LEADERS_KEY, [])  # makes it an empty list
+        reset_leaders_logger.info("Successfully reset global mini leaders")
 
     except Exception as e:
         log_exception(reset_leaders_logger, e, "reset_mini_leaders task execution")
+        raise  # counted by the task supervisor
 
 @reset_mini_leaders.before_loop
 async def before_reset_mini_leaders():
@@ -146,152 +141,89 @@ async def after_reset_mini_leaders():
         reset_leaders_logger.error("Mini leaders reset task stopped unexpectedly")
 
 # task 3 - end of day mini summary and simple warning system
-@tasks.loop(minutes=10)
+@tasks.loop()
+@supervised('daily_mini_summary')
 async def daily_mini_summary(client: discord.Client, tree: discord.app_commands.CommandTree):
     try:
-        now = datetime.now()
-        mini_reset_hour = 18 if now.weekday() >= 5 else 22  # 6pm weekends, 10pm weekdays
-        
-        daily_summary_logger.info(f"Daily summary check at {now} - mini expires at {mini_reset_hour}:00")
+        # The expiring mini is the fire date's. Look up who to warn and render the final
+        # leaderboard PRECOMPUTE_LEAD early; at the fire time they're only redone if
+        # mini scores came in since.
+        fire_at = next_fire_time('daily_mini_summary')
+        today = fire_at.strftime('%Y-%m-%d')
+        build_warnings = lambda: find_users_to_warn(today)
+
+        async def build_leaderboard():
+            # Importer rows reach the standings only through a refresh; the last minutes' solves count
+            await refresh_imported(today, ('mini',))
+            return await _render_for_broadcast(client, tree, 'mini', today, daily_summary_logger,
+                                               "Error: Could not generate mini leaderboard image")
+        await sleep_until(fire_at - PRECOMPUTE_LEAD)
+        warnings_ready = await precompute(build_warnings, 'mini_watermark.sql', today)
+        leaderboard_ready = await precompute(build_leaderboard, 'mini_watermark.sql', today)
+        if leaderboard_ready and isinstance(leaderboard_ready['value'], str):
+            leaderboard_ready = None  # a failed render is retried at the fire time
+
+        now = await wait_for_next_run('daily_mini_summary')
+        run_started('daily_mini_summary', SCHEDULE_TZ.localize(now))
+        daily_summary_logger.info(f"MINI EXPIRATION TIME! Processing warnings and leaderboard at {now}")
+        if now != fire_at:  # slept past a different slot, nothing precomputed applies
+            today = now.strftime('%Y-%m-%d')
+            warnings_ready = leaderboard_ready = None
         
-        # Check if it's mini expiration time (within 10 minute window)
-        if now.hour == mini_reset_hour and now.minute <= 9:
-            daily_summary_logger.info(f"MINI EXPIRATION TIME! Processing warnings and leaderboard at {now}")
+        # 1. Send warnings by tagging users in guild channels who haven't completed the mini
+        try:
+            # Only users who haven't been warned today, to avoid duplicates
+            users_to_warn_today = await prepared(warnings_ready, build_warnings, "mini warnings")
             
-            # 1. Send warnings by tagging users in guild channels who haven't completed the mini
-            try:
-                users_needing_warnings = await find_users_to_warn()
-                daily_summary_logger.info(f"Found {len(users_needing_warnings)} users who need warnings")
-                
-                # Get users who have already been warned today to avoid duplicates
-                today = datetime.now().strftime('%Y-%m-%d')
-                already_warned_query = """
-                    SELECT DISTINCT discord_id_nbr 
-                    FROM games.mini_warning_history 
-                    WHERE warning_date = %s AND success = 1
-                """
-                already_warned_result = await execute_query(already_warned_query, (today,))
-                already_warned_ids = {row['discord_id_nbr'] for row in already_warned_result}
-                daily_summary_logger.info(f"Found {len(already_warned_ids)} users already warned today")
-                
-                # Only process if we have users to warn who haven't been warned today
-                users_to_warn_today = [u for u in users_needing_warnings if u['discord_id_nbr'] not in already_warned_ids]
+            if users_to_warn_today:
+                daily_summary_logger.info(f"Need to warn {len(users_to_warn_today)} users today")
                 
-                if users_to_warn_today:
-                    daily_summary_logger.info(f"Need to warn {len(users_to_warn_today)} users today")
-                    
-                    # Post warnings to each connected guild
-                    for guild in client.guilds:
-                        guild_name = guild.name
-                        channel_id = get_default_channel_id(guild_name)
-                        
-                        if not channel_id:
-                            daily_summary_logger.warning(f"No default channel ID for {guild_name}")
-                            continue
-                        
-                        channel = client.get_channel(channel_id)
-                        if not channel:
-                            daily_summary_logger.error(f"Could not get channel object for channel ID {channel_id} in {guild_name}")
-                            continue
-                        
-                        # Find users in this guild who need warnings
-                        guild_member_ids = {member.id for member in guild.members}
-                        users_in_this_guild = [
-                            user for user in users_to_warn_today 
-                            if user['discord_id_nbr'] in guild_member_ids
-                        ]
-                        
-                        if not users_in_this_guild:
-                            daily_summary_logger.debug(f"No users to warn in {guild_name}")
-                            continue
-                        
-                        try:
-                            # Create mention tags for users in this guild
-                            user_mentions = [f"<@{user['discord_id_nbr']}>" for user in users_in_this_guild]
-                            mentions_text = " ".join(user_mentions)
-                            
-                            warning_text = f"🕛 **Mini reminder!** The mini crossword expires soon and you haven't completed it yet!\n{mentions_text}"
-                            
-                            await channel.send(warning_text)
-                            daily_summary_logger.info(f"Posted mini warning with {len(user_mentions)} tags to {guild_name}")
-                            
-                            # Track successful warnings for all users in this guild
-                            for user in users_in_this_guild:
-                                await track_warning_attempt(
-                                    player_name=user.get('name', 'Unknown'),
-                                    discord_id_nbr=user['discord_id_nbr'],
-                                    success=True,
-                                    warning_type='guild_tag'
-                                )
-                            
-                        except Exception as e:
-                            log_exception(daily_summary_logger, e, f"posting mini warning to {guild_name}")
-                            
-                            # Track failed warnings for all users in this guild
-                            for user in users_in_this_guild:
-                                await track_warning_attempt(
-                                    player_name=user.get('name', 'Unknown'),
-                                    discord_id_nbr=user['discord_id_nbr'],
-                                    success=False,
-                                    error_message=str(e),
-                                    warning_type='guild_tag'
-                                )
-                else:
-                    daily_summary_logger.info("No new users to warn today (all already warned)")
-                        
-            except Exception as e:
-                log_exception(daily_summary_logger, e, "processing mini warnings")
-            
-            # 2. Post final mini leaderboard to all connected guilds
-            try:
-                connected_guilds = {guild.name for guild in client.guilds}
-                daily_summary_logger.info(f"Posting final mini leaderboard to {len(connected_guilds)} guilds")
-                
-                for guild_name in connected_guilds:
-                    channel_id = get_default_channel_id(guild_name)
-                    if not channel_id:
-                        daily_summary_logger.warning(f"No default channel ID for {guild_name}")
+                # Mention messages for the users in each guild, split to Discord's message limit
+                warning_header = "🕛 **Mini reminder!** The mini crossword expires soon and you haven't completed it yet!"
+                messages_by_guild = {}
+                for guild in client.guilds:
+                    guild_member_ids = {member.id for member in guild.members}
+                    users_in_this_guild = [user for user in users_to_warn_today if user['discord_id_nbr'] in guild_member_ids]
+                    messages_by_guild[guild.name] = warning_messages(users_in_this_guild, warning_header)
+
+                # Post warnings to each connected guild
+                results = await broadcast(client, lambda guild: [text for text, _ in messages_by_guild.get(guild.name, [])],
+                                          "mini warning", daily_summary_logger)
+
+                # A user counts as warned if any guild's message tagging them went out
+                attempts = {}
+                for guild_name, result in results.items():
+                    if result['status'] == 'skipped':
                         continue
+                    for i, (_, tagged) in enumerate(messages_by_guild[guild_name]):
+                        sent = i < result.get('sent', 0)
+                        for user in tagged:
+                            attempt = attempts.get(user['discord_id_nbr'])
+                            if attempt is None or (sent and not attempt['success']):
+                                attempts[user['discord_id_nbr']] = {
+                                    **user, 'success': sent, 'error_message': None if sent else result.get('error')}
+                await track_warning_attempts(list(attempts.values()), warning_type='guild_tag', warning_date=today)
+            else:
+                daily_summary_logger.info("No new users to warn today (all already warned)")
                     
-                    channel = client.get_channel(channel_id)
-                    if not channel:
-                        daily_summary_logger.error(f"Could not get channel object for channel ID {channel_id} in {guild_name}")
-                        continue
+        except Exception as e:
+            log_exception(daily_summary_logger, e, "processing mini warnings")
+        
+        # 2. Post final mini leaderboard to all connected guilds
+        try:
+            # For daily summary, we want the expiring mini (current date's mini)
+            # since this runs during expiration time before reset
+            image = await prepared(leaderboard_ready, build_leaderboard, "final mini leaderboard")
+            await broadcast(client, ["🏁 **Final Mini Results for Today!**", image], "final mini leaderboard",
+                            daily_summary_logger)
+            daily_summary_logger.info(f"Render cache: {render_cache_stats()}, executor: {render_executor_stats()}")
                     
-                    try:
-                        # Send final results message
-                        summary_msg = "🏁 **Final Mini Results for Today!**"
-                        await channel.send(summary_msg)
-                        
-                        # Generate and send leaderboard image - use current mini game date
-                        leaderboards = Leaderboards(client, tree)
-                        
-                        # For daily summary, we want the expiring mini (current date's mini)
-                        # since this runs during expiration time before reset
-                        current_date = now.strftime('%Y-%m-%d')
-                        img_path = await leaderboards.show_leaderboard(game='mini', timeframe=current_date)
-                        
-                        if (img_path and isinstance(img_path, str) and 
-                            img_path.endswith('.png') and 
-                            os.path.exists(img_path)):
-                            await channel.send(file=discord.File(img_path))
-                            daily_summary_logger.info(f"Successfully posted final mini leaderboard to {guild_name}")
-                        else:
-                            error_msg = img_path if isinstance(img_path, str) else "Unknown error"
-                            daily_summary_logger.error(f"Failed to generate leaderboard for {guild_name}: {error_msg}")
-                            await channel.send("Error: Could not generate mini leaderboard image")
-                            
-                    except Exception as e:
-                        log_exception(daily_summary_logger, e, f"posting final mini leaderboard to {guild_name}")
-                        
-            except Exception as e:
-                log_exception(daily_summary_logger, e, "posting final mini leaderboards")
-                
-        else:
-            daily_summary_logger.debug(f"Not mini expiration time - current: {now.hour}:{now.minute:02d}, expires at: {mini_reset_hour}:00")
-                            
+        except Exception as e:
+            log_exception(daily_summary_logger, e, "posting final mini leaderboards")
+
     except Exception as e:
         log_exception(daily_summary_logger, e, "daily_mini_summary task execution")
+        raise  # counted by the task supervisor
 
 @daily_mini_summary.before_loop
 async def before_daily_mini_summary():
@@ -305,66 +237,45 @@ async def after_daily_mini_summary():
         daily_summary_logger.error("Daily mini summary task stopped unexpectedly")
 
 # task 4 - end of day winners summary
-@tasks.loop(minutes=10)
+@tasks.loop()
+@supervised('daily_winners_summary')
 async def daily_winners_summary(client: discord.Client, tree: discord.app_commands.CommandTree):
     try:
-        now = datetime.now()
-        winners_post_hour = 23  # 11 PM every day
-        
-        daily_winners_logger.info(f"Daily winners check at {now} - winners post at {winners_post_hour}:00")
+        # Render today's winners PRECOMPUTE_LEAD early; redone at the fire time only if
+        # scores came in since
+        fire_at = next_fire_time('daily_winners_summary')
+        current_date = fire_at.strftime('%Y-%m-%d')
+
+        async def build_winners():
+            await refresh_imported(current_date)  # NYT rows the reconcile hasn't picked up yet
+            return await _render_for_broadcast(client, tree, 'winners', current_date, daily_winners_logger,
+                                               "Error: Could not generate daily winners image")
+        await sleep_until(fire_at - PRECOMPUTE_LEAD)
+        winners_ready = await precompute(build_winners, 'score_watermark.sql', current_date)
+        if winners_ready and isinstance(winners_ready['value'], str):
+            winners_ready = None  # a failed render is retried at the fire time
+
+        now = await wait_for_next_run('daily_winners_summary')
+        run_started('daily_winners_summary', SCHEDULE_TZ.localize(now))
+        daily_winners_logger.info(f"DAILY WINNERS TIME! Posting winners summary at {now}")
+        if now != fire_at:  # slept past a different slot, nothing precomputed applies
+            current_date = now.strftime('%Y-%m-%d')
+            winners_ready = None
         
-        # Check if it's winners posting time (within 10 minute window)
-        if now.hour == winners_post_hour and now.minute <= 9:
-            daily_winners_logger.info(f"DAILY WINNERS TIME! Posting winners summary at {now}")
-            
-            # Post daily winners to all connected guilds
-            try:
-                connected_guilds = {guild.name for guild in client.guilds}
-                daily_winners_logger.info(f"Posting daily winners to {len(connected_guilds)} guilds")
-                
-                for guild_name in connected_guilds:
-                    channel_id = get_default_channel_id(guild_name)
-                    if not channel_id:
-                        daily_winners_logger.warning(f"No default channel ID for {guild_name}")
-                        continue
+        # Post daily winners to all connected guilds
+        try:
+            # Use current date for today's winners
+            image = await prepared(winners_ready, build_winners, "daily winners")
+            await broadcast(client, [f"🏆 **Daily Game Winners** - {current_date}", image], "daily winners",
+                            daily_winners_logger)
+            daily_winners_logger.info(f"Render cache: {render_cache_stats()}, executor: {render_executor_stats()}")
                     
-                    channel = client.get_channel(channel_id)
-                    if not channel:
-                        daily_winners_logger.error(f"Could not get channel object for channel ID {channel_id} in {guild_name}")
-                        continue
-                    
-                    try:
-                        # Post announcement message
-                        current_date = now.strftime('%Y-%m-%d')
-                        await channel.send(f"🏆 **Daily Game Winners** - {current_date}")
-                        
-                        # Generate and send winners leaderboard image
-                        leaderboards = Leaderboards(client, tree)
-                        
-                        # Use current date for today's winners
-                        img_path = await leaderboards.show_leaderboard(game='winners', timeframe=current_date)
-                        
-                        if (isinstance(img_path, str) and 
-                            img_path.endswith('.png') and 
-                            os.path.exists(img_path)):
-                            await channel.send(file=discord.File(img_path))
-                            daily_winners_logger.info(f"Successfully posted daily winners to {guild_name}")
-                        else:
-                            error_msg = img_path if isinstance(img_path, str) else "Unknown error"
-                            daily_winners_logger.error(f"Failed to generate winners for {guild_name}: {error_msg}")
-                            await channel.send("Error: Could not generate daily winners image")
-                            
-                    except Exception as e:
-                        log_exception(daily_winners_logger, e, f"posting daily winners to {guild_name}")
-                        
-            except Exception as e:
-                log_exception(daily_winners_logger, e, "posting daily winners")
-                
-        else:
-            daily_winners_logger.debug(f"Not winners posting time - current: {now.hour}:{now.minute:02d}, posts at: {winners_post_hour}:00")
-                            
+        except Exception as e:
+            log_exception(daily_winners_logger, e, "posting daily winners")
+
     except Exception as e:
         log_exception(daily_winners_logger, e, "daily_winners_summary task execution")
+        raise  # counted by the task supervisor
 
 @daily_winners_summary.before_loop
 async def before_daily_winners_summary():
@@ -377,41 +288,109 @@ async def after_daily_winners_summary():
     else:
         daily_winners_logger.error("Daily winners summary task stopped unexpectedly")
 
+# task 5 - replay scores spooled locally during a database outage
+@tasks.loop(seconds=30)
+@supervised('replay_score_spool')
+async def replay_score_spool():
+    try:
+        pending = pending_count()
+        if not pending:
+            return
+
+        score_spool_logger.info(f"{pending} spooled score row(s) waiting, attempting replay")
+        replayed = await replay_spool()
+        if replayed:
+            score_spool_logger.info(f"Replayed {replayed} spooled score row(s), {pending_count()} remaining")
+
+    except Exception as e:
+        log_exception(score_spool_logger, e, "replay_score_spool task execution")
+        raise  # counted by the task supervisor
+
+@replay_score_spool.before_loop
+async def before_replay_score_spool():
+    score_spool_logger.info("Score spool replay task starting...")
+
+@replay_score_spool.after_loop
+async def after_replay_score_spool():
+    if replay_score_spool.is_being_cancelled():
+        score_spool_logger.warning("Score spool replay task was cancelled")
+    else:
+        score_spool_logger.error("Score spool replay task stopped unexpectedly")
+
+# task 6 - rebuild recent daily standings partitions (picks up NYT rows written outside the bot)
+@tasks.loop(minutes=5)
+@supervised('reconcile_daily_standings')
+async def reconcile_daily_standings():
+    try:
+        days = STARTUP_RECONCILE_DAYS if reconcile_daily_standings.current_loop == 0 else RECONCILE_DAYS
+        start = datetime.now()
+        partitions = await reconcile_standings(days=days)
+        if reconcile_daily_standings.current_loop == 0:
+            # Months not rolled up yet (first run, or games added since) are built once
+            await monthly_rollups.backfill_rollups()
+        # Seed (first loop) or refresh the in-memory boards from the reconciled standings
+        loaded = await ranking_engine.reload(days=RECONCILE_DAYS)
+        standings_logger.debug(f"Reconciled {partitions} partition(s) over {days} day(s), {loaded} row(s) in memory, "
+                               f"in {(datetime.now() - start).total_seconds():.1f}s")
+
+    except Exception as e:
+        log_exception(standings_logger, e, "reconcile_daily_standings task execution")
+        raise  # counted by the task supervisor
+
+@reconcile_daily_standings.before_loop
+async def before_reconcile_daily_standings():
+    standings_logger.info("Daily standings reconcile task starting...")
+
+@reconcile_daily_standings.after_loop
+async def after_reconcile_daily_standings():
+    if reconcile_daily_standings.is_being_cancelled():
+        standings_logger.warning("Daily standings reconcile task was cancelled")
+    else:
+        standings_logger.error("Daily standings reconcile task stopped unexpectedly")
+
+async def _start_leader_tasks(client: discord.Client, tree: discord.app_commands.CommandTree):
+    """The tasks that post to Discord; only the task leader runs them (see task_leader.py)."""
+    # Pick up where the last leader left off (fire times, mini leaders), not this process's old copy.
+    # If that can't be read, raise: posting from stale state could repeat or skip posts, so
+    # task_leader steps down and tries again at the next heartbeat
+    await load_shared_state([SCHEDULER_STATE_KEY, MINI_LEADERS_KEY])
+    reset_leader_tracking()
+
+    start_supervised('post_new_mini_leaders', post_new_mini_leaders, client, tree)
+    setup_logger.info("✓ Started post_new_mini_leaders task (60 second interval)")
+
+    # Start scheduled tasks (each sleeps until its next US/Eastern fire time)
+    start_supervised('reset_mini_leaders', reset_mini_leaders, client)
+    setup_logger.info(f"✓ Started reset_mini_leaders task (at {SCHEDULE['reset_mini_leaders']} US/Eastern)")
+
+    start_supervised('daily_mini_summary', daily_mini_summary, client, tree)
+    setup_logger.info(f"✓ Started daily_mini_summary task (at {SCHEDULE['daily_mini_summary']} US/Eastern)")
+
+    start_supervised('daily_winners_summary', daily_winners_summary, client, tree)
+    setup_logger.info(f"✓ Started daily_winners_summary task (at {SCHEDULE['daily_winners_summary']} US/Eastern)")
+
+def _stop_leader_tasks():
+    for name in LEADER_TASKS:
+        stop_supervised(name)
+    setup_logger.warning(f"Stopped {', '.join(LEADER_TASKS)} (standing by for task leadership)")
+
 def setup_tasks(client: discord.Client, tree: discord.app_commands.CommandTree):
     setup_logger.info("="*40)
     setup_logger.info("SETTING UP BACKGROUND TASKS")
     setup_logger.info("="*40)
     
     try:
-        # Start the continuous monitoring task
-        if post_new_mini_leaders.is_running():
-            setup_logger.warning("post_new_mini_leaders already running, stopping first")
-            post_new_mini_leaders.stop()
-        
-        post_new_mini_leaders.start(client, tree)
-        setup_logger.info("✓ Started post_new_mini_leaders task (60 second interval)")
-
-        # Start time-based tasks (they have their own time checks)
-        if reset_mini_leaders.is_running():
-            setup_logger.warning("reset_mini_leaders already running, stopping first")
-            reset_mini_leaders.stop()
-            
-        reset_mini_leaders.start(client)
-        setup_logger.info("✓ Started reset_mini_leaders task (every 10 minutes)")
+        # Started through the supervisor, which restarts any loop that stops (see task_supervisor.py)
+        # The posting tasks start once this process holds the task leadership lock
+        start_leader_election(lambda: _start_leader_tasks(client, tree), _stop_leader_tasks)
+        setup_logger.info("✓ Started task_leader election (posting tasks start on this process if it leads)")
         
-        if daily_mini_summary.is_running():
-            setup_logger.warning("daily_mini_summary already running, stopping first")
-            daily_mini_summary.stop()
-            
-        daily_mini_summary.start(client, tree)
-        setup_logger.info("✓ Started daily_mini_summary task (every 10 minutes)")
+        # Every process replays its own spool and keeps its own in-memory standings
+        start_supervised('replay_score_spool', replay_score_spool)
+        setup_logger.info("✓ Started replay_score_spool task (30 second interval)")
         
-        if daily_winners_summary.is_running():
-            setup_logger.warning("daily_winners_summary already running, stopping first")
-            daily_winners_summary.stop()
-            
-        daily_winners_summary.start(client, tree)
-        setup_logger.info("✓ Started daily_winners_summary task (every 10 minutes)")
+        start_supervised('reconcile_daily_standings', reconcile_daily_standings)
+        setup_logger.info("✓ Started reconcile_daily_standings task (5 minute interval)")
         
         setup_logger.info("="*40)
         setup_logger.info("ALL BACKGROUND TASKS STARTED SUCCESSFULLY")
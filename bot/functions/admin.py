@@ -1,54 +1,59 @@
+import copy
 import os
 import json
 import discord
 
 # read json
-def read_json(filepath, default_data=[]):
-
-    # Ensure the directory exists
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+def read_json(filepath, default_data=None):
+    """Load a JSON file; a missing or unreadable file is (re)written with default_data ([] if not given)."""
+    if default_data is None:
+        default_data = []
 
     try:
         with open(filepath, 'r') as file:
             return json.load(file)
     except (FileNotFoundError, json.JSONDecodeError):
-        with open(filepath, 'w') as file:
-            json.dump(default_data, file)
+        write_json(filepath, default_data)
         return default_data
 
 # write json
 def write_json(filepath, data):
+    """Write a JSON file atomically: a crash leaves either the old file or the new one."""
     
     # Ensure the directory exists
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
 
-    with open(filepath, 'w') as file:
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, 'w') as file:
         json.dump(data, file, indent=4)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, filepath)
 
 # get default channel id
 def get_default_channel_id(guild_name):
-    config_path = direct_path_finder('files', 'guilds', guild_name, 'config.json')
-    try:
-        config = read_json(config_path)
-        channel_id = config.get("default_channel_id")
-        if channel_id is not None:
-            return int(channel_id)
-        else:
-            print(f"admin.py: default_channel_id not found in config.json for guild '{guild_name}'")
-    except FileNotFoundError:
+    from bot.functions.state_store import get_state, guild_key  # state_store imports this module
+    config = get_state(guild_key(guild_name, 'config.json'))
+    if config is None:
         print(f"admin.py: config.json not found for guild '{guild_name}'")
-    except json.JSONDecodeError:
-        print(f"admin.py: Error decoding config.json for guild '{guild_name}'")
+        return None
+    channel_id = config.get("default_channel_id")
+    if channel_id is None:
+        print(f"admin.py: default_channel_id not found in config.json for guild '{guild_name}'")
+        return None
+    try:
+        return int(channel_id)
     except ValueError:
         print(f"admin.py: Invalid channel ID in config.json for guild '{guild_name}'")
     return None
 
 async def update_guild_config(guild: discord.Guild):
     """Update the guild's config.json with current channel and user information."""
-    config_path = direct_path_finder('files', 'guilds', guild.name, 'config.json')
+    from bot.functions.state_store import get_state, set_state, guild_key  # state_store imports this module
+    key = guild_key(guild.name, 'config.json')
     
     # Load existing config or create new
-    config = read_json(config_path, {})
+    config = copy.deepcopy(get_state(key, {}))
     
     # Update channels
     channels = []
@@ -82,15 +87,16 @@ async def update_guild_config(guild: discord.Guild):
                 config["games"] = list(games_data.keys())
     
     # Save updated config
-    write_json(config_path, config)
+    set_state(key, config)
     return config
 
 async def save_guild_config(guild: discord.Guild):
     """Save guild configuration including channel and user information."""
-    config_path = direct_path_finder('files', 'guilds', guild.name, 'config.json')
+    from bot.functions.state_store import get_state, set_state, guild_key  # state_store imports this module
+    key = guild_key(guild.name, 'config.json')
     
     # Load existing config or create new
-    config = read_json(config_path, {})
+    config = copy.deepcopy(get_state(key, {}))
     
     # Update channels
     channels = []
@@ -122,7 +128,7 @@ async def save_guild_config(guild: discord.Guild):
                 config["games"] = list(games_data.keys())
     
     # Save updated config
-    write_json(config_path, config)
+    set_state(key, config)
     return config
 
 def direct_path_finder(*relative_path_parts: str) -> str:
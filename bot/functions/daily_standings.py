@@ -0,0 +1,136 @@
+import asyncio
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Optional
+from bot.functions.admin import direct_path_finder
+from bot.functions.sql_helper import execute_query, get_backend
+from bot.functions import monthly_rollups
+from bot.connections.logging_config import get_logger, log_exception
+
+standings_logger = get_logger('daily_standings')
+
+# games.daily_standings holds the rows games.daily_view would return, one per
+# (game_name, game_date, player_name), so daily leaderboards are indexed lookups.
+# Partitions are re-ranked after each score insert and reconciled periodically.
+
+# Recent days the reconcile task rebuilds (NYT history is written outside the bot)
+RECONCILE_DAYS = 2
+# Wider window rebuilt once when the bot starts, to catch up on anything missed while down
+STARTUP_RECONCILE_DAYS = 30
+
+# Games whose scores arrive through the NYT importer rather than the bot's own inserts.
+# Their partitions are refreshed when the watermark probes (mini_watermark.sql,
+# score_watermark.sql) see new rows, and right before the posts that show them.
+IMPORTED_GAMES = ('mini', 'daily')
+
+_partition_locks = defaultdict(asyncio.Lock)
+_table_checked = False
+
+def _read_query(*path) -> str:
+    with open(direct_path_finder('files', 'queries', *path), 'r', encoding='utf-8') as file:
+        return file.read()
+
+async def ensure_standings_table():
+    """Create games.daily_standings if it doesn't exist yet."""
+    global _table_checked
+    if _table_checked or get_backend() is not None:  # the local schema already has it
+        return
+    await execute_query(_read_query('tables', 'games_daily_standings.sql'), lane='write')
+    _table_checked = True
+
+async def _partition_rows(params: dict, lane: str) -> list:
+    # Everything but refreshed_ts, which every refresh moves on
+    return await execute_query("""
+        SELECT player_name, game_rank, points, game_score, score_as_int, game_completed,
+            game_detail, game_bonuses, added_ts
+        FROM games.daily_standings
+        WHERE game_name = %(game_name)s
+            AND game_date = %(game_date)s
+        ORDER BY player_name
+    """, params, lane=lane)
+
+async def refresh_partition(game_name: str, game_date, lane: str = 'write') -> bool:
+    """
+    Re-rank one (game_name, game_date) partition of games.daily_standings from the
+    source tables. Returns True if that changed any of its rows.
+    """
+    game_name = game_name.lower()
+    game_date = str(game_date)
+
+    async with _partition_locks[(game_name, game_date)]:
+        await ensure_standings_table()
+        refreshed_ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+        params = {'game_name': game_name, 'game_date': game_date, 'refreshed_ts': refreshed_ts}
+        before = await _partition_rows(params, lane)
+        await execute_query(_read_query('active', 'refresh_daily_standings.sql'), params, lane=lane)
+
+        # Anything not touched by this refresh is no longer in the source tables
+        await execute_query("""
+            DELETE FROM games.daily_standings
+            WHERE game_name = %(game_name)s
+                AND game_date = %(game_date)s
+                AND refreshed_ts < %(refreshed_ts)s
+        """, params, lane=lane)
+        return await _partition_rows(params, lane) != before
+
+async def update_after_insert(game_name: str, game_date) -> bool:
+    """Refresh the partition a new score landed in. Returns False (and logs) on failure."""
+    try:
+        if await refresh_partition(game_name, game_date):
+            # Range leaderboards read whole months from the rollups
+            monthly_rollups.schedule_refresh(game_name, game_date)
+        return True
+    except Exception as e:
+        log_exception(standings_logger, e, f"refreshing daily standings for {game_name} {game_date}")
+        return False
+
+async def refresh_imported(game_date, games=IMPORTED_GAMES, lane: str = 'background') -> bool:
+    """Refresh the partitions of importer-fed games for a date. Returns False (and logs) on failure."""
+    try:
+        for game_name in games:
+            if await refresh_partition(game_name, game_date, lane=lane):
+                monthly_rollups.schedule_refresh(game_name, game_date)
+        return True
+    except Exception as e:
+        log_exception(standings_logger, e, f"refreshing imported standings for {game_date}")
+        return False
+
+async def reconcile_standings(days: Optional[int] = RECONCILE_DAYS, lane: str = 'background') -> int:
+    """
+    Rebuild every partition from the last `days` days (all history if None).
+
+    Covers partitions present in any source table or in the standings table
+    itself, so partitions whose source rows were removed get emptied too.
+    Only the months of partitions that changed are rebuilt in the rollups.
+    Returns the number of partitions refreshed.
+    """
+    await ensure_standings_table()
+    start_date = date.today() - timedelta(days=days) if days is not None else date(1900, 1, 1)
+
+    partitions = await execute_query("""
+        SELECT DISTINCT lower(game_name) AS game_name, game_date
+        FROM games.game_history
+        WHERE game_date >= %(start_date)s
+        UNION
+        SELECT DISTINCT puzzle_type, print_date
+        FROM games.nyt_history
+        WHERE print_date >= %(start_date)s
+        UNION
+        SELECT DISTINCT 'mini', game_date
+        FROM matt.mini_history
+        WHERE game_date >= %(start_date)s
+        UNION
+        SELECT DISTINCT game_name, game_date
+        FROM games.daily_standings
+        WHERE game_date >= %(start_date)s
+    """, {'start_date': start_date}, lane=lane)
+
+    changed = []
+    for row in partitions:
+        if await refresh_partition(row['game_name'], row['game_date'], lane=lane):
+            changed.append((row['game_name'], row['game_date']))
+    await monthly_rollups.refresh_months(changed, lane=lane)
+
+    standings_logger.info(f"Reconciled {len(partitions)} daily standings partition(s) since {start_date} "
+                          f"({len(changed)} changed)")
+    return len(partitions)
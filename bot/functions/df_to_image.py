@@ -1,20 +1,102 @@
+import hashlib
+import io
+from collections import OrderedDict
+from functools import lru_cache
 import pandas as pd
 from PIL import Image, ImageDraw, ImageFont
 from bot.connections.config import FONT_PATH
 from bot.functions.admin import direct_path_finder
-import platform
 import os
-# returns the image filepath
-def df_to_image(df, 
-                                 img_filepath='files/images/leaderboard.png', 
-                                 img_title="Today's Mini", 
-                                 img_subtitle="Leaderboard",
-                                 left_aligned_columns=['Game', 'Name', 'Player', 'Genre'],
-                                 right_aligned_columns=['Rank', 'Time', 'Score','Points', 'Wins',
-                                                        'Top 3', 'Top 5', 'Top 10', 'Played', 'Games', 
-                                                        'Scores Added', 'Avg', '1st', '2nd', '3rd', '4th', '5th', 
-                                                        'rank', 'points', 'avg', '1st', '2nd', '3rd', '4th', '5th', 'top_10', 'games']):
 
+# Rendered image bytes keyed by a hash of everything that affects the image, so the
+# same leaderboard posted to several guilds (or asked for by several users) is only
+# drawn once per data change. Least recently used entries are evicted past the byte cap.
+RENDER_CACHE_MAX_BYTES = int(os.getenv('RENDER_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+RENDER_CACHE_MAX_ENTRIES = 256
+
+_render_cache = OrderedDict()
+_render_cache_bytes = 0
+_render_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+def _render_key(df, *style) -> str:
+    h = hashlib.sha256()
+    h.update(repr(style).encode('utf-8'))
+    h.update(repr(list(df.columns)).encode('utf-8'))
+    h.update(df.to_csv(index=False).encode('utf-8'))
+    return h.hexdigest()
+
+def _cache_get(key):
+    data = _render_cache.get(key)
+    if data is None:
+        _render_cache_stats['misses'] += 1
+        return None
+    _render_cache.move_to_end(key)
+    _render_cache_stats['hits'] += 1
+    return data
+
+def _cache_put(key, data: bytes):
+    global _render_cache_bytes
+    if len(data) > RENDER_CACHE_MAX_BYTES:
+        return
+    _render_cache[key] = data
+    _render_cache_bytes += len(data)
+    while _render_cache_bytes > RENDER_CACHE_MAX_BYTES or len(_render_cache) > RENDER_CACHE_MAX_ENTRIES:
+        _, evicted = _render_cache.popitem(last=False)
+        _render_cache_bytes -= len(evicted)
+        _render_cache_stats['evictions'] += 1
+
+def render_cache_stats() -> dict:
+    """Hit/miss counts, hit rate and current size of the render cache."""
+    lookups = _render_cache_stats['hits'] + _render_cache_stats['misses']
+    return {
+        **_render_cache_stats,
+        'hit_rate': round(_render_cache_stats['hits'] / lookups, 3) if lookups else 0.0,
+        'entries': len(_render_cache),
+        'bytes': _render_cache_bytes,
+    }
+
+def clear_render_cache():
+    global _render_cache_bytes
+    _render_cache.clear()
+    _render_cache_bytes = 0
+
+LEFT_ALIGNED_COLUMNS = ['Game', 'Name', 'Player', 'Genre']
+RIGHT_ALIGNED_COLUMNS = ['Rank', 'Time', 'Score','Points', 'Wins',
+                         'Top 3', 'Top 5', 'Top 10', 'Played', 'Games', 
+                         'Scores Added', 'Avg', '1st', '2nd', '3rd', '4th', '5th', 
+                         'rank', 'points', 'avg', '1st', '2nd', '3rd', '4th', '5th', 'top_10', 'games']
+
+# Leaderboards are a few flat colors plus anti-aliased text, so a small palette loses
+# nothing visible and encodes 2-4x smaller (and faster) than full RGB. Images over the
+# byte budget are re-encoded with fewer colors and optimization until they fit.
+IMAGE_FORMAT = os.getenv('IMAGE_FORMAT', 'png').lower()       # 'png' or 'webp' (lossless)
+IMAGE_EXTENSION = 'webp' if IMAGE_FORMAT == 'webp' else 'png'
+IMAGE_COLORS = int(os.getenv('IMAGE_COLORS', 32))             # palette size, 0 keeps full RGB
+IMAGE_OPTIMIZE = os.getenv('IMAGE_OPTIMIZE', 'false').lower() == 'true'
+IMAGE_MAX_BYTES = int(os.getenv('IMAGE_MAX_BYTES', 1024 * 1024))
+
+def _encode(img, colors: int, optimize: bool) -> bytes:
+    if colors:
+        img = img.quantize(colors=colors, method=Image.Quantize.FASTOCTREE)
+    buffer = io.BytesIO()
+    if IMAGE_FORMAT == 'webp':
+        img.save(buffer, format='WEBP', lossless=True, method=6 if optimize else 4)
+    else:
+        img.save(buffer, format='PNG', optimize=optimize)
+    return buffer.getvalue()
+
+def encode_image(img) -> bytes:
+    """Encode a rendered leaderboard with the configured palette and format, within IMAGE_MAX_BYTES."""
+    data = _encode(img, IMAGE_COLORS, IMAGE_OPTIMIZE)
+    for colors in (min(IMAGE_COLORS or 256, 16), 8):
+        if len(data) <= IMAGE_MAX_BYTES:
+            return data
+        data = min(data, _encode(img, colors, True), key=len)
+    if len(data) > IMAGE_MAX_BYTES:
+        print(f"Leaderboard image is {len(data)} bytes, over the {IMAGE_MAX_BYTES} byte budget")
+    return data
+
+def _resolve_path(img_filepath):
     # Ensure the image filepath uses the proper absolute path
     if not os.path.isabs(img_filepath):
         # Convert relative path to absolute using direct_path_finder
@@ -24,8 +106,109 @@ def df_to_image(df,
     
     # Ensure the directory exists
     os.makedirs(os.path.dirname(img_filepath), exist_ok=True)
+    return img_filepath
+
+# returns an in-memory image, ready for discord.File(buffer, filename=...)
+def df_to_buffer(df,
+                 img_title="Today's Mini",
+                 img_subtitle="Leaderboard",
+                 left_aligned_columns=LEFT_ALIGNED_COLUMNS,
+                 right_aligned_columns=RIGHT_ALIGNED_COLUMNS,
+                 debug_filepath=None):
+    """
+    Render a DataFrame as an image (IMAGE_FORMAT) and return it as a BytesIO.
+
+    Each call gets its own buffer, so concurrent requests can't overwrite each
+    other's image. Pass debug_filepath to also write the image to disk.
+    """
+    data = _render_png(df, img_title, img_subtitle, left_aligned_columns, right_aligned_columns)
+    if debug_filepath:
+        with open(_resolve_path(debug_filepath), 'wb') as file:
+            file.write(data)
+    return io.BytesIO(data)
+
+# Small leaderboards are sent as a monospace table instead of an image: no drawing,
+# no encoding and no attachment upload. Boards up to these sizes qualify.
+TEXT_MAX_ROWS = int(os.getenv('LEADERBOARD_TEXT_MAX_ROWS', 10))
+TEXT_MAX_WIDTH = int(os.getenv('LEADERBOARD_TEXT_MAX_WIDTH', 56))  # characters, so it doesn't wrap on phones
+
+class TextTable:
+    """A leaderboard formatted as an aligned code block, sent as message text or in an embed."""
+
+    def __init__(self, title: str, subtitle: str, table: str, as_embed: bool = True):
+        self.title = title
+        self.subtitle = subtitle
+        self.table = table
+        self.as_embed = as_embed
+
+    @property
+    def code_block(self) -> str:
+        return f"```\n{self.table}\n```"
+
+    def content(self) -> str:
+        return f"**{self.title}**\n{self.subtitle}\n{self.code_block}"
+
+def df_to_table(df,
+                left_aligned_columns=LEFT_ALIGNED_COLUMNS,
+                right_aligned_columns=RIGHT_ALIGNED_COLUMNS) -> str:
+    """Format a DataFrame as monospace rows, aligned the same way df_to_image aligns its cells."""
+    columns = [str(col) for col in df.columns]
+    cells = [[str(x) for x in df[col].tolist()] for col in df.columns]
+    widths = [max([len(col)] + [len(x) for x in col_cells]) for col, col_cells in zip(columns, cells)]
+    right_aligned = [col not in left_aligned_columns for col in df.columns]
+
+    def line(values):
+        return '  '.join(value.rjust(width) if align_right else value.ljust(width)
+                         for value, width, align_right in zip(values, widths, right_aligned)).rstrip()
+
+    lines = [line(columns), line(['-' * width for width in widths])]
+    lines += [line(row) for row in zip(*cells)]
+    return '\n'.join(lines)
+
+def fits_as_text(df) -> bool:
+    """True if the leaderboard is small enough to send as a text table."""
+    if len(df) > TEXT_MAX_ROWS:
+        return False
+    return max(len(row) for row in df_to_table(df).split('\n')) <= TEXT_MAX_WIDTH
+
+# returns the image filepath
+def df_to_image(df, 
+                                 img_filepath='files/images/leaderboard.png', 
+                                 img_title="Today's Mini", 
+                                 img_subtitle="Leaderboard",
+                                 left_aligned_columns=LEFT_ALIGNED_COLUMNS,
+                                 right_aligned_columns=RIGHT_ALIGNED_COLUMNS):
 
-    # Set colors
+    img_filepath = _resolve_path(img_filepath)
+    with open(img_filepath, 'wb') as file:
+        file.write(_render_png(df, img_title, img_subtitle, left_aligned_columns, right_aligned_columns))
+    return img_filepath
+
+# returns the encoded image bytes
+def _render_png(df, img_title, img_subtitle, left_aligned_columns, right_aligned_columns):
+
+    cache_key = _render_key(df, img_title, img_subtitle, left_aligned_columns, right_aligned_columns, FONT_PATH)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    data = get_renderer().render(df, img_title, img_subtitle, left_aligned_columns, right_aligned_columns)
+    _cache_put(cache_key, data)
+    
+    return data
+
+@lru_cache(maxsize=None)
+def get_font(font_path: str, font_size: int):
+    """Load a TrueType font once per (path, size)."""
+    return ImageFont.truetype(font_path, font_size)
+
+class LeaderboardRenderer:
+    """
+    Draws leaderboard tables with one long-lived font and a memo of text widths.
+
+    Player names, headers and score formats repeat across renders, so each
+    distinct string is measured once per renderer, and each cell once per render.
+    """
     header_bg_color = '#4a4e53'
     row_bg_color = '#2c2f33'
     text_color = 'white'
@@ -33,95 +216,137 @@ def df_to_image(df,
     subtitle_color = '#a0a0a0'  # Color for the subtitle
     border_color = '#a0a0a0'
     padding = 8
+    max_cached_widths = 20000
 
-    # Determine the font path based on the operating system
-    if platform.system() == 'Windows':
-        font_path = 'C:/Windows/Fonts/arial.ttf'
-    elif platform.system() == 'Darwin':  # macOS
-        font_path = '/Library/Fonts/Arial.ttf'
-    else:  # linux on remote
-        font_path = '/usr/share/fonts/truetype/ARIAL.TTF'  # Using uppercase as it was working before
+    def __init__(self, font_path: str = FONT_PATH, font_size: int = 18):
+        self.font = get_font(font_path, font_size)
+        self._widths = {}
+        # Text height metrics don't depend on the string
+        self.line_height = self.font.getbbox('A')[3]
+        self.title_height = self.font.getbbox('A')[1]
+        self.row_height = self.line_height + 2 * self.padding
 
-    font_size = 18
-    font = ImageFont.truetype(FONT_PATH, font_size)
+    def text_width(self, text: str) -> float:
+        width = self._widths.get(text)
+        if width is None:
+            if len(self._widths) >= self.max_cached_widths:
+                self._widths.clear()
+            width = self._widths[text] = self.font.getlength(text)
+        return width
 
-    # Temporary image and draw object for calculating column widths
-    temp_img = Image.new('RGB', (1, 1))
-    temp_draw = ImageDraw.Draw(temp_img)
-    
-    # calculate row height
-    row_height = font.getbbox('A')[3] + 2 * padding
+    def _wrap(self, text: str, max_width: float) -> list:
+        lines = []
+        current_line = []
+        for word in text.split():
+            test_line = ' '.join(current_line + [word])
+            if self.text_width(test_line) <= max_width:
+                current_line.append(word)
+            else:
+                if current_line:
+                    lines.append(' '.join(current_line))
+                current_line = [word]
+        if current_line:
+            lines.append(' '.join(current_line))
+        return lines
 
-    # old col widths calculation
-    #col_widths = [max(temp_draw.textlength(str(max(df[col].tolist() + [col], key=lambda x: len(str(x)))), font) for col in df.columns) + 2 * padding for col in df.columns]
+    def render(self, df, img_title, img_subtitle, left_aligned_columns, right_aligned_columns) -> bytes:
+        """Render a DataFrame as a table and return the encoded image bytes."""
+        return encode_image(self.draw(df, img_title, img_subtitle, left_aligned_columns, right_aligned_columns))
 
-    # new col widths calculation    
-    col_widths = [max(temp_draw.textlength(str(x), font) for x in df[col].tolist() + [col]) + 2 * padding for col in df.columns]
-    
-    # Create a new image
-    img_width = sum(col_widths)
-    img_height = (len(df) + 2) * row_height + row_height  # Add an extra row for the title
-    img = Image.new('RGB', (int(img_width), int(img_height)), row_bg_color)
-    draw = ImageDraw.Draw(img)
-
-    # Draw title
-    title_width = draw.textlength(img_title, font)
-    title_height = font.getbbox('A')[1]
-    draw.text(((img_width - title_width) // 2, padding), img_title, font=font, fill=title_color)
-
-    # Draw subtitle with word wrapping
-    max_subtitle_width = img_width - 2 * padding  # Leave some padding on both sides
-    words = img_subtitle.split()
-    lines = []
-    current_line = []
-    
-    for word in words:
-        test_line = ' '.join(current_line + [word])
-        if draw.textlength(test_line, font) <= max_subtitle_width:
-            current_line.append(word)
-        else:
-            if current_line:
-                lines.append(' '.join(current_line))
-            current_line = [word]
-    if current_line:
-        lines.append(' '.join(current_line))
-    
-    # Draw each line of the subtitle
-    subtitle_y = padding + title_height + row_height
-    for line in lines:
-        line_width = draw.textlength(line, font)
-        draw.text(((img_width - line_width) // 2, subtitle_y), line, font=font, fill=subtitle_color)
-        subtitle_y += font.getbbox('A')[3]  # Move down by line height
-
-    # Draw header
-    x, y = 0, subtitle_y + padding  # Adjust y position based on wrapped subtitle
-    for col, width in zip(df.columns, col_widths):
-        draw.rectangle([x, y, x + width, y + row_height], fill=header_bg_color)
-        text_x = x + padding  # Left-align by default
-        if col not in left_aligned_columns:
-            text_x = x + width - temp_draw.textlength(str(col), font) - padding  # Right-align if not in left_aligned_columns
-        draw.text((text_x, y + padding), col, font=font, fill=text_color)
-        x += width
-
-    # Draw rows
-    y += row_height
-    for _, row in df.iterrows():
-        x = 0
-        for col, width in zip(df.columns, col_widths):
-            # Draw cell borders
-            draw.rectangle([x, y, x + width, y + row_height], outline=border_color)
-
-            # Text alignment
-            text_value = str(row[col])
-            text_width = draw.textlength(text_value, font)
-            text_x = x + padding  # Left-align by default
-            if col not in left_aligned_columns:
-                text_x = x + width - text_width - padding  # Right-align if not in left_aligned_columns
-
-            draw.text((text_x, y + padding), text_value, font=font, fill=text_color)
+    def draw(self, df, img_title, img_subtitle, left_aligned_columns, right_aligned_columns):
+        """Draw a DataFrame as a table and return the (unencoded) image."""
+        font, padding, row_height = self.font, self.padding, self.row_height
+
+        # Measure every cell exactly once; the widths are reused for alignment below
+        columns = [str(col) for col in df.columns]
+        cells = [[str(x) for x in df[col].tolist()] for col in df.columns]
+        cell_widths = [[self.text_width(x) for x in col_cells] for col_cells in cells]
+        header_widths = [self.text_width(col) for col in columns]
+        col_widths = [max(col_cell_widths + [header_width]) + 2 * padding
+                      for col_cell_widths, header_width in zip(cell_widths, header_widths)]
+        
+        # Create a new image
+        img_width = sum(col_widths)
+        img_height = (len(df) + 2) * row_height + row_height  # Add an extra row for the title
+        img = Image.new('RGB', (int(img_width), int(img_height)), self.row_bg_color)
+        draw = ImageDraw.Draw(img)
+
+        # Draw title
+        title_width = self.text_width(img_title)
+        draw.text(((img_width - title_width) // 2, padding), img_title, font=font, fill=self.title_color)
+
+        # Draw subtitle with word wrapping, leaving some padding on both sides
+        subtitle_y = padding + self.title_height + row_height
+        for line in self._wrap(img_subtitle, img_width - 2 * padding):
+            line_width = self.text_width(line)
+            draw.text(((img_width - line_width) // 2, subtitle_y), line, font=font, fill=self.subtitle_color)
+            subtitle_y += self.line_height  # Move down by line height
+
+        # Draw header
+        right_aligned = [col not in left_aligned_columns for col in df.columns]
+        x, y = 0, subtitle_y + padding  # Adjust y position based on wrapped subtitle
+        for col, width, header_width, align_right in zip(columns, col_widths, header_widths, right_aligned):
+            draw.rectangle([x, y, x + width, y + row_height], fill=self.header_bg_color)
+            text_x = x + width - header_width - padding if align_right else x + padding
+            draw.text((text_x, y + padding), col, font=font, fill=self.text_color)
             x += width
+
+        # Draw rows
         y += row_height
+        for row_idx in range(len(df)):
+            x = 0
+            for col_idx, width in enumerate(col_widths):
+                # Draw cell borders
+                draw.rectangle([x, y, x + width, y + row_height], outline=self.border_color)
 
-    img.save(img_filepath)
-    
-    return img_filepath
\ No newline at end of file
+                # Right-align unless the column is in left_aligned_columns
+                if right_aligned[col_idx]:
+                    text_x = x + width - cell_widths[col_idx][row_idx] - padding
+                else:
+                    text_x = x + padding
+
+                draw.text((text_x, y + padding), cells[col_idx][row_idx], font=font, fill=self.text_color)
+                x += width
+            y += row_height
+
+        return img
+
+    def draw_sections(self, img_title, img_subtitle, sections, left_aligned_columns, right_aligned_columns,
+                      columns: int = 4):
+        """Draw several (section title, DataFrame) tables in a grid of `columns` columns, under one title."""
+        tables = [self.draw(df, section_title, '', left_aligned_columns, right_aligned_columns)
+                  for section_title, df in sections]
+        columns = max(1, min(columns, len(tables)))
+        cell_width = max(table.width for table in tables)
+        grid = [tables[i:i + columns] for i in range(0, len(tables), columns)]
+        row_heights = [max(table.height for table in row) for row in grid]
+
+        img_width = max(cell_width * columns, int(self.text_width(img_title)) + 2 * self.padding)
+        subtitle_lines = self._wrap(img_subtitle, img_width - 2 * self.padding)
+        header_height = self.padding + self.title_height + self.row_height + len(subtitle_lines) * self.line_height
+
+        img = Image.new('RGB', (img_width, header_height + sum(row_heights)), self.row_bg_color)
+        draw = ImageDraw.Draw(img)
+        draw.text(((img_width - self.text_width(img_title)) // 2, self.padding), img_title,
+                  font=self.font, fill=self.title_color)
+        y = self.padding + self.title_height + self.row_height
+        for line in subtitle_lines:
+            draw.text(((img_width - self.text_width(line)) // 2, y), line, font=self.font, fill=self.subtitle_color)
+            y += self.line_height
+
+        # Each table centered in its cell
+        y = header_height
+        for row, row_height in zip(grid, row_heights):
+            for col, table in enumerate(row):
+                img.paste(table, (col * cell_width + (cell_width - table.width) // 2, y))
+            y += row_height
+        return img
+
+_renderer = None
+
+def get_renderer() -> LeaderboardRenderer:
+    """The shared renderer, created on first use."""
+    global _renderer
+    if _renderer is None:
+        _renderer = LeaderboardRenderer()
+    return _renderer
@@ -0,0 +1,334 @@
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import sqlite3
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Optional
+import pandas as pd
+from bot.functions.admin import direct_path_finder
+
+# Embedded SQLite stand-in for the remote MySQL server.
+# Selected with SQL_BACKEND=sqlite (see sql_helper.get_backend); SQL_LOCAL_PATH
+# points at the database file, default is an in-memory database.
+
+SCHEMA_PATH = direct_path_finder('files', 'queries', 'local', 'schema.sql')
+
+# MySQL -> SQLite rewrites applied to every query, in order
+_TRANSLATIONS = [
+    # games.game_history -> games_game_history
+    (re.compile(r'\b(games|matt)\.(\w+)', re.IGNORECASE), lambda m: f"{m.group(1).lower()}_{m.group(2)}"),
+    # date_sub(curdate(), interval 2 week) -> date('now', 'localtime', '-14 days')
+    (re.compile(r'date_sub\(\s*curdate\(\)\s*,\s*interval\s+(\d+)\s+(day|week|month)\s*\)', re.IGNORECASE),
+     lambda m: (f"date('now', 'localtime', '-{int(m.group(1)) * 7} days')" if m.group(2).lower() == 'week'
+                else f"date('now', 'localtime', '-{m.group(1)} {m.group(2).lower()}s')")),
+    (re.compile(r'curdate\(\)', re.IGNORECASE), lambda m: "date('now', 'localtime')"),
+    # GROUP_CONCAT(x ORDER BY y SEPARATOR ', ') -> group_concat(x, ', ')
+    (re.compile(r'GROUP_CONCAT\((.+?)\s+ORDER BY\s+.+?\s+SEPARATOR\s+(\'[^\']*\')\s*\)', re.IGNORECASE | re.DOTALL),
+     lambda m: f"group_concat({m.group(1)}, {m.group(2)})"),
+    # LEFT is a join keyword in SQLite, so left(x, n) needs a different name
+    (re.compile(r'\bleft\s*\(', re.IGNORECASE), lambda m: "mysql_left("),
+    # cast(x as signed) / cast(x as unsigned) -> cast(x as integer)
+    (re.compile(r'\bas\s+(?:un)?signed\b', re.IGNORECASE), lambda m: "as integer"),
+    # Unquoted identifiers that start with a digit (1st, 2nd, ...)
+    (re.compile(r'(?<![\w`"\'])([1-9](?:st|nd|rd|th))\b'), lambda m: f'"{m.group(1)}"'),
+    # INSERT ... ON DUPLICATE KEY UPDATE col = VALUES(col) -> upsert
+    (re.compile(r'ON DUPLICATE KEY UPDATE(.*)$', re.IGNORECASE | re.DOTALL),
+     lambda m: "ON CONFLICT DO UPDATE SET" + re.sub(r'VALUES\((\w+)\)', r'excluded.\1', m.group(1))),
+]
+
+_PARAM_PATTERN = re.compile(r'%%|%\((\w+)\)s|%s')
+
+def _translate_param(m):
+    token = m.group(0)
+    if token == '%%':
+        return '%'
+    if token == '%s':
+        return '?'
+    return f":{m.group(1)}"
+
+_MYSQL_DATE_FORMATS = {
+    '%Y': '%Y', '%m': '%m', '%d': '%d', '%H': '%H', '%i': '%M', '%s': '%S', '%p': '%p',
+    '%W': '%A',
+}
+
+def translate_query(query: str, params=None):
+    """Rewrite a MySQL/pymysql query and its params into SQLite syntax."""
+    for pattern, replacement in _TRANSLATIONS:
+        query = pattern.sub(replacement, query)
+
+    # pymysql paramstyles: %(name)s -> :name, %s -> ?, %% -> %
+    query = _PARAM_PATTERN.sub(_translate_param, query)
+
+    if isinstance(params, dict):
+        params = {k: _to_sqlite_value(v) for k, v in params.items()}
+    else:
+        params = tuple(_to_sqlite_value(v) for v in (params or ()))
+    return query, params
+
+def _to_sqlite_value(value):
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, date):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, list):
+        return ', '.join(str(x) for x in value)
+    return value
+
+# --- MySQL functions used by the ported views and active queries ---
+
+def _regexp_like(value, pattern):
+    if value is None or pattern is None:
+        return None
+    return 1 if re.search(pattern, str(value)) else 0
+
+def _substring_index(value, delim, count):
+    if value is None:
+        return None
+    parts = str(value).split(delim)
+    return delim.join(parts[:count]) if count > 0 else delim.join(parts[count:])
+
+def _mysql_left(value, n):
+    return None if value is None else str(value)[:int(n)]
+
+def _parse_dt(value):
+    if value is None:
+        return None
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(str(value)[:19], fmt)
+        except ValueError:
+            continue
+    return None
+
+def _dayname(value):
+    dt = _parse_dt(value)
+    return dt.strftime('%A') if dt else None
+
+def _date_format(value, fmt):
+    dt = _parse_dt(value)
+    if dt is None:
+        return None
+    out = []
+    i = 0
+    while i < len(fmt):
+        token = fmt[i:i + 2]
+        if token == '%l':
+            out.append(str(int(dt.strftime('%I'))))
+        elif token == '%k':
+            out.append(str(dt.hour))
+        elif token in _MYSQL_DATE_FORMATS:
+            out.append(dt.strftime(_MYSQL_DATE_FORMATS[token]))
+        else:
+            out.append(fmt[i])
+            i += 1
+            continue
+        i += 2
+    return ''.join(out)
+
+def _sec_to_time(seconds):
+    if seconds is None:
+        return None
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+def _time_format(value, fmt):
+    if value is None:
+        return None
+    hours, minutes, seconds = (int(part) for part in str(value).split(':'))
+    return (fmt.replace('%H', f"{hours:02d}").replace('%k', str(hours))
+               .replace('%i', f"{minutes:02d}").replace('%s', f"{seconds:02d}"))
+
+def _concat(*args):
+    if any(a is None for a in args):
+        return None
+    return ''.join(str(a) for a in args)
+
+def _floor(value):
+    # MySQL returns an integer, SQLite's builtin returns a float
+    return None if value is None else math.floor(value)
+
+def _mod(value, divisor):
+    if value is None or divisor is None or divisor == 0:
+        return None
+    return math.fmod(value, divisor) if isinstance(value, float) or isinstance(divisor, float) else int(math.fmod(value, divisor))
+
+def _lpad(value, length, pad):
+    return None if value is None else str(value).rjust(int(length), str(pad))
+
+def _find_in_set(value, items):
+    # 1-based position in a comma-separated list, 0 if absent (case-insensitive, as with MySQL's collation)
+    if value is None or items is None:
+        return None
+    items = [item.lower() for item in str(items).split(',')]
+    value = str(value).lower()
+    return items.index(value) + 1 if value in items else 0
+
+class LocalBackend:
+    """
+    SQLite implementation of execute_query / send_df_to_sql.
+
+    Loads files/queries/local/schema.sql (ported tables and views), translates
+    MySQL query syntax on the fly, and returns rows in the same shape as the
+    MySQL path so leaderboards, tasks and ingestion run unchanged with no network.
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._lock = asyncio.Lock()
+        self._register_functions()
+        with open(SCHEMA_PATH, 'r', encoding='utf-8') as f:
+            self.conn.executescript(f.read())
+        self._load_game_details()
+
+    def _register_functions(self):
+        self.conn.create_function('regexp_like', 2, _regexp_like, deterministic=True)
+        self.conn.create_function('substring_index', 3, _substring_index, deterministic=True)
+        self.conn.create_function('mysql_left', 2, _mysql_left, deterministic=True)
+        self.conn.create_function('dayname', 1, _dayname, deterministic=True)
+        self.conn.create_function('date_format', 2, _date_format, deterministic=True)
+        self.conn.create_function('concat', -1, _concat, deterministic=True)
+        self.conn.create_function('lpad', 3, _lpad, deterministic=True)
+        self.conn.create_function('find_in_set', 2, _find_in_set, deterministic=True)
+        self.conn.create_function('floor', 1, _floor, deterministic=True)
+        self.conn.create_function('mod', 2, _mod, deterministic=True)
+        self.conn.create_function('sec_to_time', 1, _sec_to_time, deterministic=True)
+        self.conn.create_function('time_format', 2, _time_format, deterministic=True)
+
+    def _load_game_details(self):
+        """Seed games.game_details from games.json so scoring types match production."""
+        games_file_path = direct_path_finder('files', 'config', 'games.json')
+        with open(games_file_path, 'r', encoding='utf-8') as f:
+            games_data = json.load(f)
+        rows = [(info['game_name'], info['scoring_type']) for info in games_data.values() if info.get('scoring_type')]
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO games_game_details (game_name, scoring_type) VALUES (?, ?)", rows)
+
+    def _execute(self, query: str, params=None) -> List[Dict[str, Any]]:
+        query, params = translate_query(query, params)
+        with self.conn:
+            cur = self.conn.execute(query, params)
+            rows = cur.fetchall() if cur.description else []
+        # Match the MySQL path: NULL comes back as "-"
+        return [{key: ("-" if row[key] is None else row[key]) for key in row.keys()} for row in rows]
+
+    async def execute_query(self, query: str, params=None) -> List[Dict[str, Any]]:
+        async with self._lock:
+            return await asyncio.to_thread(self._execute, query, params)
+
+    def _send_df(self, df, table_name, if_exists='append', unique_key=None):
+        table = translate_query(table_name)[0]
+        df_cleaned = df.astype(object).where(pd.notnull(df), None)
+        columns = df_cleaned.columns.tolist()
+        placeholders = ', '.join(['?'] * len(columns))
+        rows = [tuple(_to_sqlite_value(v) for v in row) for row in df_cleaned.itertuples(index=False, name=None)]
+
+        verb = "INSERT OR REPLACE" if if_exists == 'upsert' and unique_key else "INSERT"
+        with self.conn:
+            if if_exists == 'replace':
+                self.conn.execute(f"DELETE FROM {table}")
+            self.conn.executemany(f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+
+    async def send_df_to_sql(self, df, table_name, if_exists='append', unique_key=None):
+        if df.empty:
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._send_df, df, table_name, if_exists, unique_key)
+
+    def close(self):
+        self.conn.close()
+
+    def load_synthetic_data(self, days: int = 90, players: int = 12, seed: int = 0,
+                            end_date: Optional[date] = None, play_rate: float = 0.7) -> Dict[str, int]:
+        """
+        Fill the database with reproducible fake players and scores.
+
+        Generates `players` users in a 'Local' guild, then for each of the last
+        `days` days a score for every game in games.json from roughly
+        `play_rate` of the players, a mini and a daily. About half the minis go
+        to matt.mini_history, the rest to games.nyt_history under the player's
+        nyt_id, like the automated importer. Returns row counts per table.
+        """
+        rng = random.Random(seed)
+        source_rng = random.Random(seed + 1)  # separate, so the scores match older runs with the same seed
+        end_date = end_date or datetime.now().date()
+
+        games_file_path = direct_path_finder('files', 'config', 'games.json')
+        with open(games_file_path, 'r', encoding='utf-8') as f:
+            games_data = json.load(f)
+        scored_games = {
+            name: info['scoring_type'] for name, info in games_data.items()
+            if info.get('prefix') and info.get('scoring_type')
+        }
+
+        user_details, user_history, xref_users = [], [], []
+        for i in range(players):
+            player_name = f"Player{i + 1:02d}"
+            discord_name = f"player{i + 1:02d}"
+            nyt_id = f"nyt{i + 1:02d}"
+            discord_id_nbr = 100000000000000000 + i
+            user_details.append((player_name, discord_name, discord_id_nbr, nyt_id, None, None, None, None, None))
+            user_history.append((discord_id_nbr, discord_name, 'local', 'Local'))
+            xref_users.extend([('discord', discord_name, player_name), ('NYT_Legacy', nyt_id, player_name),
+                               ('NYT_Automated', player_name, player_name), ('NYT_Automated', nyt_id, player_name)])
+
+        game_history, mini_history, nyt_history = [], [], []
+        for day_offset in range(days):
+            game_date = end_date - timedelta(days=day_offset)
+            day_str = game_date.strftime('%Y-%m-%d')
+            for i in range(players):
+                discord_name = f"player{i + 1:02d}"
+                skill = 0.5 + i / players  # lower is better
+                for game_name, scoring_type in scored_games.items():
+                    if rng.random() > play_rate:
+                        continue
+                    if scoring_type == 'timed':
+                        seconds = max(10, int(rng.gauss(90 * skill, 25)))
+                        score = f"{seconds // 60}:{seconds % 60:02d}"
+                    elif scoring_type == 'guesses':
+                        guesses = min(7, max(1, int(rng.gauss(4 * skill, 1))))
+                        score = "X/6" if guesses == 7 else f"{guesses}/6"
+                    else:
+                        score = str(max(0, int(rng.gauss(600 / skill, 150))))
+                    added_ts = datetime.combine(game_date, datetime.min.time()) + timedelta(seconds=rng.randint(6 * 3600, 22 * 3600))
+                    game_history.append((added_ts.strftime('%Y-%m-%d %H:%M:%S'), discord_name, game_name, score,
+                                         day_str, f"{game_name} {day_str}", None, 'discord'))
+
+                if rng.random() <= play_rate:
+                    seconds = max(15, int(rng.gauss(60 * skill, 15)))
+                    added_ts = f"{day_str} {rng.randint(6, 21):02d}:{rng.randint(0, 59):02d}:00"
+                    if source_rng.random() < 0.5:
+                        mini_history.append((day_str, f"nyt{i + 1:02d}", f"{seconds // 60}:{seconds % 60:02d}", added_ts))
+                    else:
+                        nyt_history.append((day_str, f"nyt{i + 1:02d}", 'mini', seconds, 1, 1, 100, None, added_ts, added_ts))
+
+                if rng.random() <= play_rate / 2:
+                    seconds = max(300, int(rng.gauss(1500 * skill, 300)))
+                    clean = 1 if rng.random() > 0.3 else 0
+                    nyt_history.append((day_str, f"Player{i + 1:02d}", 'daily', seconds, 1, clean, 100, None,
+                                        f"{day_str} 12:00:00", f"{day_str} 12:00:00"))
+
+        with self.conn:
+            self.conn.executemany("INSERT INTO matt_user_details VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", user_details)
+            self.conn.executemany("INSERT INTO matt_user_history VALUES (?, ?, ?, ?)", user_history)
+            self.conn.executemany("INSERT INTO games_xref_users VALUES (?, ?, ?)", xref_users)
+            self.conn.executemany(
+                "INSERT INTO games_game_history (added_ts, user_name, game_name, game_score, game_date, game_detail, game_bonuses, source_desc) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", game_history)
+            self.conn.executemany("INSERT INTO matt_mini_history VALUES (?, ?, ?, ?)", mini_history)
+            self.conn.executemany(
+                "INSERT INTO games_nyt_history (print_date, player_name, puzzle_type, solving_seconds, solved, clean_solve, "
+                "percent_filled, star, solved_datetime, bot_added_ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", nyt_history)
+
+        return {
+            'matt.user_details': len(user_details),
+            'games.game_history': len(game_history),
+            'matt.mini_history': len(mini_history),
+            'games.nyt_history': len(nyt_history),
+        }
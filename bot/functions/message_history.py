@@ -2,6 +2,7 @@ import json
 import os
 from typing import Dict, List, Tuple
 from bot.functions.admin import direct_path_finder
+from bot.functions.state_store import get_state, set_state, guild_key
 from bot.functions.save_messages import is_game_score
 from bot.functions.save_scores import process_game_score
 from bot.functions import execute_query
@@ -10,16 +11,11 @@ from datetime import datetime, timedelta
 import pytz
 import discord
 
-def get_metadata_path(guild_name: str) -> str:
-    """Get the path to the metadata file for a guild."""
-    return direct_path_finder('files', 'guilds', guild_name, 'history_tracker.json')
-
 def load_metadata(guild_name: str) -> Dict:
     """Load metadata about message history collection."""
-    metadata_path = get_metadata_path(guild_name)
-    if os.path.exists(metadata_path):
-        with open(metadata_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+    metadata = get_state(guild_key(guild_name, 'history_tracker.json'))
+    if metadata is not None:
+        return dict(metadata)
     return {
         "last_initialized": None,
         "oldest_message_ts": None,
@@ -30,10 +26,7 @@ def load_metadata(guild_name: str) -> Dict:
 
 def save_metadata(guild_name: str, metadata: Dict):
     """Save metadata about message history collection."""
-    metadata_path = get_metadata_path(guild_name)
-    os.makedirs(os.path.dirname(metadata_path), exist_ok=True)
-    with open(metadata_path, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, indent=2)
+    set_state(guild_key(guild_name, 'history_tracker.json'), metadata)
 
 async def collect_recent_messages(channel, latest_ts: str = None, lookback_days: int = 7) -> Tuple[int, int]:
     """Collect recent messages from a channel and save any new ones to messages.json.
@@ -145,7 +138,7 @@ async def collect_recent_messages(channel, latest_ts: str = None, lookback_days:
                         AND game_date = %s
                     """
                     game_date = message.created_at.astimezone(pytz.timezone('US/Eastern')).strftime("%Y-%m-%d")
-                    result = await execute_query(check_query, [message.author.name, game_name, game_date])
+                    result = await execute_query(check_query, [message.author.name, game_name, game_date], lane='background')
                     
                     # If score doesn't exist, process it
                     if result[0]['count'] == 0:
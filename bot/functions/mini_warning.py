@@ -1,14 +1,81 @@
 import discord
+import os
 import pandas as pd
 from datetime import datetime, timedelta
 from bot.functions import execute_query
-from bot.functions.admin import read_json, write_json
+from bot.functions.sql_helper import execute_many
+from bot.functions.state_store import get_state
+from bot.functions.shared_state import publish_state
 from bot.functions.admin import direct_path_finder
+from bot.functions.scheduler import eastern_now, mini_reset_time, mini_game_date
+from bot.functions.precompute import date_watermark
+from bot.functions.daily_standings import refresh_imported
 from bot.connections.logging_config import get_logger, log_exception
 
 # Get logger for mini warning functions
 mini_warning_logger = get_logger('mini_warning')
 
+# The leader query only runs when the mini rows for the date have changed (see
+# mini_watermark.sql), or at least every MINI_LEADER_FULL_CHECK so leader changes
+# that don't add rows (a new nyt_id mapping in user_view) are still picked up.
+MINI_LEADER_FULL_CHECK = timedelta(minutes=30)
+
+# Leaders of the current mini (state store key), cleared when the mini resets
+MINI_LEADERS_KEY = 'config/global_mini_leaders.json'
+
+# Leader changes seen within MINI_LEADER_COALESCE of the first one are announced
+# together when the window closes, so a burst of solves gets one render and one
+# post per guild showing where it ended up.
+MINI_LEADER_COALESCE = timedelta(seconds=int(os.getenv('MINI_LEADER_COALESCE_SECONDS', 90)))
+
+_mini_watermark = None          # (game_date, counts/timestamps) seen by the last leader query
+_last_full_check = None
+_last_data_change = None        # when new mini rows last arrived
+_probe_stats = {'probes': 0, 'leader_queries': 0}
+_leader_time = None             # winning time of the stored leaders, if seen by this process
+_pending_change = None          # leader changes not announced yet, see record_leader_change
+
+def mini_poll_interval(now: datetime = None) -> int:
+    """
+    Seconds until the next mini leader check: every 20s in the hour before the mini
+    expires and for 10 minutes after new results land, every 5 minutes overnight
+    (1am-7am), every minute otherwise. Sooner if a leader announcement is due.
+    """
+    now = now or eastern_now()
+    if timedelta(0) < mini_reset_time(now.date()) - now <= timedelta(hours=1):
+        interval = 20
+    elif _last_data_change and now - _last_data_change < timedelta(minutes=10):
+        interval = 20
+    elif 1 <= now.hour < 7:
+        interval = 300
+    else:
+        interval = 60
+    if _pending_change:
+        # Wake up when the pending announcement is due
+        due_in = int((_pending_change['announce_at'] - now).total_seconds()) + 1
+        interval = min(interval, max(due_in, 1))
+    return interval
+
+def mini_probe_stats() -> dict:
+    """How many polls were answered by the watermark probe alone."""
+    return {**_probe_stats, 'skipped': _probe_stats['probes'] - _probe_stats['leader_queries']}
+
+async def _mini_data_changed(game_date) -> bool:
+    global _mini_watermark, _last_full_check, _last_data_change
+    watermark = (str(game_date), await date_watermark('mini_watermark.sql', game_date))
+    _probe_stats['probes'] += 1
+
+    now = eastern_now()
+    changed = watermark != _mini_watermark
+    if changed and _mini_watermark is not None and _mini_watermark[0] == watermark[0]:
+        _last_data_change = now
+    if not changed and _last_full_check and now - _last_full_check < MINI_LEADER_FULL_CHECK:
+        return False
+
+    _mini_watermark = watermark
+    _last_full_check = now
+    return True
+
 def get_current_mini_date():
     """
     Calculate the current mini date based on reset times:
@@ -18,38 +85,29 @@ def get_current_mini_date():
     If current time is after today's reset time, we're on tomorrow's mini.
     If current time is before today's reset time, we're still on today's mini.
     """
-    now = datetime.now()
-    
-    # Determine reset hour for today
-    # Saturday = 5, Sunday = 6, so weekday() >= 5 means weekend
-    mini_reset_hour = 18 if now.weekday() >= 5 else 22  # 6pm weekends, 10pm weekdays
-    
-    # If we've passed today's reset time, we're on tomorrow's mini
-    if now.hour >= mini_reset_hour:
-        mini_date = (now + timedelta(days=1)).date()
-    else:
-        # If we haven't reached today's reset time, we're still on today's mini
-        mini_date = now.date()
-    
-    return mini_date
+    return mini_game_date()
+
+# Discord rejects messages over 2000 characters, so long mention lists are split
+MESSAGE_LIMIT = 2000
 
 # find users who haven't completed the mini
-async def find_users_to_warn():
+async def find_users_to_warn(warning_date: str = None):
+    """
+    Users who haven't completed the mini and weren't already warned successfully on
+    warning_date (default: today), in one query (see mini_warning_targets.sql).
+    """
     try:
         mini_warning_logger.debug("Finding users to warn...")
-        result = await execute_query("SELECT * FROM matt.mini_not_completed")
-        df = pd.DataFrame(result)
+        warning_date = warning_date or eastern_now().strftime('%Y-%m-%d')
+        with open(direct_path_finder('files', 'queries', 'active', 'mini_warning_targets.sql'), 'r', encoding='utf-8') as file:
+            query = file.read()
+        result = await execute_query(query, {'warning_date': warning_date}, lane='background')
         
-        if df.empty:
-            mini_warning_logger.info("No users found to warn (all completed mini)")
+        if not result:
+            mini_warning_logger.info("No users found to warn (all completed mini or already warned)")
             return []
         
-        users_to_message = []
-        for index, row in df.iterrows():
-            users_to_message.append({
-                'name': row['player_name'],
-                'discord_id_nbr': row['discord_id_nbr']
-            })
+        users_to_message = [{'name': row['player_name'], 'discord_id_nbr': row['discord_id_nbr']} for row in result]
         
         mini_warning_logger.info(f"Found {len(users_to_message)} users to warn: {[u['name'] for u in users_to_message]}")
         return users_to_message
@@ -58,21 +116,40 @@ async def find_users_to_warn():
         log_exception(mini_warning_logger, e, "finding users to warn")
         return []
 
-async def track_warning_attempt(player_name: str, discord_id_nbr: int, success: bool, error_message: str = None, warning_type: str = 'daily_reminder'):
+def warning_messages(users: list, header: str, limit: int = MESSAGE_LIMIT) -> list:
     """
-    Track a warning attempt in the mini_warning_history table.
-    
+    Split a warning into messages of at most `limit` characters: the header, then
+    as many mentions as fit. Returns [(message text, users tagged in it)].
+    """
+    messages = []
+    text, tagged = header, []
+    for user in users:
+        mention = f"<@{user['discord_id_nbr']}>"
+        separator = "\n" if not tagged else " "
+        if tagged and len(text) + len(separator) + len(mention) > limit:
+            messages.append((text, tagged))
+            text, tagged, separator = header, [], "\n"
+        text += separator + mention
+        tagged.append(user)
+    if tagged:
+        messages.append((text, tagged))
+    return messages
+
+async def track_warning_attempts(attempts: list, warning_type: str = 'daily_reminder', warning_date: str = None):
+    """
+    Record warning attempts in mini_warning_history with one multi-row upsert.
+
     Args:
-        player_name: The player's display name
-        discord_id_nbr: The Discord user ID
-        success: Whether the warning was sent successfully
-        error_message: Error message if the warning failed
+        attempts: dicts with name, discord_id_nbr, success and (optionally) error_message
         warning_type: Type of warning (default: 'daily_reminder')
+        warning_date: Date the warnings count for (default: today)
     """
+    if not attempts:
+        return
     try:
-        warning_date = datetime.now().strftime('%Y-%m-%d')
+        warning_date = warning_date or eastern_now().strftime('%Y-%m-%d')
         
-        # Insert or update warning attempt
+        # Insert or update warning attempts (executemany sends them as a single INSERT)
         query = """
         INSERT INTO games.mini_warning_history 
         (warning_date, player_name, discord_id_nbr, warning_sent, success, error_message, warning_type)
@@ -84,69 +161,151 @@ async def track_warning_attempt(player_name: str, discord_id_nbr: int, success:
         error_message = VALUES(error_message)
         """
         
-        await execute_query(query, (
+        await execute_many(query, [(
             warning_date,
-            player_name,
-            discord_id_nbr,
+            attempt.get('name', 'Unknown'),
+            attempt['discord_id_nbr'],
             True,  # warning_sent = True (we attempted it)
-            success,
-            error_message,
+            attempt['success'],
+            attempt.get('error_message'),
             warning_type
-        ))
+        ) for attempt in attempts], lane='write')
         
-        mini_warning_logger.debug(f"Tracked warning attempt for {player_name} ({discord_id_nbr}): success={success}")
+        succeeded = sum(1 for attempt in attempts if attempt['success'])
+        mini_warning_logger.debug(f"Tracked {len(attempts)} warning attempt(s), {succeeded} successful")
         
     except Exception as e:
-        log_exception(mini_warning_logger, e, f"tracking warning attempt for {player_name}")
+        log_exception(mini_warning_logger, e, f"tracking {len(attempts)} warning attempt(s)")
+
+async def track_warning_attempt(player_name: str, discord_id_nbr: int, success: bool, error_message: str = None, warning_type: str = 'daily_reminder'):
+    """Track a single warning attempt in the mini_warning_history table (see track_warning_attempts)."""
+    await track_warning_attempts([{
+        'name': player_name,
+        'discord_id_nbr': discord_id_nbr,
+        'success': success,
+        'error_message': error_message,
+    }], warning_type=warning_type)
 
 # check mini leaders
 async def check_mini_leaders():
+    """
+    Query the current mini's leaders and store them if they changed. Returns the
+    change ({'game_date', 'old', 'old_time', 'new', 'new_time'}) or None.
+    """
+    global _mini_watermark, _leader_time
     try:
         # Get the current mini date (accounts for reset times)
         current_mini_date = get_current_mini_date()
+
+        # Nothing new for this mini since the last leader query: the leaders can't have changed
+        if not await _mini_data_changed(current_mini_date):
+            return None
+        _probe_stats['leader_queries'] += 1
+        # Importer rows only reach games.daily_standings through a refresh, so /mini and
+        # the leader announcement would otherwise lag until the next reconcile
+        await refresh_imported(current_mini_date, ('mini',))
         
         # get latest global leaders - now using proper mini date instead of max(game_date)
-        query = """
-            select 
-                player_name,
-                game_time
-            from matt.mini_view
-            where game_date = %s
-            and game_rank = 1
-            and guild_nm = 'Global'
-        """
+        # (filters are pushed into the base tables, see mini_leaders.sql)
+        with open(direct_path_finder('files', 'queries', 'active', 'mini_leaders.sql'), 'r', encoding='utf-8') as file:
+            query = file.read()
         
-        result = await execute_query(query, (current_mini_date,))
+        result = await execute_query(query, {'game_date': current_mini_date}, lane='background')
         
         # Convert result to DataFrame
         df = pd.DataFrame(result)
         
         # Check if we have any data
         if df.empty:
-            return False
+            return None
 
         # get current leaders (global list)
         new_leaders = sorted(df['player_name'].tolist())
 
         # get list of previous global leaders
-        leader_filepath = direct_path_finder('files', 'config', 'global_mini_leaders.json')
-        
-        previous_leaders = read_json(leader_filepath)
-        if previous_leaders is None:
-            previous_leaders = []
+        previous_leaders = get_state(MINI_LEADERS_KEY, [])
+
+        # Tied leaders share a time
+        new_time = str(df['game_time'].iloc[0])
+        old_time = _leader_time if previous_leaders else None
+        _leader_time = new_time
 
         # compare lists (order matters!)
         if sorted(new_leaders) != sorted(previous_leaders):
-            mini_warning_logger.info(f"LEADER CHANGE DETECTED! Old: {previous_leaders}, New: {new_leaders}")
+            mini_warning_logger.info(f"LEADER CHANGE DETECTED! Old: {previous_leaders}, New: {new_leaders} ({new_time})")
             
-            # Save the new leaders to file
-            write_json(leader_filepath, new_leaders)
-            mini_warning_logger.info(f"Updated global leaders file with: {new_leaders}")
+            # Save the new leaders
+            await publish_state(MINI_LEADERS_KEY, new_leaders)
+            mini_warning_logger.info(f"Updated global leaders with: {new_leaders}")
             
-            return True  # Signal that there's a new leader
+            return {'game_date': str(current_mini_date), 'old': list(previous_leaders), 'old_time': old_time,
+                    'new': new_leaders, 'new_time': new_time}
         else:
-            return False  # No change
+            return None  # No change
 
     except Exception as e:
+        _mini_watermark = None  # run the leader query again next time
         log_exception(mini_warning_logger, e, "checking mini leaders")
-        return False
+        return None
+
+def reset_leader_tracking():
+    """Forget what this process saw of the mini leaders (on becoming task leader, the last leader's state applies)."""
+    global _mini_watermark, _leader_time, _pending_change
+    _mini_watermark = None
+    _leader_time = None
+    _pending_change = None
+
+def record_leader_change(change: dict, now: datetime = None):
+    """Add a change from check_mini_leaders to the pending announcement, opening a window if none is open."""
+    global _pending_change
+    now = now or eastern_now()
+    if _pending_change is None or _pending_change['game_date'] != change['game_date']:
+        _pending_change = {**change, 'changes': 1, 'first_seen': now, 'last_seen': now,
+                           'announce_at': now + MINI_LEADER_COALESCE}
+    else:
+        _pending_change.update(new=change['new'], new_time=change['new_time'], last_seen=now,
+                               changes=_pending_change['changes'] + 1)
+
+def due_leader_announcement(now: datetime = None):
+    """
+    The merged leader change once its window has closed (see MINI_LEADER_COALESCE),
+    or None if there's nothing to announce yet.
+    """
+    global _pending_change
+    now = now or eastern_now()
+    if _pending_change is None or now < _pending_change['announce_at']:
+        return None
+    change, _pending_change = _pending_change, None
+    if change['game_date'] != str(get_current_mini_date()):
+        # The mini expired in the meantime; the daily summary posted the final results
+        mini_warning_logger.info(f"Dropping leader announcement for expired mini {change['game_date']}")
+        return None
+    if sorted(change['old']) == sorted(change['new']):
+        mini_warning_logger.info(f"Mini lead changed back to {change['new']} within the window, nothing to announce")
+        return None
+    return change
+
+def _game_seconds(game_time: str):
+    try:
+        minutes, seconds = str(game_time).split(':')
+        return int(minutes) * 60 + int(seconds)
+    except (TypeError, ValueError):
+        return None
+
+def leader_change_summary(change: dict) -> str:
+    """Announcement text for a (merged) leader change: who took the lead from whom, and by how much."""
+    new = ', '.join(f"**{name}**" for name in change['new'])
+    text = f"There's a new mini leader! {new} ({change['new_time']})"
+    if change['old']:
+        text += f" took the lead from {', '.join(change['old'])}"
+        if change['old_time']:
+            text += f" ({change['old_time']})"
+            old_seconds, new_seconds = _game_seconds(change['old_time']), _game_seconds(change['new_time'])
+            if old_seconds is not None and new_seconds is not None and old_seconds != new_seconds:
+                text += f", {abs(old_seconds - new_seconds)}s {'faster' if new_seconds < old_seconds else 'slower'}"
+    else:
+        text += " set the first time of the day"
+    if change['changes'] > 1:
+        span = int((change['last_seen'] - change['first_seen']).total_seconds())
+        text += f"\n-# {change['changes']} lead changes in {span}s"
+    return text
@@ -0,0 +1,204 @@
+import asyncio
+import json
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from bot.functions.admin import direct_path_finder
+from bot.functions.sql_helper import execute_query, get_backend
+from bot.connections.logging_config import get_logger, log_exception
+
+rollups_logger = get_logger('monthly_rollups')
+
+# games.monthly_rollups holds per (game, month, player) totals, so range leaderboards
+# add up whole months and only rank the partial months at the edges of the range.
+# A month is rebuilt whenever one of its days changes; games.monthly_rollup_months
+# records which months are built, and ranges fall back to ranking every day until
+# all of their whole months are.
+
+_month_locks = defaultdict(asyncio.Lock)
+_tables_checked = False
+_built = set()              # (game_name, month_start) pairs present in monthly_rollup_months
+_history_start = None       # first month with any scores; earlier months are empty
+_built_loaded = False
+_dirty = set()              # months changed since their rebuild started
+_pending = {}               # (game_name, month_start) -> background rebuild task
+
+def _scored_games() -> list:
+    with open(direct_path_finder('files', 'config', 'games.json'), 'r', encoding='utf-8') as file:
+        games_data = json.load(file)
+    return [info['game_name'] for info in games_data.values() if info.get('scoring_type')]
+
+# Games with a leaderboard (my_scores and winners aren't games)
+ROLLUP_GAMES = _scored_games()
+
+def _read_query(*path) -> str:
+    with open(direct_path_finder('files', 'queries', *path), 'r', encoding='utf-8') as file:
+        return file.read()
+
+def month_start(day) -> date:
+    day = date.fromisoformat(str(day)[:10])
+    return day.replace(day=1)
+
+def _next_month(day: date) -> date:
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+async def ensure_rollup_tables():
+    """Create the rollup tables if they don't exist yet."""
+    global _tables_checked
+    if _tables_checked or get_backend() is not None:  # the local schema already has them
+        return
+    for statement in _read_query('tables', 'games_monthly_rollups.sql').split(';'):
+        if 'CREATE' in statement:
+            await execute_query(statement, lane='write')
+    _tables_checked = True
+
+async def _load_built(lane: str = 'background'):
+    global _history_start, _built_loaded
+    await ensure_rollup_tables()
+    months = await execute_query("SELECT game_name, month_start FROM games.monthly_rollup_months", lane=lane)
+    _built.update((row['game_name'], month_start(row['month_start'])) for row in months)
+
+    first = await execute_query("""
+        SELECT min(first_date) AS first_date FROM (
+            SELECT min(game_date) AS first_date FROM games.game_history
+            UNION ALL
+            SELECT min(print_date) FROM games.nyt_history
+            UNION ALL
+            SELECT min(game_date) FROM matt.mini_history
+        ) x
+    """, lane=lane)
+    first_date = first[0]['first_date'] if first else None
+    _history_start = month_start(first_date) if first_date not in (None, '-') else month_start(date.today())
+    _built_loaded = True
+
+async def refresh_month(game_name: str, month, lane: str = 'write') -> None:
+    """Rebuild one (game_name, month) of games.monthly_rollups from the source tables."""
+    game_name = game_name.lower()
+    month = month_start(month)
+
+    async with _month_locks[(game_name, month)]:
+        await ensure_rollup_tables()
+        refreshed_ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+        params = {
+            'game_name': game_name,
+            'start_date': month,
+            'end_date': _next_month(month) - timedelta(days=1),
+            'refreshed_ts': refreshed_ts,
+        }
+        await execute_query(_read_query('active', 'refresh_monthly_rollup.sql'), params, lane=lane)
+
+        # Anything not touched by this refresh is no longer in the source tables
+        await execute_query("""
+            DELETE FROM games.monthly_rollups
+            WHERE game_name = %(game_name)s
+                AND month_start = %(start_date)s
+                AND refreshed_ts < %(refreshed_ts)s
+        """, params, lane=lane)
+        await _mark_built(game_name, month, refreshed_ts, lane)
+
+async def _mark_built(game_name: str, month: date, refreshed_ts: str, lane: str):
+    await execute_query("""
+        INSERT INTO games.monthly_rollup_months (game_name, month_start, refreshed_ts)
+        VALUES (%(game_name)s, %(month_start)s, %(refreshed_ts)s)
+        ON DUPLICATE KEY UPDATE refreshed_ts = VALUES(refreshed_ts)
+    """, {'game_name': game_name, 'month_start': month, 'refreshed_ts': refreshed_ts}, lane=lane)
+    _built.add((game_name, month))
+
+def schedule_refresh(game_name: str, game_date) -> None:
+    """
+    Rebuild the month a new score landed in, in the background.
+
+    Scores arriving while that month is being rebuilt share one more rebuild,
+    so a burst of posts doesn't queue a rebuild each.
+    """
+    key = (game_name.lower(), month_start(game_date))
+    _dirty.add(key)
+    if key not in _pending:
+        _pending[key] = asyncio.ensure_future(_refresh_dirty(key))
+
+async def _refresh_dirty(key):
+    try:
+        while key in _dirty:
+            _dirty.discard(key)
+            await refresh_month(*key, lane='background')
+    except Exception as e:
+        log_exception(rollups_logger, e, f"refreshing monthly rollup for {key[0]} {key[1]}")
+    finally:
+        _pending.pop(key, None)
+
+async def backfill_rollups(game_names=ROLLUP_GAMES, lane: str = 'background') -> int:
+    """
+    Build every month since the first score for each of game_names that isn't built yet.
+
+    Months a game has no scores in are only marked as built. Returns the number
+    of months rebuilt from the source tables.
+    """
+    if not _built_loaded:
+        await _load_built(lane)
+    played = await execute_query("""
+        SELECT DISTINCT lower(game_name) AS game_name, game_date FROM games.game_history
+        UNION
+        SELECT DISTINCT puzzle_type, print_date FROM games.nyt_history
+        UNION
+        SELECT DISTINCT 'mini', game_date FROM matt.mini_history
+    """, lane=lane)
+    played_months = {(row['game_name'], month_start(row['game_date'])) for row in played}
+
+    rebuilt = 0
+    current = month_start(date.today())
+    refreshed_ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+    for game_name in sorted({g.lower() for g in game_names}):
+        month = _history_start
+        while month <= current:
+            if (game_name, month) not in _built:
+                if (game_name, month) in played_months:
+                    await refresh_month(game_name, month, lane=lane)
+                    rebuilt += 1
+                else:
+                    await _mark_built(game_name, month, refreshed_ts, lane)
+            month = _next_month(month)
+
+    rollups_logger.info(f"Backfilled monthly rollups: {rebuilt} month(s) rebuilt for {len(game_names)} game(s)")
+    return rebuilt
+
+async def refresh_months(partitions, lane: str = 'background') -> int:
+    """Rebuild the months of the given (game_name, game_date) partitions, once per month."""
+    months = sorted({(str(game_name).lower(), month_start(game_date)) for game_name, game_date in partitions})
+    for game_name, month in months:
+        await refresh_month(game_name, month, lane=lane)
+    return len(months)
+
+def no_rollup_params(start_date, end_date) -> dict:
+    """An empty rollup window (start after end): every day is ranked from the source tables."""
+    start_date = date.fromisoformat(str(start_date)[:10])
+    end_date = date.fromisoformat(str(end_date)[:10])
+    return {'rollup_start': end_date + timedelta(days=1), 'rollup_end': start_date - timedelta(days=1)}
+
+async def rollup_params(game_name: str, start_date, end_date, lane: str = 'interactive') -> dict:
+    """
+    rollup_start/rollup_end for game_aggregate_stats.sql: the whole months inside
+    [start_date, end_date] when all of them are built, otherwise an empty window.
+    """
+    start_date = date.fromisoformat(str(start_date)[:10])
+    end_date = date.fromisoformat(str(end_date)[:10])
+    empty = no_rollup_params(start_date, end_date)
+
+    try:
+        if not _built_loaded:
+            await _load_built(lane)
+    except Exception as e:
+        log_exception(rollups_logger, e, "loading built monthly rollups")
+        return empty
+
+    first = month_start(start_date) if start_date.day == 1 else _next_month(start_date)
+    after_last = _next_month(end_date) if _next_month(end_date) - timedelta(days=1) == end_date else month_start(end_date)
+    if first >= after_last:
+        return empty
+
+    # Months before the first score or after this month have nothing to roll up
+    current = month_start(date.today())
+    month = first
+    while month < after_last:
+        if _history_start <= month <= current and (game_name.lower(), month) not in _built:
+            return empty
+        month = _next_month(month)
+    return {'rollup_start': first, 'rollup_end': after_last - timedelta(days=1)}
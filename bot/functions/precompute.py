@@ -0,0 +1,49 @@
+import os
+from datetime import timedelta
+from bot.functions.admin import direct_path_finder
+from bot.functions.sql_helper import execute_query
+from bot.connections.logging_config import get_logger, log_exception
+
+precompute_logger = get_logger('precompute')
+
+# Scheduled end-of-day posts build their content (queries, rendered leaderboards)
+# PRECOMPUTE_LEAD before their fire time, together with a watermark of the scores
+# for the date. At the fire time only the watermark is read again: the content is
+# rebuilt if scores arrived in between, otherwise it is posted as built.
+
+PRECOMPUTE_LEAD = timedelta(seconds=int(os.getenv('PRECOMPUTE_LEAD_SECONDS', 120)))
+
+async def date_watermark(query_file: str, game_date: str, lane: str = 'background') -> tuple:
+    """Row counts and latest timestamps from a watermark query (mini_watermark.sql, score_watermark.sql)."""
+    with open(direct_path_finder('files', 'queries', 'active', query_file), 'r', encoding='utf-8') as file:
+        query = file.read()
+    result = await execute_query(query, {'game_date': game_date}, lane=lane)
+    return tuple(str(v) for v in result[0].values()) if result else ()
+
+async def precompute(build, query_file: str, game_date: str):
+    """
+    Run build() ahead of time. Returns what prepared() needs at the fire time, or
+    None if it failed (the content is then built at the fire time instead).
+    """
+    try:
+        # Read before building, so scores landing during the build count as new
+        watermark = await date_watermark(query_file, game_date)
+        return {'value': await build(), 'watermark': watermark, 'query_file': query_file, 'game_date': game_date}
+    except Exception as e:
+        log_exception(precompute_logger, e, f"precomputing for {game_date}")
+        return None
+
+async def prepared(precomputed, build, description: str):
+    """The precomputed value if no scores arrived since it was built, otherwise build() again."""
+    if precomputed is None:
+        return await build()
+    try:
+        watermark = await date_watermark(precomputed['query_file'], precomputed['game_date'])
+    except Exception as e:
+        log_exception(precompute_logger, e, f"checking the watermark for {description}")
+        return await build()
+    if watermark == precomputed['watermark']:
+        precompute_logger.info(f"Using precomputed {description}")
+        return precomputed['value']
+    precompute_logger.info(f"New scores since {description} was precomputed, rebuilding")
+    return await build()
@@ -0,0 +1,222 @@
+import json
+import re
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+from bot.functions.admin import direct_path_finder
+from bot.functions.sql_helper import execute_query
+from bot.functions.daily_standings import IMPORTED_GAMES
+from bot.connections.logging_config import get_logger
+
+ranking_logger = get_logger('ranking_engine')
+
+# In-process daily boards, one per (game_name, game_date), holding what
+# games.daily_standings holds for recent dates. Scores the bot saves are applied
+# here as they arrive, so "today" leaderboards don't need a database round trip.
+# Seeded and periodically reloaded from games.daily_standings. Games fed by the
+# NYT importer (IMPORTED_GAMES) never pass through the bot, so they aren't held
+# here: their boards are read from the table, which is refreshed when their
+# watermark moves.
+
+_boards: Dict[tuple, Dict[str, dict]] = {}  # (game_name, game_date) -> {player_name: entry}
+_ranked: Dict[tuple, List[dict]] = {}       # ranked rows per board, rebuilt when a board changes
+_player_names: Dict[tuple, str] = {}        # (sys_name, sys_user) -> player_name, from games.xref_users
+_loaded_since: Optional[date] = None        # boards exist for every date from here on
+
+def _load_scoring_types() -> dict:
+    with open(direct_path_finder('files', 'config', 'games.json'), 'r', encoding='utf-8') as file:
+        games_data = json.load(file)
+    scoring_types = {}
+    for key, info in games_data.items():
+        if info.get('scoring_type'):
+            scoring_types[key.lower()] = info['scoring_type']
+            scoring_types[info['game_name'].lower()] = info['scoring_type']
+    return scoring_types
+
+SCORING_TYPES = _load_scoring_types()
+
+_TIME_PATTERN = re.compile(r'^[0-9]+:[0-5][0-9]$')
+_INT_PATTERN = re.compile(r'^-?[0-9]+$')
+
+def parse_score(game_score: str):
+    """(score_as_int, game_completed) for a raw score, same rules as games.daily_view."""
+    score = str(game_score)
+    completed = 0 if ('X' in score or '?' in score) else 1
+    if ':' in score and _TIME_PATTERN.match(score):
+        minutes, seconds = score.split(':')
+        return int(minutes) * 60 + int(seconds), completed
+    if '/' in score and _INT_PATTERN.match(score.split('/')[0]):
+        return int(score.split('/')[0]), completed
+    if score.startswith('+') and score[1:].isdigit():
+        return int(score[1:]), completed
+    if score[:1] in ('X', '?'):
+        return 0, completed
+    if _INT_PATTERN.match(score):
+        return int(score), completed
+    return None, completed
+
+def _to_datetime(value) -> Optional[datetime]:
+    if value is None or value == '-':
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.strptime(str(value)[:19], '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return None
+
+def _rank_board(game_name: str, entries: Dict[str, dict]) -> List[dict]:
+    """Rank a board the way daily_view does: rank() with ties, incomplete scores unranked."""
+    higher_is_better = SCORING_TYPES.get(game_name) == 'points'
+
+    def sort_key(entry):
+        score = entry['score_as_int']
+        # MySQL sorts NULL first ascending and last descending
+        if higher_is_better:
+            score_key = (score is None, -(score or 0))
+        else:
+            score_key = (score is not None, score or 0)
+        return (-entry['game_completed'], score_key)
+
+    ordered = sorted(entries.values(), key=sort_key)
+    rows, previous_key, previous_rank = [], None, 0
+    for i, entry in enumerate(ordered, start=1):
+        key = sort_key(entry)
+        rank = previous_rank if key == previous_key else i
+        previous_key, previous_rank = key, rank
+        game_rank = None if entry['game_completed'] == 0 else rank
+        rows.append({**entry, 'game_rank': game_rank})
+
+    # Board position: same order as daily_games.sql
+    rows.sort(key=lambda r: (r['game_rank'] if r['game_rank'] is not None else 9999, r['added_ts'] or datetime.min))
+    for pos, row in enumerate(rows, start=1):
+        row['pos'] = pos
+    return rows
+
+def _set_entry(game_name: str, game_date: str, entry: dict):
+    board = _boards.setdefault((game_name, game_date), {})
+    existing = board.get(entry['player_name'])
+    # Latest score per player wins, like the views' dedupe
+    if existing is None or (entry['added_ts'] or datetime.min) >= (existing['added_ts'] or datetime.min):
+        board[entry['player_name']] = entry
+        _ranked.pop((game_name, game_date), None)
+
+def apply_score(game_name: str, game_date, user_name: str, game_score: str,
+                game_detail: Optional[str] = None, added_ts=None, source_desc: str = 'discord'):
+    """Add a freshly saved score to its board."""
+    if _loaded_since is None:
+        return  # not seeded yet; the first reload will pick it up from the database
+    game_name, game_date = game_name.lower(), str(game_date)
+    if game_name in IMPORTED_GAMES:
+        return
+    score_as_int, completed = parse_score(game_score)
+    _set_entry(game_name, game_date, {
+        'player_name': _player_names.get((source_desc.lower(), user_name.lower()), user_name),
+        'game_score': game_score,
+        'score_as_int': score_as_int,
+        'game_completed': completed,
+        'game_detail': game_detail,
+        'added_ts': _to_datetime(added_ts),
+        'applied_at': time.monotonic(),
+    })
+
+def _ranked_rows(game_name: str, game_date: str) -> List[dict]:
+    key = (game_name, game_date)
+    if key not in _ranked:
+        _ranked[key] = _rank_board(game_name, _boards.get(key, {}))
+    return _ranked[key]
+
+def has_board(game_date) -> bool:
+    """True if boards for this date are held in memory (an absent game simply has no scores)."""
+    return _loaded_since is not None and date.fromisoformat(str(game_date)) >= _loaded_since
+
+def board_page(game_name: str, game_date, limit: int, offset: int = 0,
+               member_nm: Optional[str] = None) -> Optional[List[dict]]:
+    """
+    The rows daily_games.sql would return (one page plus member_nm's own row),
+    or None if the board isn't held in memory and the caller should query instead.
+    """
+    if not has_board(game_date) or game_name.lower() in IMPORTED_GAMES:
+        return None
+    rows = _ranked_rows(game_name.lower(), str(game_date))
+    pinned = {member_nm, _player_names.get(('discord', member_nm.lower()))} if member_nm else set()
+
+    selected = [r for r in rows if offset < r['pos'] <= offset + limit or r['player_name'] in pinned]
+    result = []
+    for r in selected:
+        added_ts = r['added_ts']
+        result.append({
+            'rnk': r['game_rank'] if r['game_rank'] is not None else '-',
+            'player': r['player_name'],
+            'score': r['game_score'],
+            'detail': r['game_detail'] if r['game_detail'] is not None else '-',
+            'added_at': f"{int(added_ts.strftime('%I'))}:{added_ts:%M}{added_ts:%p}" if added_ts else '-',
+            'pos': r['pos'],
+            'total_rows': len(rows),
+        })
+    return result
+
+def digest_rows(game_date, top_n: int) -> Optional[List[dict]]:
+    """
+    The rows daily_digest.sql would return for the games held in memory (not
+    IMPORTED_GAMES), or None if the date isn't held in memory.
+    """
+    if not has_board(game_date):
+        return None
+    game_date = str(game_date)
+    result = []
+    for game_name, board_date in sorted(_boards):
+        if board_date != game_date:
+            continue
+        for r in _ranked_rows(game_name, game_date):
+            if r['game_rank'] is not None and r['game_rank'] <= top_n:
+                result.append({'game_name': game_name, 'rnk': r['game_rank'],
+                               'player': r['player_name'], 'score': r['game_score']})
+    return result
+
+async def reload(days: int, lane: str = 'background') -> int:
+    """
+    Replace the boards for the last `days` days with games.daily_standings.
+
+    Scores applied while the reload was reading are kept, so nothing saved in
+    that window is lost. Returns the number of rows loaded.
+    """
+    global _loaded_since
+    started = time.monotonic()
+    since = date.today() - timedelta(days=days)
+
+    xref = await execute_query("SELECT sys_name, sys_user, player_name FROM games.xref_users", lane=lane)
+    rows = await execute_query("""
+        SELECT game_name, game_date, player_name, game_score, score_as_int, game_completed, game_detail, added_ts
+        FROM games.daily_standings
+        WHERE game_date >= %s
+    """, (since,), lane=lane)
+    rows = [r for r in rows if str(r['game_name']).lower() not in IMPORTED_GAMES]
+
+    _player_names.clear()
+    _player_names.update({(str(x['sys_name']).lower(), str(x['sys_user']).lower()): x['player_name'] for x in xref})
+
+    recent = {}
+    for key, board in _boards.items():
+        kept = {p: e for p, e in board.items() if e.get('applied_at', 0) >= started}
+        if kept and key[1] >= str(since):
+            recent[key] = kept
+
+    _boards.clear()
+    _ranked.clear()
+    for r in rows:
+        _set_entry(str(r['game_name']).lower(), str(r['game_date']), {
+            'player_name': r['player_name'],
+            'game_score': r['game_score'],
+            'score_as_int': r['score_as_int'] if r['score_as_int'] != '-' else None,
+            'game_completed': float(r['game_completed']) if r['game_completed'] != '-' else 0,
+            'game_detail': r['game_detail'] if r['game_detail'] != '-' else None,
+            'added_ts': _to_datetime(r['added_ts']),
+        })
+    for (game_name, game_date), board in recent.items():
+        for entry in board.values():
+            _set_entry(game_name, game_date, entry)
+
+    _loaded_since = since
+    ranking_logger.info(f"Loaded {len(rows)} standings row(s) into {len(_boards)} board(s) since {since}")
+    return len(rows)
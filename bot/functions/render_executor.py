@@ -0,0 +1,171 @@
+import asyncio
+import atexit
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import pandas as pd
+from bot.functions.df_to_image import (get_renderer, encode_image, _render_key, _cache_get, _cache_put, _resolve_path,
+                                       LEFT_ALIGNED_COLUMNS, RIGHT_ALIGNED_COLUMNS, FONT_PATH)
+from bot.connections.logging_config import get_logger
+
+render_logger = get_logger('render_executor')
+
+# PIL drawing is CPU bound and would otherwise run on the event loop, delaying gateway
+# heartbeats and other interactions. Renders go to a small executor instead.
+#
+# The service runs with CPUQuota=25% (a quarter of one core), so one worker already uses
+# the whole budget; more workers only contend with the event loop. Processes sidestep the
+# GIL but each one loads its own fonts and counts against MemoryMax, so threads are the default.
+RENDER_EXECUTOR = os.getenv('RENDER_EXECUTOR', 'thread')   # 'thread' or 'process'
+RENDER_WORKERS = int(os.getenv('RENDER_WORKERS', 1))
+# Renders allowed to wait for a worker; callers beyond that wait on the loop (not in the executor)
+RENDER_MAX_QUEUE = int(os.getenv('RENDER_MAX_QUEUE', 4))
+
+_executor = None
+_slots = None
+_inflight = {}
+_stats = {
+    'waiting': 0,       # callers waiting for a slot
+    'queued': 0,        # submitted to the executor, not finished yet
+    'completed': 0,
+    'failed': 0,
+    'render_ms_total': 0.0,
+    'render_ms_max': 0.0,
+    'wait_ms_total': 0.0,
+    'encode_ms_total': 0.0,
+    'bytes_total': 0,
+    'bytes_max': 0,
+    'coalesced': 0,     # callers that joined a render already in flight
+}
+
+def _render_job(df, img_title, img_subtitle, left_aligned_columns, right_aligned_columns, submitted_at):
+    """Runs in the worker. Returns (image bytes, seconds waited before starting, seconds rendering, seconds encoding)."""
+    started_at = time.time()
+    if isinstance(df, list):
+        # (section title, DataFrame) pairs drawn one under the other
+        img = get_renderer().draw_sections(img_title, img_subtitle, df, left_aligned_columns, right_aligned_columns)
+    else:
+        img = get_renderer().draw(df, img_title, img_subtitle, left_aligned_columns, right_aligned_columns)
+    encode_started_at = time.time()
+    data = encode_image(img)
+    finished_at = time.time()
+    return data, started_at - submitted_at, finished_at - started_at, finished_at - encode_started_at
+
+def _get_executor():
+    global _executor, _slots
+    if _executor is None:
+        if RENDER_EXECUTOR == 'process':
+            # spawn: forking a process that already has an event loop and DB threads isn't safe
+            _executor = ProcessPoolExecutor(max_workers=RENDER_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+        else:
+            _executor = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix='render')
+        _slots = asyncio.Semaphore(RENDER_WORKERS + RENDER_MAX_QUEUE)
+        render_logger.info(f"Render executor started: {RENDER_WORKERS} {RENDER_EXECUTOR} worker(s), "
+                           f"queue limit {RENDER_MAX_QUEUE}")
+    return _executor
+
+async def render_png(df, img_title, img_subtitle,
+                     left_aligned_columns=LEFT_ALIGNED_COLUMNS,
+                     right_aligned_columns=RIGHT_ALIGNED_COLUMNS) -> bytes:
+    """
+    Awaitable render: cache hits return immediately, misses are drawn on the render executor.
+
+    df may also be a list of (section title, DataFrame) pairs, drawn as one image.
+    """
+    if isinstance(df, list):
+        key_df = pd.concat([section_df.assign(_section=section) for section, section_df in df], ignore_index=True)
+        cache_key = _render_key(key_df, 'sections', img_title, img_subtitle, left_aligned_columns,
+                                right_aligned_columns, FONT_PATH)
+    else:
+        cache_key = _render_key(df, img_title, img_subtitle, left_aligned_columns, right_aligned_columns, FONT_PATH)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    # The same image already being drawn for someone else: wait for that one
+    inflight = _inflight.get(cache_key)
+    if inflight is not None:
+        _stats['coalesced'] += 1
+        return await asyncio.shield(inflight)
+
+    task = asyncio.ensure_future(_render_on_executor(cache_key, df, img_title, img_subtitle,
+                                                     left_aligned_columns, right_aligned_columns))
+    _inflight[cache_key] = task
+    task.add_done_callback(lambda _: _inflight.pop(cache_key, None))
+    return await asyncio.shield(task)
+
+async def _render_on_executor(cache_key, df, img_title, img_subtitle, left_aligned_columns, right_aligned_columns) -> bytes:
+    executor = _get_executor()
+    _stats['waiting'] += 1
+    try:
+        await _slots.acquire()
+    finally:
+        _stats['waiting'] -= 1
+
+    _stats['queued'] += 1
+    try:
+        future = asyncio.get_running_loop().run_in_executor(
+            executor, _render_job, df, img_title, img_subtitle,
+            left_aligned_columns, right_aligned_columns, time.time())
+        try:
+            data, waited, rendered, encoded = await future
+        except Exception:
+            _stats['failed'] += 1
+            raise
+        finally:
+            _stats['queued'] -= 1
+    finally:
+        _slots.release()
+
+    _stats['completed'] += 1
+    _stats['render_ms_total'] += rendered * 1000
+    _stats['render_ms_max'] = max(_stats['render_ms_max'], rendered * 1000)
+    _stats['wait_ms_total'] += waited * 1000
+    _stats['encode_ms_total'] += encoded * 1000
+    _stats['bytes_total'] += len(data)
+    _stats['bytes_max'] = max(_stats['bytes_max'], len(data))
+    _cache_put(cache_key, data)
+    return data
+
+async def render_buffer(df, img_title="Today's Mini", img_subtitle="Leaderboard",
+                        left_aligned_columns=LEFT_ALIGNED_COLUMNS,
+                        right_aligned_columns=RIGHT_ALIGNED_COLUMNS,
+                        debug_filepath=None) -> io.BytesIO:
+    """Awaitable df_to_buffer: returns a fresh BytesIO per call, optionally also written to debug_filepath."""
+    data = await render_png(df, img_title, img_subtitle, left_aligned_columns, right_aligned_columns)
+    if debug_filepath:
+        with open(_resolve_path(debug_filepath), 'wb') as file:
+            file.write(data)
+    return io.BytesIO(data)
+
+def render_executor_stats() -> dict:
+    """Queue depth, render/encode timings and encoded sizes for the render executor."""
+    completed = _stats['completed']
+    return {
+        'mode': RENDER_EXECUTOR,
+        'workers': RENDER_WORKERS,
+        # Not started yet, whether waiting for a slot or sitting in the executor
+        'queue_depth': _stats['waiting'] + max(_stats['queued'] - RENDER_WORKERS, 0),
+        'in_flight': _stats['queued'],
+        'completed': completed,
+        'failed': _stats['failed'],
+        'coalesced': _stats['coalesced'],
+        'render_ms_avg': round(_stats['render_ms_total'] / completed, 1) if completed else 0.0,
+        'render_ms_max': round(_stats['render_ms_max'], 1),
+        'wait_ms_avg': round(_stats['wait_ms_total'] / completed, 1) if completed else 0.0,
+        # Included in render_ms
+        'encode_ms_avg': round(_stats['encode_ms_total'] / completed, 1) if completed else 0.0,
+        'bytes_avg': round(_stats['bytes_total'] / completed) if completed else 0,
+        'bytes_max': _stats['bytes_max'],
+    }
+
+def shutdown_render_executor():
+    global _executor, _slots
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        _slots = None
+
+atexit.register(shutdown_render_executor)
@@ -8,6 +8,9 @@ from bot.functions import send_df_to_sql, execute_query
 from typing import Tuple
 from bot.functions.admin import direct_path_finder
 from bot.functions.save_messages import is_game_score
+from bot.functions.score_spool import send_or_spool
+from bot.functions.daily_standings import update_after_insert
+from bot.functions import ranking_engine
 
 async def process_game_score(message, game_name=None, game_info=None):
     """Process and save a game score if the message contains one."""
@@ -58,8 +61,13 @@ async def process_game_score(message, game_name=None, game_info=None):
     # Create DataFrame with specified column order
     df = pd.DataFrame([ordered_game_score])
 
+    # Spools locally instead of losing the score if the database is down
     try:
-        await send_df_to_sql(df, 'games.game_history', if_exists='append')
+        if await send_or_spool(df, 'games.game_history'):
+            # Re-rank today's standings for this game (spooled rows are handled on replay)
+            await update_after_insert(game_name, ordered_game_score['game_date'])
+            ranking_engine.apply_score(**{k: ordered_game_score[k] for k in
+                                          ('game_name', 'game_date', 'user_name', 'game_score', 'game_detail', 'added_ts')})
     except Exception as e:
         print(f"save_scores.py: error sending score to sql: {e}")
 
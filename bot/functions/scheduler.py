@@ -0,0 +1,94 @@
+import asyncio
+from datetime import datetime, time, timedelta
+import pytz
+from bot.functions.state_store import get_state
+from bot.functions.shared_state import publish_state
+from bot.connections.logging_config import get_logger
+
+scheduler_logger = get_logger('scheduler')
+
+# Daily posts fire at fixed US/Eastern wall-clock times. Each scheduled task sleeps
+# until its next fire time instead of waking up to check the clock. The last fire
+# time of each job is persisted (and shared with the next task leader, see
+# shared_state.py), so a restart or failover neither repeats a post that already
+# went out nor skips one that was due less than MISSED_GRACE ago.
+
+SCHEDULE_TZ = pytz.timezone('US/Eastern')
+MISSED_GRACE = timedelta(minutes=10)
+STATE_KEY = 'config/scheduler_state.json'
+
+# The mini expires (and the next one opens) at 6pm on weekends, 10pm on weekdays
+MINI_RESET = {'weekday': time(22, 0), 'weekend': time(18, 0)}
+
+# job name -> fire time per day type
+SCHEDULE = {
+    'reset_mini_leaders': MINI_RESET,
+    'daily_mini_summary': MINI_RESET,
+    'daily_winners_summary': {'weekday': time(23, 0), 'weekend': time(23, 0)},
+}
+
+def eastern_now() -> datetime:
+    """The current US/Eastern wall-clock time, as a naive datetime."""
+    return datetime.now(SCHEDULE_TZ).replace(tzinfo=None)
+
+def _on_day(times: dict, day) -> datetime:
+    return datetime.combine(day, times['weekend'] if day.weekday() >= 5 else times['weekday'])
+
+def mini_reset_time(day) -> datetime:
+    """When the mini dated `day` expires."""
+    return _on_day(MINI_RESET, day)
+
+def mini_game_date(now: datetime = None):
+    """The date of the mini being played at `now`: tomorrow's once today's has expired."""
+    now = now or eastern_now()
+    if now >= mini_reset_time(now.date()):
+        return (now + timedelta(days=1)).date()
+    return now.date()
+
+def in_mini_reset_window(now: datetime = None, minutes: int = 10) -> bool:
+    """True for the first `minutes` after the mini expires, while the reset posts go out."""
+    now = now or eastern_now()
+    reset_at = mini_reset_time(now.date())
+    return reset_at <= now < reset_at + timedelta(minutes=minutes)
+
+def last_fired(job: str):
+    """When `job` last fired (naive US/Eastern), or None. Read from the state store each time."""
+    fired = get_state(STATE_KEY, {}).get(job)
+    return datetime.fromisoformat(fired) if fired else None
+
+def next_fire_time(job: str, now: datetime = None) -> datetime:
+    """
+    The next time `job` should run: today's slot if it's still ahead, or was missed
+    by less than MISSED_GRACE and hasn't fired, otherwise the next day's slot.
+    """
+    now = now or eastern_now()
+    fired = last_fired(job)
+    today = _on_day(SCHEDULE[job], now.date())
+    if today > now or (now - today < MISSED_GRACE and (fired is None or fired < today)):
+        return today
+    return _on_day(SCHEDULE[job], now.date() + timedelta(days=1))
+
+async def mark_fired(job: str, fire_at: datetime):
+    await publish_state(STATE_KEY, {**get_state(STATE_KEY, {}), job: fire_at.isoformat()})
+
+async def sleep_until(moment: datetime):
+    """Sleep until a naive US/Eastern time (returns at once if it has passed)."""
+    while True:
+        # The wall clock can move under a long sleep (NTP, DST), so check again on waking
+        remaining = SCHEDULE_TZ.localize(moment) - datetime.now(SCHEDULE_TZ)
+        if remaining.total_seconds() <= 0:
+            return
+        await asyncio.sleep(remaining.total_seconds())
+
+async def wait_for_next_run(job: str) -> datetime:
+    """
+    Sleep until `job` is due, record it as fired and return its scheduled fire time.
+
+    It's recorded before the job body runs, so a restart part way through a post
+    doesn't send it again.
+    """
+    fire_at = next_fire_time(job)
+    scheduler_logger.info(f"{job} next fires at {fire_at} US/Eastern")
+    await sleep_until(fire_at)
+    await mark_fired(job, fire_at)
+    return fire_at
@@ -0,0 +1,260 @@
+import asyncio
+import json
+import os
+import sqlite3
+from datetime import date, datetime
+import pandas as pd
+from bot.functions.admin import direct_path_finder
+from bot.functions.sql_helper import send_df_to_sql, execute_query, db_breaker, is_transient_error, is_rejected_row_error
+from bot.functions.daily_standings import update_after_insert
+from bot.functions import ranking_engine
+from bot.connections.logging_config import get_logger, log_exception
+
+spool_logger = get_logger('score_spool')
+
+# Columns that identify a row already written to the table, so a replay that
+# crashed half way through never inserts the same score twice
+SPOOL_KEYS = {
+    'games.game_history': ['added_ts', 'user_name', 'game_name', 'game_date'],
+}
+
+SPOOL_PATH = direct_path_finder('files', 'spool', 'score_spool.db')
+
+_replay_lock = asyncio.Lock()
+_pending = None     # rows in the spool; read from disk once, then kept up to date here
+_replay_task = None # replay started by send_or_spool, referenced so it isn't garbage collected
+
+def _connect():
+    """Open the spool database, creating it on first use."""
+    os.makedirs(os.path.dirname(SPOOL_PATH), exist_ok=True)
+    conn = sqlite3.connect(SPOOL_PATH)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=FULL")  # fsync on every commit
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS spool (
+            spool_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_json TEXT NOT NULL,
+            spooled_ts TEXT NOT NULL
+        )
+    """)
+    # Rows the table rejected (constraint or data errors), kept for a look instead of retried forever
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS spool_failed (
+            spool_id INTEGER PRIMARY KEY,
+            table_name TEXT NOT NULL,
+            row_json TEXT NOT NULL,
+            spooled_ts TEXT NOT NULL,
+            failed_ts TEXT NOT NULL,
+            error TEXT NOT NULL
+        )
+    """)
+    return conn
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat(sep=' ') if isinstance(value, datetime) else value.isoformat()
+    return str(value)
+
+def spool_rows(df: pd.DataFrame, table_name: str) -> int:
+    """Durably append DataFrame rows to the local spool. Returns the number of rows spooled."""
+    global _pending
+    rows = df.astype(object).where(pd.notnull(df), None).to_dict(orient='records')
+    pending_count()
+    spooled_ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    conn = _connect()
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT INTO spool (table_name, row_json, spooled_ts) VALUES (?, ?, ?)",
+                [(table_name, json.dumps(row, default=_json_default), spooled_ts) for row in rows]
+            )
+    finally:
+        conn.close()
+    _pending += len(rows)
+    spool_logger.warning(f"Spooled {len(rows)} row(s) for {table_name} while the database is unavailable")
+    return len(rows)
+
+def pending_count() -> int:
+    """Number of rows waiting to be replayed (only the first call reads the spool file)."""
+    global _pending
+    if _pending is None:
+        if not os.path.exists(SPOOL_PATH):
+            _pending = 0
+        else:
+            conn = _connect()
+            try:
+                _pending = conn.execute("SELECT COUNT(*) FROM spool").fetchone()[0]
+            finally:
+                conn.close()
+    return _pending
+
+def _dead_letter(conn, spool_id: int, table_name: str, row: dict, error: Exception):
+    """Move a row the table rejected out of the spool."""
+    global _pending
+    failed_ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with conn:
+        conn.execute("""
+            INSERT OR REPLACE INTO spool_failed (spool_id, table_name, row_json, spooled_ts, failed_ts, error)
+            SELECT spool_id, table_name, row_json, spooled_ts, ?, ? FROM spool WHERE spool_id = ?
+        """, (failed_ts, f"{type(error).__name__}: {error}"[:500], spool_id))
+        conn.execute("DELETE FROM spool WHERE spool_id = ?", (spool_id,))
+    _pending -= 1
+    spool_logger.error(f"Moved spooled row {spool_id} for {table_name} to spool_failed: {error} ({row})")
+
+def failed_count() -> int:
+    """Number of rows moved to spool_failed."""
+    if not os.path.exists(SPOOL_PATH):
+        return 0
+    conn = _connect()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM spool_failed").fetchone()[0]
+    finally:
+        conn.close()
+
+async def send_or_spool(df: pd.DataFrame, table_name: str) -> bool:
+    """
+    Write rows to the database, or spool them locally if the database is down.
+
+    Returns True if the rows reached the database, False if they were spooled.
+    Rows are also spooled while older spooled rows are still waiting, so the
+    table always receives them in the order they arrived.
+    """
+    if df.empty:
+        return True
+
+    global _replay_task
+    if pending_count() == 0 and db_breaker.state != 'open':
+        try:
+            await send_df_to_sql(df, table_name, if_exists='append')
+            return True
+        except Exception as e:
+            if not is_transient_error(e):
+                raise
+
+    spool_rows(df, table_name)
+    if db_breaker.state != 'open' and (_replay_task is None or _replay_task.done()):
+        _replay_task = asyncio.create_task(replay_spool())
+    return False
+
+async def _already_written(table_name: str, rows: list) -> set:
+    """Return the key tuples of spooled rows that are already in the table."""
+    key_cols = SPOOL_KEYS.get(table_name)
+    if not key_cols or not rows:
+        return set()
+
+    row_placeholder = '(' + ', '.join(['%s'] * len(key_cols)) + ')'
+    query = f"""
+        SELECT {', '.join(key_cols)}
+        FROM {table_name}
+        WHERE ({', '.join(key_cols)}) IN ({', '.join([row_placeholder] * len(rows))})
+    """
+    params = tuple(str(row[col]) for row in rows for col in key_cols)
+    existing = await execute_query(query, params, lane='write')
+    return {tuple(str(r[col]) for col in key_cols) for r in existing}
+
+async def _insert_spooled(conn, table_name: str, new: list):
+    """
+    Insert (spool_id, row) pairs. If the table rejects the batch, insert the rows one
+    at a time and move the ones it rejects to spool_failed. Returns (written pairs,
+    stalled); stalled means a transient error stopped it and the rest should wait.
+    """
+    if not new:
+        return [], False
+    try:
+        await send_df_to_sql(pd.DataFrame([r for _, r in new]), table_name, if_exists='append')
+        return new, False
+    except Exception as e:
+        if is_transient_error(e):
+            spool_logger.warning(f"Database unavailable ({type(e).__name__}: {e}), {pending_count()} row(s) left in spool")
+            return [], True
+        if not is_rejected_row_error(e):
+            raise
+        spool_logger.warning(f"Batch for {table_name} rejected ({e}), replaying its rows one at a time")
+
+    written = []
+    for spool_id, row in new:
+        try:
+            await send_df_to_sql(pd.DataFrame([row]), table_name, if_exists='append')
+        except Exception as e:
+            if not is_rejected_row_error(e):
+                spool_logger.warning(f"Stopped replaying {table_name} at spooled row {spool_id} ({type(e).__name__}: {e})")
+                return written, True
+            _dead_letter(conn, spool_id, table_name, row, e)
+        else:
+            written.append((spool_id, row))
+    return written, False
+
+async def replay_spool(batch_size: int = 50) -> int:
+    """
+    Replay spooled rows to the database in batches, oldest first.
+
+    Each batch skips rows that are already present (by SPOOL_KEYS) before
+    inserting, and is only removed from the spool after the insert succeeds,
+    so a replay interrupted at any point can simply be run again. If the table
+    rejects a batch, its rows are inserted one at a time and the ones it rejects
+    (constraint or data errors) are moved to spool_failed, so one bad row doesn't
+    hold up the rest. Transient errors leave the rows for the next replay.
+    Returns the number of rows removed from the spool.
+    """
+    if _replay_lock.locked():
+        return 0
+
+    async with _replay_lock:
+        global _pending
+        pending_before = pending_count()
+        conn = _connect()
+        try:
+            while db_breaker.state != 'open':
+                batch = conn.execute(
+                    "SELECT spool_id, table_name, row_json FROM spool ORDER BY spool_id LIMIT ?",
+                    (batch_size,)
+                ).fetchall()
+                if not batch:
+                    break
+
+                # Keep order across tables: only take the leading run of rows for one table
+                table_name = batch[0][1]
+                for i, (_, row_table, _) in enumerate(batch):
+                    if row_table != table_name:
+                        batch = batch[:i]
+                        break
+                rows = [json.loads(b[2]) for b in batch]
+
+                try:
+                    existing = await _already_written(table_name, rows)
+                except Exception as e:
+                    # Can't tell which rows are new; keep the batch for the next replay
+                    spool_logger.warning(f"Couldn't check spooled rows against {table_name} ({type(e).__name__}: {e}), "
+                                         f"{pending_count()} row(s) left in spool")
+                    break
+                key_cols = SPOOL_KEYS.get(table_name, [])
+                new = [(b[0], r) for b, r in zip(batch, rows)
+                       if not key_cols or tuple(str(r[c]) for c in key_cols) not in existing]
+                written, stalled = await _insert_spooled(conn, table_name, new)
+
+                # Already present and written rows leave the spool (rejected ones already have);
+                # after a stall the rows not reached stay
+                waiting = {spool_id for spool_id, _ in new} - {spool_id for spool_id, _ in written} if stalled else set()
+                with conn:
+                    removed = sum(conn.execute("DELETE FROM spool WHERE spool_id = ?", (b[0],)).rowcount
+                                  for b in batch if b[0] not in waiting)
+                _pending -= removed
+                new_rows = [r for _, r in written]
+
+                if table_name == 'games.game_history':
+                    for r in new_rows:
+                        ranking_engine.apply_score(r['game_name'], r['game_date'], r['user_name'], r['game_score'],
+                                                   r.get('game_detail'), r.get('added_ts'), r.get('source_desc') or 'discord')
+                    for game_name, game_date in sorted({(r['game_name'], r['game_date']) for r in new_rows}):
+                        await update_after_insert(game_name, game_date)
+                spool_logger.info(f"Replayed {len(new_rows)} spooled row(s) into {table_name} "
+                                  f"({len(batch) - len(new)} already present)")
+                if stalled:
+                    break
+        except Exception as e:
+            log_exception(spool_logger, e, "replaying score spool")
+        finally:
+            conn.close()
+
+        return pending_before - _pending
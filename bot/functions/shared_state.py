@@ -0,0 +1,62 @@
+import json
+from datetime import datetime
+from bot.functions.admin import direct_path_finder
+from bot.functions.sql_helper import execute_query, get_backend
+from bot.functions.state_store import set_state
+from bot.connections.logging_config import get_logger, log_exception
+
+shared_state_logger = get_logger('shared_state')
+
+# Values a new task leader must pick up from the last one (which scheduled posts went
+# out, who leads the mini), or it would post them again from its own stale copy. The
+# leader writes them to games.bot_task_state in MySQL, next to the leadership lock,
+# as well as to its local state store; a process loads them into its store when it
+# is elected. With the local SQLite backend there's one process and nothing to share.
+
+_table_checked = False
+
+async def _ensure_table():
+    global _table_checked
+    if _table_checked:
+        return
+    with open(direct_path_finder('files', 'queries', 'tables', 'games_bot_task_state.sql'), 'r', encoding='utf-8') as file:
+        await execute_query(file.read(), lane='write')
+    _table_checked = True
+
+async def publish_state(key: str, value) -> bool:
+    """
+    Store a value locally and, for the next leader, in games.bot_task_state. A
+    failed database write is logged, not raised: the local copy still stops this
+    process repeating itself. Returns False if the database write failed.
+    """
+    set_state(key, value)
+    if get_backend() is not None:
+        return True
+    try:
+        await _ensure_table()
+        await execute_query("""
+        INSERT INTO games.bot_task_state (state_key, value_json, updated_ts)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE value_json = VALUES(value_json), updated_ts = VALUES(updated_ts)
+        """, (key, json.dumps(value, ensure_ascii=False), datetime.now().strftime("%Y-%m-%d %H:%M:%S")), lane='write')
+        return True
+    except Exception as e:
+        log_exception(shared_state_logger, e, f"publishing shared state {key}")
+        return False
+
+async def load_shared_state(keys) -> int:
+    """Replace the local copies of keys with what the last leader published. Returns how many were found."""
+    if get_backend() is not None:
+        return 0
+    await _ensure_table()
+    keys = list(keys)
+    placeholders = ', '.join(['%s'] * len(keys))
+    rows = await execute_query(f"SELECT state_key, value_json FROM games.bot_task_state WHERE state_key IN ({placeholders})",
+                               tuple(keys), lane='write')
+    for row in rows:
+        try:
+            set_state(row['state_key'], json.loads(row['value_json']))
+        except (TypeError, ValueError) as e:
+            log_exception(shared_state_logger, e, f"loading shared state {row['state_key']}")
+    shared_state_logger.info(f"Loaded {len(rows)} of {len(keys)} shared state value(s) from the last task leader")
+    return len(rows)
@@ -5,23 +5,149 @@ import os
 from dotenv import load_dotenv
 import traceback
 from typing import List, Dict, Any, Optional
+from collections import defaultdict
+from contextlib import asynccontextmanager, nullcontext
 import weakref
 import atexit
 import signal
+import time
+import sqlite3
 
-lock = asyncio.Lock()
+# Connection pools are split into lanes so slow background reads can't starve
+# interactive commands or score inserts. Each lane gets its own size, acquire
+# timeout and keepalive (idle seconds before a connection is pinged on checkout).
+POOL_LANES = {
+    'interactive': {'minsize': 1, 'maxsize': 6, 'acquire_timeout': 5, 'keepalive': 300},   # slash commands
+    'background': {'minsize': 1, 'maxsize': 2, 'acquire_timeout': 30, 'keepalive': 300},   # tasks, backfill
+    'write': {'minsize': 1, 'maxsize': 3, 'acquire_timeout': 10, 'keepalive': 300},        # score inserts
+}
+DEFAULT_LANE = 'interactive'
+
+# One pool per lane
 _pools = {}
 
-# Global connection pool
-_pool = None
+# Writes that must not interleave (e.g. DELETE + INSERT replace) are serialized per table
+_table_locks = defaultdict(asyncio.Lock)
+
 _pool_refs = weakref.WeakSet()  # Track pool references for cleanup
 
+# Optional non-MySQL backend (e.g. the local SQLite stand-in); None means use the MySQL pools
+_backend = None
+_backend_resolved = False
+
+def set_backend(backend):
+    """
+    Route execute_query and send_df_to_sql through `backend` instead of MySQL.
+
+    A backend provides async execute_query(query, params) and
+    send_df_to_sql(df, table_name, if_exists, unique_key). Pass None to go back to MySQL.
+    """
+    global _backend, _backend_resolved
+    _backend = backend
+    _backend_resolved = True
+
+def get_backend():
+    """Return the active non-MySQL backend, creating it from SQL_BACKEND=sqlite on first use."""
+    global _backend, _backend_resolved
+    if not _backend_resolved:
+        load_dotenv()
+        if os.getenv('SQL_BACKEND', 'mysql').lower() == 'sqlite':
+            from bot.functions.local_db import LocalBackend
+            _backend = LocalBackend(os.getenv('SQL_LOCAL_PATH', ':memory:'))
+            print(f"Using local SQLite backend ({_backend.path})")
+        _backend_resolved = True
+    return _backend
+
+class DatabaseUnavailableError(ConnectionError):
+    """Raised without touching the network while the circuit breaker is open."""
+
+class CircuitBreaker:
+    """
+    Fails fast once the database is known to be down.
+
+    After `failure_threshold` consecutive connection failures the breaker opens
+    and callers get DatabaseUnavailableError immediately. Once `reset_timeout`
+    seconds have passed a single probe request is let through; success closes
+    the breaker, failure re-opens it for another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == 'half_open':
+            # Let this caller probe; everyone else keeps failing fast until it reports back
+            self.opened_at = time.monotonic()
+            return True
+        return state == 'closed'
+
+    def record_success(self):
+        if self.opened_at is not None:
+            print("[SQL] Database reachable again, closing circuit breaker")
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                print(f"[SQL] {self.failures} consecutive connection failures, opening circuit breaker")
+            self.opened_at = time.monotonic()
+
+db_breaker = CircuitBreaker()
+
+def is_connection_error(e: Exception) -> bool:
+    """True when an exception means the database couldn't be reached (as opposed to a bad query)."""
+    if isinstance(e, DatabaseUnavailableError):
+        return True
+    error_code = e.args[0] if getattr(e, 'args', None) else None
+    connection_errors = [
+        2003,  # Can't connect to MySQL server
+        2006,  # MySQL server has gone away
+        2013,  # Lost connection to MySQL server during query
+        2055,  # Lost connection to MySQL server at 'reading initial communication packet'
+    ]
+    return (
+        error_code in connection_errors or
+        isinstance(e, ConnectionRefusedError) or
+        "Lost connection" in str(e) or
+        "MySQL server has gone away" in str(e) or
+        "Connection reset by peer" in str(e)
+    )
+
+def is_transient_error(e: Exception) -> bool:
+    """
+    True when retrying later may succeed: the database is unreachable, the pool
+    had no free connection in time, or the server reported an operational problem.
+    """
+    return (
+        is_connection_error(e) or
+        isinstance(e, (TimeoutError, asyncio.TimeoutError, aiomysql.OperationalError, aiomysql.InterfaceError))
+    )
+
+def is_rejected_row_error(e: Exception) -> bool:
+    """True when the table refused the data itself (constraint or value errors), so a retry would fail the same way."""
+    return isinstance(e, (aiomysql.IntegrityError, aiomysql.DataError,
+                          sqlite3.IntegrityError, sqlite3.DataError))  # the last two from the local backend
+
 # Register cleanup function to run at exit
 def _cleanup_on_exit():
     """Cleanup function called at program exit"""
     import asyncio
     try:
-        if _pool is not None:
+        if _pools:
             # Create a new event loop if none exists
             try:
                 loop = asyncio.get_event_loop()
@@ -59,16 +185,16 @@ signal.signal(signal.SIGINT, _signal_handler)
 signal.signal(signal.SIGTERM, _signal_handler)
 
 async def _force_close_pool():
-    """Force close the connection pool"""
-    global _pool
-    if _pool is not None:
+    """Force close every lane's connection pool"""
+    for lane in list(_pools):
+        pool = _pools.pop(lane, None)
+        if pool is None:
+            continue
         try:
-            _pool.close()
-            await _pool.wait_closed()
+            pool.close()
+            await pool.wait_closed()
         except Exception:
             pass  # Ignore errors during forced cleanup
-        finally:
-            _pool = None
 
 # get sql config
 async def get_db_config():
@@ -100,30 +226,79 @@ async def get_db_config():
         'autocommit': True,                # Enable autocommit
         'pool_recycle': 3600,              # Recycle connections after 1 hour
         'echo': False,                     # Disable SQL query logging
-        'minsize': 1,                      # Minimum pool size
-        'maxsize': 10,                     # Maximum pool size
         'init_command': "SET collation_connection = 'utf8mb4_0900_ai_ci'"  # Set connection collation to match database
     }
 
     return db_config
 
-async def get_pool():
-    """Get or create the connection pool."""
-    global _pool
-    if _pool is None:
+async def get_pool(lane: str = DEFAULT_LANE):
+    """Get or create the connection pool for a lane ('interactive', 'background' or 'write')."""
+    if lane not in POOL_LANES:
+        raise ValueError(f"Unknown pool lane '{lane}'")
+    if lane not in _pools:
         db_config = await get_db_config()
-        _pool = await aiomysql.create_pool(**db_config)
-        print(f"Connected to {db_config['host']}/{db_config['db']}")
-    return _pool
+        settings = POOL_LANES[lane]
+        _pools[lane] = await aiomysql.create_pool(
+            **db_config,
+            minsize=settings['minsize'],
+            maxsize=settings['maxsize'],
+        )
+        print(f"Connected to {db_config['host']}/{db_config['db']} ({lane} pool, max {settings['maxsize']})")
+    return _pools[lane]
+
+async def warm_pools():
+    """Create every lane's pool up front so the first query doesn't pay for the connect."""
+    if get_backend() is not None:
+        return
+    for lane in POOL_LANES:
+        await get_pool(lane)
+
+async def _reset_pool(lane: str):
+    """Close a lane's pool so the next acquire builds fresh connections."""
+    pool = _pools.pop(lane, None)
+    if pool is not None:
+        pool.close()
+        await pool.wait_closed()
+
+@asynccontextmanager
+async def acquire(lane: str = DEFAULT_LANE):
+    """
+    Check a connection out of a lane's pool.
+
+    Waits at most the lane's acquire_timeout for a free connection, and pings
+    connections that have sat idle longer than the lane's keepalive so a stale
+    socket is reconnected here instead of failing the query with
+    "MySQL server has gone away".
+    """
+    settings = POOL_LANES[lane]
+    pool = await get_pool(lane)
+    try:
+        conn = await asyncio.wait_for(pool.acquire(), timeout=settings['acquire_timeout'])
+    except asyncio.TimeoutError:
+        raise TimeoutError(f"Timed out after {settings['acquire_timeout']}s waiting for a {lane} connection")
+    try:
+        idle = asyncio.get_running_loop().time() - conn.last_usage
+        if idle > settings['keepalive']:
+            await conn.ping(reconnect=True)
+        yield conn
+    finally:
+        pool.release(conn)
+
+async def execute_query(query: str, params: Optional[tuple] = None, max_retries: int = 3,
+                        lane: str = DEFAULT_LANE) -> List[Dict[str, Any]]:
+    """Execute a SQL query on the given pool lane and return the results with cleaned None values. Includes retry logic for connection issues."""
+    backend = get_backend()
+    if backend is not None:
+        return await backend.execute_query(query, params)
 
-async def execute_query(query: str, params: Optional[tuple] = None, max_retries: int = 3) -> List[Dict[str, Any]]:
-    """Execute a SQL query and return the results with cleaned None values. Includes retry logic for connection issues."""
     last_exception = None
+
+    if not db_breaker.allow_request():
+        raise DatabaseUnavailableError("Database circuit breaker is open, failing fast")
     
     for attempt in range(max_retries):
         try:
-            pool = await get_pool()
-            async with pool.acquire() as conn:
+            async with acquire(lane) as conn:
                 async with conn.cursor(aiomysql.DictCursor) as cur:
                     await cur.execute(query, params or ())
                     results = await cur.fetchall()
@@ -139,33 +314,21 @@ async def execute_query(query: str, params: Optional[tuple] = None, max_retries:
                                 cleaned_row[key] = value
                         cleaned_results.append(cleaned_row)
                     
+                    db_breaker.record_success()
                     return cleaned_results
                     
         except (aiomysql.Error, ConnectionError, OSError) as e:
             last_exception = e
-            error_code = getattr(e, 'args', [None])[0] if hasattr(e, 'args') and e.args else None
             
             # Check if it's a connection-related error worth retrying
-            connection_errors = [
-                2006,  # MySQL server has gone away
-                2013,  # Lost connection to MySQL server during query
-                2055,  # Lost connection to MySQL server at 'reading initial communication packet'
-            ]
-            
-            is_connection_error = (
-                error_code in connection_errors or
-                "Lost connection" in str(e) or
-                "MySQL server has gone away" in str(e) or
-                "Connection reset by peer" in str(e)
-            )
+            connection_error = is_connection_error(e)
+            if connection_error:
+                db_breaker.record_failure()
             
-            if is_connection_error and attempt < max_retries - 1:
-                # Reset the pool to force new connections
-                global _pool
-                if _pool:
-                    _pool.close()
-                    await _pool.wait_closed()
-                    _pool = None
+            # Stop retrying as soon as the breaker opens so callers aren't held up by backoff sleeps
+            if connection_error and attempt < max_retries - 1 and db_breaker.allow_request():
+                # Reset this lane's pool to force new connections
+                await _reset_pool(lane)
                 
                 wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
                 print(f"[SQL] Connection error (attempt {attempt + 1}/{max_retries}): {e}")
@@ -180,34 +343,44 @@ async def execute_query(query: str, params: Optional[tuple] = None, max_retries:
     print(f"[SQL] All {max_retries} attempts failed. Last error: {last_exception}")
     raise last_exception
 
-async def execute_many(query: str, params_list: List[tuple]) -> None:
+async def execute_many(query: str, params_list: List[tuple], lane: str = 'write') -> None:
     """Execute multiple SQL queries with different parameters."""
-    pool = await get_pool()
-    async with pool.acquire() as conn:
+    backend = get_backend()
+    if backend is not None:
+        for params in params_list:
+            await backend.execute_query(query, params)
+        return
+    async with acquire(lane) as conn:
         async with conn.cursor() as cur:
             await cur.executemany(query, params_list)
 
 async def close_pool():
-    """Close the connection pool."""
-    global _pool
-    if _pool is not None:
+    """Close every lane's connection pool."""
+    for lane in list(_pools):
         try:
-            _pool.close()
-            await _pool.wait_closed()
+            await _reset_pool(lane)
         except Exception as e:
             # Log but don't raise to avoid blocking cleanup
-            print(f"[SQL] Warning during pool closure: {e}")
-        finally:
-            _pool = None
+            print(f"[SQL] Warning during {lane} pool closure: {e}")
+            _pools.pop(lane, None)
 
 async def send_df_to_sql(df, table_name, if_exists='append', unique_key=None):
     if df.empty:
         return
 
+    backend = get_backend()
+    if backend is not None:
+        return await backend.send_df_to_sql(df, table_name, if_exists, unique_key)
+
+    if not db_breaker.allow_request():
+        raise DatabaseUnavailableError(f"Database circuit breaker is open, not writing to {table_name}")
+
+    # Only a replace (DELETE then INSERT) has to be serialized, and only against its own table
+    table_lock = _table_locks[table_name] if if_exists == 'replace' else nullcontext()
+
     try:
-        async with lock:
-            pool = await get_pool()
-            async with pool.acquire() as conn:
+        async with table_lock:
+            async with acquire('write') as conn:
                 async with conn.cursor() as cur:
                     if if_exists == 'replace':
                         await cur.execute(f"DELETE FROM {table_name}")
@@ -273,21 +446,25 @@ async def send_df_to_sql(df, table_name, if_exists='append', unique_key=None):
                         await cur.executemany(query, data_tuples)
                     
                     await conn.commit()
+        db_breaker.record_success()
 
     except Exception as e:
+        if is_connection_error(e):
+            db_breaker.record_failure()
         print(f"[SQL] Failed to insert data into {table_name}: {str(e)}")
         raise 
 
 class DatabaseManager:
     """Context manager for database operations that ensures proper cleanup"""
     
-    def __init__(self):
+    def __init__(self, lane: str = DEFAULT_LANE):
+        self.lane = lane
         self.pool = None
         self.local_loop = None
         self.created_loop = False
         
     async def __aenter__(self):
-        self.pool = await get_pool()
+        self.pool = await get_pool(self.lane)
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -323,7 +500,7 @@ class DatabaseManager:
     
     async def execute_query(self, query: str, params: Optional[tuple] = None, max_retries: int = 3):
         """Execute query within this context"""
-        return await execute_query(query, params, max_retries)
+        return await execute_query(query, params, max_retries, lane=self.lane)
     
     async def send_df_to_sql(self, df, table_name, if_exists='append', unique_key=None):
         """Send DataFrame to SQL within this context"""
@@ -0,0 +1,134 @@
+import copy
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from bot.functions.admin import direct_path_finder
+from bot.connections.logging_config import get_logger, log_exception
+
+state_logger = get_logger('state_store')
+
+# Operational state (mini leaders, guild configs, history trackers, GPT usage log,
+# scheduler markers) kept in one SQLite file instead of loose JSON files. Every
+# write is its own transaction, so a crash leaves either the old or the new value,
+# never half a file. Values are cached in memory after their first read, so lookups
+# on hot paths (default channel per post, custom emoji per reaction) don't touch disk.
+#
+# Keys are the paths the values used to live at under files/ (e.g.
+# 'guilds/<guild>/config.json'); a key that isn't in the store yet is imported from
+# that JSON file once, if it exists.
+
+STATE_PATH = direct_path_finder('files', 'state', 'bot_state.db')
+
+_conn = None
+_cache = {}                 # key -> decoded value; only keys that exist in the store
+_missing = set()            # keys found in neither the store nor a legacy file
+_lock = threading.Lock()    # writes come from the event loop and the odd executor thread
+
+def _connect():
+    """Open the state database, creating it on first use."""
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+        conn = sqlite3.connect(STATE_PATH, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # WAL: a commit survives a process crash
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS state (
+                state_key TEXT PRIMARY KEY,
+                value_json TEXT NOT NULL,
+                updated_ts TEXT NOT NULL
+            )
+        """)
+        _conn = conn
+    return _conn
+
+def _write(key: str, value):
+    value_json = json.dumps(value, ensure_ascii=False)
+    updated_ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("""
+            INSERT INTO state (state_key, value_json, updated_ts) VALUES (?, ?, ?)
+            ON CONFLICT (state_key) DO UPDATE SET value_json = excluded.value_json, updated_ts = excluded.updated_ts
+        """, (key, value_json, updated_ts))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    _cache[key] = json.loads(value_json)  # cache what was stored, not the caller's object
+    _missing.discard(key)
+
+def _import_legacy(key: str):
+    """The value from the JSON file `key` names, or None."""
+    legacy_path = direct_path_finder('files', *key.split('/'))
+    try:
+        with open(legacy_path, 'r', encoding='utf-8') as file:
+            value = json.load(file)
+    except FileNotFoundError:
+        return None
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        log_exception(state_logger, e, f"importing {legacy_path}")
+        return None
+    _write(key, value)
+    state_logger.info(f"Imported {legacy_path} into the state store")
+    return value
+
+def _read(key: str):
+    # Callers hold _lock
+    if key in _cache:
+        return _cache[key]
+    if key in _missing:
+        return None
+    row = _connect().execute("SELECT value_json FROM state WHERE state_key = ?", (key,)).fetchone()
+    if row is not None:
+        _cache[key] = json.loads(row[0])
+        return _cache[key]
+    value = _import_legacy(key)
+    if value is None:
+        _missing.add(key)
+    return value
+
+def get_state(key: str, default=None):
+    """
+    The value stored under key, or default if there is none.
+
+    The returned value is shared with the cache: don't modify it, use set_state or
+    update_state.
+    """
+    value = _cache.get(key)
+    if value is None:
+        with _lock:
+            value = _read(key)
+    return default if value is None else value
+
+def set_state(key: str, value):
+    """Store a JSON-serialisable value under key, atomically."""
+    with _lock:
+        _write(key, value)
+
+def update_state(key: str, update, default=None):
+    """
+    Read-modify-write: update(copy of the current value or default) returns the new
+    value, which is stored atomically. Returns the new value.
+    """
+    with _lock:
+        current = _read(key)
+        value = update(copy.deepcopy(default if current is None else current))
+        _write(key, value)
+    return value
+
+def guild_key(guild_name: str, name: str) -> str:
+    """Key for a per-guild value, e.g. guild_key(guild, 'config.json')."""
+    return f"guilds/{guild_name}/{name}"
+
+def close_state_store():
+    global _conn
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+        _cache.clear()
+        _missing.clear()
@@ -0,0 +1,15 @@
+-- Top of every game's board on one date, for the daily digest, in one query.
+-- Reads games.daily_standings; incomplete scores have no rank and are left out.
+-- imported_only = 1 returns just the games in imported_games (a comma-separated list,
+-- IMPORTED_GAMES in bot/functions/daily_standings.py), for dates whose other boards are
+-- held in memory.
+SELECT
+    game_name,
+    game_rank as rnk,
+    player_name as player,
+    game_score as score
+FROM games.daily_standings
+WHERE game_date = %(game_date)s
+    AND game_rank <= %(top_n)s
+    AND (%(imported_only)s = 0 OR FIND_IN_SET(game_name, %(imported_games)s) > 0)
+ORDER BY game_name, game_rank, added_ts
@@ -1,10 +1,36 @@
-select
-	game_rank as rnk,
-	player_name as player,
-	game_score as score,
-	game_detail as detail,
-	-- game_bonuses as bonus,
-	added_at
-from games.daily_view
-where game_date = %s
-and game_name = %s
\ No newline at end of file
+-- Daily leaderboard for one game on one date, read from games.daily_standings
+-- (kept up to date by bot/functions/daily_standings.py, see refresh_daily_standings.sql).
+-- Returns one page (LIMIT/OFFSET) plus the caller's own row, with pos (position on the
+-- board) and total_rows for paging. The view-based version is in inactive/daily_games_view.sql.
+WITH
+standings AS (
+    select
+        game_rank as rnk,
+        player_name as player,
+        game_score as score,
+        game_detail as detail,
+        -- game_bonuses as bonus,
+        date_format(added_ts, '%%l:%%i%%p') as added_at,
+        ROW_NUMBER() OVER (ORDER BY coalesce(game_rank, 9999), added_ts) as pos,
+        COUNT(*) OVER () as total_rows
+    from games.daily_standings
+    where game_date = %(game_date)s
+    and game_name = %(game_name)s
+),
+page AS (
+    SELECT * FROM standings
+    ORDER BY pos
+    LIMIT %(limit)s OFFSET %(offset)s
+),
+pinned AS (
+    SELECT * FROM standings
+    WHERE player IN (
+        SELECT player_name FROM games.xref_users
+        WHERE sys_name = 'discord' AND sys_user = %(member_nm)s
+    )
+    OR player = %(member_nm)s
+)
+SELECT * FROM page
+UNION
+SELECT * FROM pinned
+ORDER BY pos
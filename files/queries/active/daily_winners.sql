@@ -1,8 +1,10 @@
+-- Winners of every recently played game on one date, read from games.daily_standings.
+-- The view-based version is in inactive/daily_winners_view.sql.
 WITH 
 recently_played_games AS (
     SELECT DISTINCT
         game_name
-    FROM games.daily_view
+    FROM games.daily_standings
     WHERE game_date >= date_sub(curdate(), interval 1 week)
 ),
 specific_date_winners AS (
@@ -11,7 +13,7 @@ specific_date_winners AS (
         game_score,
         GROUP_CONCAT(player_name ORDER BY player_name SEPARATOR ', ') as winners,
         game_detail
-    FROM games.daily_view
+    FROM games.daily_standings
     WHERE game_date = %s
         AND game_rank = 1
     GROUP BY 
@@ -20,7 +22,7 @@ specific_date_winners AS (
         game_detail
 )
 SELECT
-    a.game_name,
+    concat(upper(left(a.game_name, 1)), lower(substr(a.game_name, 2))) as game_name,
     b.winners,
     b.game_score,
     b.game_detail
@@ -28,4 +30,4 @@ FROM recently_played_games a
 LEFT JOIN specific_date_winners b
     ON a.game_name = b.game_name
 ORDER BY a.game_name
-;
\ No newline at end of file
+;
@@ -1,31 +1,261 @@
-WITH game_stats AS (
+-- Aggregate stats for one game over a date range.
+-- Whole months inside the range (%(rollup_start)s to %(rollup_end)s) are read from
+-- games.monthly_rollups; only the days outside them (the partial months at the edges) are
+-- deduped and ranked from the base tables, with the filters applied before ranking.
+-- Ranks are partitioned by (game_date, game_name), so neither split changes them.
+-- The all-days version is inactive/game_aggregate_stats_days.sql (view-based: _view.sql).
+-- Returns one page (LIMIT/OFFSET) plus the caller's own row, with total_rows for paging.
+WITH
+latest_records AS (
+    SELECT
+        added_ts,
+        user_name,
+        game_name,
+        game_score,
+        game_date,
+        ROW_NUMBER() OVER (PARTITION BY game_name, game_date, user_name ORDER BY added_ts DESC) AS added_rank
+    FROM games.game_history
+    WHERE game_date BETWEEN %(start_date)s AND %(end_date)s
+        AND game_date NOT BETWEEN %(rollup_start)s AND %(rollup_end)s
+        AND game_name = %(game_name)s
+    UNION ALL
+    SELECT
+        NULL AS added_ts,
+        CASE
+            WHEN player_name = 'Whit' THEN 'croasus'
+            WHEN player_name = 'Brice' THEN 'acowinthewcrowd'
+            WHEN player_name = 'Zach' THEN 'cryingprincess'
+            WHEN player_name = 'Matt' THEN 'svendiamond'
+            WHEN player_name = 'Andy' THEN 'scratchysaurus'
+            WHEN player_name = 'Ryan' THEN 'tuckletheknuckle'
+            WHEN player_name = 'Sally' THEN 'sat1056'
+            WHEN player_name = 'Bob' THEN 'SSIBob'
+            WHEN player_name = 'Steve' THEN 'RabbiFerret'
+            ELSE player_name
+        END AS user_name,
+        'daily' AS game_name,
+        concat(floor(solving_seconds / 60), ':', lpad(mod(solving_seconds, 60), 2, '0')) AS game_score,
+        print_date AS game_date,
+        1 AS added_rank
+    FROM games.nyt_history
+    WHERE print_date BETWEEN %(start_date)s AND %(end_date)s
+        AND print_date NOT BETWEEN %(rollup_start)s AND %(rollup_end)s
+        AND 'daily' = %(game_name)s
+        AND puzzle_type = 'daily'
+        AND solved = 1
+),
+all_games AS (
+    SELECT
+        x.game_date,
+        x.game_name,
+        x.user_name,
+        g.scoring_type,
+        CASE
+            WHEN g.scoring_type = 'timed'
+                THEN cast((substring_index(x.game_score, ':', 1) * 60) + substring_index(x.game_score, ':', -1) as signed)
+            WHEN g.scoring_type = 'guesses' THEN
+                CASE
+                    WHEN left(x.game_score, 1) IN ('X', '?') THEN 0
+                    WHEN regexp_like(substring_index(x.game_score, '/', 1), '^-?[0-9]+$') THEN cast(substring_index(x.game_score, '/', 1) as signed)
+                    WHEN left(x.game_score, 1) = '+' THEN cast(replace(x.game_score, '+', '') as signed)
+                    ELSE NULL
+                END
+            WHEN g.scoring_type = 'points' THEN
+                CASE WHEN regexp_like(x.game_score, '^-?[0-9]+$') THEN cast(x.game_score as signed) ELSE NULL END
+        END AS score_as_int,
+        CASE
+            WHEN left(x.game_score, 1) IN ('X', '?') OR (x.game_name = 'boxoffice' AND x.game_score = '0') THEN 0
+            ELSE 1
+        END AS game_completed
+    FROM latest_records x
+    LEFT JOIN games.game_details g
+        ON x.game_name = g.game_name
+    WHERE x.added_rank = 1
+),
+games_by_guild AS (
+    SELECT
+        x.game_name,
+        x.score_as_int,
+        x.game_completed,
+        CASE
+            WHEN x.game_completed = 0 THEN NULL
+            WHEN x.scoring_type IN ('timed', 'guesses')
+                THEN DENSE_RANK() OVER (PARTITION BY guild_nm, x.game_date, x.game_name ORDER BY x.game_completed DESC, x.score_as_int)
+            WHEN x.scoring_type = 'points'
+                THEN DENSE_RANK() OVER (PARTITION BY guild_nm, x.game_date, x.game_name ORDER BY x.score_as_int DESC)
+        END AS game_rank,
+        player_name
+    FROM all_games x
+    JOIN matt.user_view y
+        ON lower(x.user_name) = lower(member_nm) OR lower(x.user_name) = lower(alt_member_nm)
+    WHERE guild_nm = 'global'
+),
+mini_latest AS (
+    SELECT
+        x.game_date,
+        x.player_id,
+        x.game_time,
+        x.added_ts
+    FROM (
+        SELECT
+            game_date,
+            player_id,
+            game_time,
+            added_ts,
+            ROW_NUMBER() OVER (PARTITION BY game_date, player_id ORDER BY added_ts) AS added_rank
+        FROM matt.mini_history
+        WHERE game_date BETWEEN %(start_date)s AND %(end_date)s
+            AND game_date NOT BETWEEN %(rollup_start)s AND %(rollup_end)s
+            AND 'mini' = %(game_name)s
+    ) x
+    WHERE x.added_rank = 1
+    UNION ALL
+    SELECT
+        print_date,
+        CASE
+            WHEN player_name = 'Brice' THEN 'acowinthecrowd'
+            WHEN player_name = 'Whit' THEN 'croasus'
+            WHEN player_name = 'Zach' THEN 'Throoper'
+            WHEN player_name = 'Matt' THEN 'Matt'
+            WHEN player_name = 'Sally' THEN 'mama56'
+            WHEN player_name = 'Andy' THEN 'Andy'
+            WHEN player_name = 'Ryan' THEN 'Tuckle'
+            WHEN player_name = 'Andrew' THEN 'aromatt'
+            WHEN player_name = 'Ben' THEN 'Benji'
+            WHEN player_name = 'Steve' THEN 'RabbiFerret'
+            ELSE player_name
+        END AS player_id,
+        concat(floor(solving_seconds / 60), ':', lpad(mod(solving_seconds, 60), 2, '0')) AS game_time,
+        left(solved_datetime, 19) AS added_ts
+    FROM games.nyt_history
+    WHERE print_date BETWEEN %(start_date)s AND %(end_date)s
+        AND print_date NOT BETWEEN %(rollup_start)s AND %(rollup_end)s
+        AND 'mini' = %(game_name)s
+        AND puzzle_type = 'mini'
+        AND solved = 1
+),
+mini_no_dupes AS (
+    SELECT
+        mini_latest.*,
+        ROW_NUMBER() OVER (PARTITION BY game_date, player_id ORDER BY added_ts DESC) AS rnk
+    FROM mini_latest
+),
+mini AS (
+    SELECT DISTINCT
+        guild_id,
+        guild_nm,
+        x.game_date,
+        player_name,
+        member_nm,
+        x.game_time,
+        (60 * substring_index(x.game_time, ':', 1)) + substring_index(x.game_time, ':', -1) AS seconds,
+        x.added_ts,
+        DENSE_RANK() OVER (
+            PARTITION BY guild_nm, x.game_date
+            ORDER BY (60 * substring_index(x.game_time, ':', 1)) + substring_index(x.game_time, ':', -1)
+        ) AS game_rank
+    FROM mini_no_dupes x
+    JOIN matt.user_view y
+        ON lower(x.player_id) = lower(nyt_id)
+    WHERE x.rnk = 1
+        AND guild_id = 'global'
+),
+combined AS (
+    SELECT
+        game_name,
+        player_name,
+        game_rank,
+        cast(CASE WHEN game_completed = 0 THEN 0 ELSE pow(11 - game_rank, 2) END as signed) AS points,
+        CASE WHEN score_as_int = 0 THEN NULL ELSE score_as_int END AS seconds
+    FROM games_by_guild
+    UNION ALL
+    SELECT
+        'mini' AS game_name,
+        player_name,
+        game_rank,
+        cast(CASE WHEN game_rank > 10 THEN 0 ELSE pow(11 - game_rank, 2) END as signed) AS points,
+        seconds
+    FROM mini
+),
+edge_days AS (
+    SELECT
+        player_name,
+        COUNT(*) as games,
+        SUM(points) as points,
+        SUM(case when game_name = 'daily' then (seconds / 60.0) else seconds end) as score_sum,
+        COUNT(seconds) as score_count,
+        COUNT(CASE WHEN game_rank = 1 THEN 1 END) as first_place,
+        COUNT(CASE WHEN game_rank = 2 THEN 1 END) as second_place,
+        COUNT(CASE WHEN game_rank = 3 THEN 1 END) as third_place,
+        COUNT(CASE WHEN game_rank = 4 THEN 1 END) as fourth_place,
+        COUNT(CASE WHEN game_rank = 5 THEN 1 END) as fifth_place
+    FROM combined
+    WHERE game_name = %(game_name)s
+    GROUP BY player_name
+),
+whole_months AS (
+    SELECT
+        player_name,
+        games,
+        points,
+        score_sum,
+        score_count,
+        first_place,
+        second_place,
+        third_place,
+        fourth_place,
+        fifth_place
+    FROM games.monthly_rollups
+    WHERE game_name = %(game_name)s
+        AND month_start BETWEEN %(rollup_start)s AND %(rollup_end)s
+),
+game_stats AS (
     SELECT 
         player_name as player,
-        COUNT(*) as games,
+        SUM(games) as games,
         SUM(points) as points,
-        AVG(case when game_name = 'daily' then (seconds / 60.0) else seconds end) as avg_score,
-        COUNT(CASE WHEN game_rank = 1 THEN 1 END) as 1st,
-        COUNT(CASE WHEN game_rank = 2 THEN 1 END) as 2nd,
-        COUNT(CASE WHEN game_rank = 3 THEN 1 END) as 3rd,
-        COUNT(CASE WHEN game_rank = 4 THEN 1 END) as 4th,
-        COUNT(CASE WHEN game_rank = 5 THEN 1 END) as 5th,
-        COUNT(CASE WHEN game_rank < 11 THEN 1 END) / COUNT(*) as top_10_raw
-    FROM games.game_view
-    WHERE game_date BETWEEN %s and %s
-        AND game_name = %s
+        1.0 * SUM(score_sum) / NULLIF(SUM(score_count), 0) as avg_score,
+        SUM(first_place) as 1st,
+        SUM(second_place) as 2nd,
+        SUM(third_place) as 3rd,
+        SUM(fourth_place) as 4th,
+        SUM(fifth_place) as 5th
+    FROM (
+        SELECT * FROM edge_days
+        UNION ALL
+        SELECT * FROM whole_months
+    ) x
     GROUP BY player_name
+),
+ranked AS (
+    SELECT 
+        ROW_NUMBER() OVER (ORDER BY points DESC, avg_score ASC) as `rank`,
+        player,
+        points,
+        ROUND(avg_score, 1) as `avg`,
+        1st,
+        2nd,
+        3rd,
+        4th,
+        5th,
+        games,
+        COUNT(*) OVER () as total_rows
+    FROM game_stats
+),
+page AS (
+    SELECT * FROM ranked
+    ORDER BY `rank`
+    LIMIT %(limit)s OFFSET %(offset)s
+),
+-- The caller's own row, shown under the page when it isn't on it
+pinned AS (
+    SELECT * FROM ranked
+    WHERE player IN (
+        SELECT player_name FROM matt.user_view
+        WHERE lower(member_nm) = lower(%(member_nm)s)
+    )
 )
-SELECT 
-    ROW_NUMBER() OVER (ORDER BY points DESC, avg_score ASC) as `rank`,
-    player,
-    points,
-    ROUND(avg_score, 1) as `avg`,
-    1st,
-    2nd,
-    3rd,
-    4th,
-    5th,
-    games
-FROM game_stats
-ORDER BY  points DESC
-;
\ No newline at end of file
+SELECT * FROM page
+UNION
+SELECT * FROM pinned
+ORDER BY `rank`
@@ -0,0 +1,73 @@
+-- Current global mini leader(s) for one date.
+-- Same rows as matt.mini_view filtered by game_date, game_rank = 1 and guild 'Global', but the
+-- date filter is applied to the base tables before deduping and ranking (old version:
+-- inactive/mini_leaders_view.sql). Every window here is partitioned by game_date, so
+-- filtering first doesn't change the ranks.
+WITH
+mini_history_latest AS (
+    SELECT
+        x.game_date,
+        x.player_id,
+        x.game_time,
+        x.added_ts
+    FROM (
+        SELECT
+            game_date,
+            player_id,
+            game_time,
+            added_ts,
+            ROW_NUMBER() OVER (PARTITION BY game_date, player_id ORDER BY added_ts) AS added_rank
+        FROM matt.mini_history
+        WHERE game_date = %(game_date)s
+    ) x
+    WHERE x.added_rank = 1
+    UNION ALL
+    SELECT
+        print_date,
+        CASE
+            WHEN player_name = 'Brice' THEN 'acowinthecrowd'
+            WHEN player_name = 'Whit' THEN 'croasus'
+            WHEN player_name = 'Zach' THEN 'Throoper'
+            WHEN player_name = 'Matt' THEN 'Matt'
+            WHEN player_name = 'Sally' THEN 'mama56'
+            WHEN player_name = 'Andy' THEN 'Andy'
+            WHEN player_name = 'Ryan' THEN 'Tuckle'
+            WHEN player_name = 'Andrew' THEN 'aromatt'
+            WHEN player_name = 'Ben' THEN 'Benji'
+            WHEN player_name = 'Steve' THEN 'RabbiFerret'
+            ELSE player_name
+        END AS player_id,
+        concat(floor(solving_seconds / 60), ':', lpad(mod(solving_seconds, 60), 2, '0')) AS game_time,
+        left(solved_datetime, 19) AS added_ts
+    FROM games.nyt_history
+    WHERE print_date = %(game_date)s
+        AND puzzle_type = 'mini'
+        AND solved = 1
+),
+mini_history_no_dupes AS (
+    SELECT
+        mini_history_latest.*,
+        ROW_NUMBER() OVER (PARTITION BY game_date, player_id ORDER BY added_ts DESC) AS rnk
+    FROM mini_history_latest
+),
+mini AS (
+    SELECT DISTINCT
+        guild_nm,
+        player_name,
+        x.game_time,
+        DENSE_RANK() OVER (
+            PARTITION BY guild_nm, x.game_date
+            ORDER BY (60 * substring_index(x.game_time, ':', 1)) + substring_index(x.game_time, ':', -1)
+        ) AS game_rank
+    FROM mini_history_no_dupes x
+    JOIN matt.user_view y
+        ON lower(x.player_id) = lower(nyt_id)
+    WHERE x.rnk = 1
+        AND guild_id = 'global'
+)
+select
+    player_name,
+    game_time
+from mini
+where game_rank = 1
+and guild_nm = 'Global'
@@ -0,0 +1,15 @@
+-- Players to tag in the mini warning: haven't done today's mini (mini_not_completed)
+-- and haven't already been warned successfully on %(warning_date)s.
+SELECT
+    n.player_name,
+    n.discord_id_nbr
+FROM matt.mini_not_completed n
+WHERE n.discord_id_nbr IS NOT NULL
+    AND NOT EXISTS (
+        SELECT 1
+        FROM games.mini_warning_history h
+        WHERE h.warning_date = %(warning_date)s
+            AND h.discord_id_nbr = n.discord_id_nbr
+            AND h.success = 1
+    )
+ORDER BY n.player_name
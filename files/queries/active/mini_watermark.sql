@@ -0,0 +1,8 @@
+-- Cheap change check for the mini leader poll: row counts and latest timestamps of the
+-- rows mini_leaders.sql reads for one date. Both filters hit the tables' date columns,
+-- so this is an index range scan instead of the full dedupe/rank/user_view chain.
+SELECT
+    (SELECT count(*) FROM matt.mini_history WHERE game_date = %(game_date)s) AS mini_rows,
+    (SELECT max(added_ts) FROM matt.mini_history WHERE game_date = %(game_date)s) AS mini_latest,
+    (SELECT count(*) FROM games.nyt_history WHERE print_date = %(game_date)s AND puzzle_type = 'mini') AS nyt_rows,
+    (SELECT max(solved_datetime) FROM games.nyt_history WHERE print_date = %(game_date)s AND puzzle_type = 'mini') AS nyt_latest
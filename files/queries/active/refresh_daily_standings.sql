@@ -0,0 +1,150 @@
+-- Rebuild one (game_name, game_date) partition of games.daily_standings.
+-- Same chain as games.daily_view with the filters pushed into the base tables. Rows are
+-- upserted with this refresh's refreshed_ts; bot/functions/daily_standings.py then deletes
+-- rows in the partition with an older refreshed_ts (players no longer in the source).
+INSERT INTO games.daily_standings (
+    game_name, game_date, player_name, game_rank, points, game_score, score_as_int,
+    game_completed, game_detail, game_bonuses, added_ts, refreshed_ts
+)
+WITH
+raw_games AS (
+    SELECT
+        game_date,
+        game_detail,
+        source_desc,
+        user_name,
+        concat(upper(left(game_name, 1)), lower(substr(game_name, 2))) AS game_name,
+        game_score,
+        CASE
+            WHEN game_score LIKE '%%:%%' AND regexp_like(game_score, '^[0-9]+:[0-5][0-9]$')
+                THEN cast(substring_index(game_score, ':', 1) as unsigned) * 60 + cast(substring_index(game_score, ':', -1) as unsigned)
+            WHEN game_score LIKE '%%/%%' AND regexp_like(substring_index(game_score, '/', 1), '^-?[0-9]+$')
+                THEN cast(substring_index(game_score, '/', 1) as signed)
+            WHEN game_score LIKE '+%%' AND regexp_like(replace(game_score, '+', ''), '^[0-9]+$')
+                THEN cast(replace(game_score, '+', '') as signed)
+            WHEN left(game_score, 1) IN ('X', '?')
+                THEN 0
+            WHEN regexp_like(game_score, '^-?[0-9]+$')
+                THEN cast(game_score as signed)
+            ELSE NULL
+        END AS score_as_int,
+        game_bonuses,
+        added_ts,
+        CASE WHEN game_score LIKE '%%X%%' OR game_score LIKE '%%?%%' THEN 0 ELSE 1 END AS game_completed
+    FROM games.game_history
+    WHERE game_date = %(game_date)s
+        AND game_name = %(game_name)s
+),
+raw_nyt AS (
+    SELECT
+        print_date AS game_date,
+        dayname(print_date) AS game_detail,
+        'NYT_Automated' AS source_desc,
+        player_name AS user_name,
+        concat(upper(left(puzzle_type, 1)), lower(substr(puzzle_type, 2))) AS game_name,  -- same case as the other sources
+        CASE
+            WHEN solving_seconds >= 3600
+                THEN time_format(sec_to_time(solving_seconds), '%%k:%%i:%%s')
+            ELSE concat(floor(solving_seconds / 60), ':', lpad(mod(solving_seconds, 60), 2, '0'))
+        END AS game_score,
+        CASE
+            WHEN solved = 0 THEN 100 - cast(percent_filled as signed)
+            ELSE cast(solving_seconds as signed)
+        END AS score_as_int,
+        CASE
+            WHEN puzzle_type <> 'daily' THEN NULL
+            WHEN star IS NOT NULL THEN 'Gold!'
+            WHEN solved = 1 AND clean_solve = 1 THEN 'Solved clean'
+            WHEN solved = 1 THEN 'Solved with help'
+            ELSE concat('Solving... ', cast(percent_filled as char), '%%')
+        END AS game_bonuses,
+        bot_added_ts AS added_ts,
+        CASE
+            WHEN solved = 1 AND clean_solve = 1 THEN 1
+            WHEN solved = 1 AND clean_solve = 0 THEN 0.5
+            ELSE 0
+        END AS game_completed
+    FROM games.nyt_history
+    WHERE print_date = %(game_date)s
+        AND puzzle_type = %(game_name)s
+        AND (puzzle_type <> 'mini' OR percent_filled >= 100)
+),
+raw_nyt_legacy AS (
+    SELECT
+        game_date,
+        dayname(game_date) AS game_detail,
+        'NYT_Legacy' AS source_desc,
+        player_id AS user_name,
+        'Mini' AS game_name,
+        game_time AS game_score,
+        CASE
+            WHEN game_time LIKE '%%:%%' AND regexp_like(game_time, '^[0-9]+:[0-5][0-9]$')
+                THEN cast(substring_index(game_time, ':', 1) as unsigned) * 60 + cast(substring_index(game_time, ':', -1) as unsigned)
+            ELSE NULL
+        END AS score_as_int,
+        NULL AS game_bonuses,
+        added_ts,
+        1 AS game_completed
+    FROM matt.mini_history
+    WHERE game_date = %(game_date)s
+        AND 'mini' = %(game_name)s
+),
+raw_data AS (
+    SELECT game_date, game_detail, source_desc, user_name, game_name, game_score, score_as_int, game_bonuses, added_ts, game_completed
+    FROM raw_games
+    UNION ALL
+    SELECT game_date, game_detail, source_desc, user_name, game_name, game_score, score_as_int, game_bonuses, added_ts, game_completed
+    FROM raw_nyt
+    UNION ALL
+    SELECT game_date, game_detail, source_desc, user_name, game_name, game_score, score_as_int, game_bonuses, added_ts, game_completed
+    FROM raw_nyt_legacy
+),
+added_user AS (
+    SELECT
+        x.*,
+        coalesce(y.player_name, x.user_name) AS player_name,
+        ROW_NUMBER() OVER (
+            PARTITION BY x.game_date, x.game_name, coalesce(y.player_name, x.user_name)
+            ORDER BY x.added_ts DESC
+        ) AS row_nbr
+    FROM raw_data x
+    LEFT JOIN games.xref_users y
+        ON x.source_desc = y.sys_name AND x.user_name = y.sys_user
+),
+deduped_and_ranked AS (
+    SELECT
+        added_user.*,
+        CASE
+            WHEN game_completed = 0 THEN NULL
+            WHEN game_name IN ('timeguessr', 'boxoffice')
+                THEN rank() OVER (PARTITION BY game_date, game_name ORDER BY game_completed DESC, score_as_int DESC)
+            ELSE rank() OVER (PARTITION BY game_date, game_name ORDER BY game_completed DESC, score_as_int)
+        END AS game_rank
+    FROM added_user
+    WHERE row_nbr = 1
+)
+SELECT
+    %(game_name)s AS game_name,
+    game_date,
+    player_name,
+    game_rank,
+    CASE WHEN game_rank > 10 THEN 0 ELSE pow(11 - game_rank, 2) END AS points,
+    game_score,
+    score_as_int,
+    game_completed,
+    game_detail,
+    game_bonuses,
+    added_ts,
+    %(refreshed_ts)s AS refreshed_ts
+FROM deduped_and_ranked
+WHERE 1 = 1  -- an INSERT ... SELECT upsert needs a WHERE clause on the local SQLite backend
+ON DUPLICATE KEY UPDATE
+    game_rank = VALUES(game_rank),
+    points = VALUES(points),
+    game_score = VALUES(game_score),
+    score_as_int = VALUES(score_as_int),
+    game_completed = VALUES(game_completed),
+    game_detail = VALUES(game_detail),
+    game_bonuses = VALUES(game_bonuses),
+    added_ts = VALUES(added_ts),
+    refreshed_ts = VALUES(refreshed_ts)
@@ -0,0 +1,205 @@
+-- Rebuild one (game_name, month) of games.monthly_rollups.
+-- Same chain as game_aggregate_stats.sql over the month's days (%(start_date)s to
+-- %(end_date)s), summed per player instead of averaged, so months can be added together.
+-- Rows are upserted with this refresh's refreshed_ts; bot/functions/monthly_rollups.py
+-- then deletes rows in the month with an older refreshed_ts (players no longer in it).
+INSERT INTO games.monthly_rollups (
+    game_name, month_start, player_name, games, points, score_sum, score_count,
+    first_place, second_place, third_place, fourth_place, fifth_place, refreshed_ts
+)
+WITH
+latest_records AS (
+    SELECT
+        added_ts,
+        user_name,
+        game_name,
+        game_score,
+        game_date,
+        ROW_NUMBER() OVER (PARTITION BY game_name, game_date, user_name ORDER BY added_ts DESC) AS added_rank
+    FROM games.game_history
+    WHERE game_date BETWEEN %(start_date)s AND %(end_date)s
+        AND game_name = %(game_name)s
+    UNION ALL
+    SELECT
+        NULL AS added_ts,
+        CASE
+            WHEN player_name = 'Whit' THEN 'croasus'
+            WHEN player_name = 'Brice' THEN 'acowinthewcrowd'
+            WHEN player_name = 'Zach' THEN 'cryingprincess'
+            WHEN player_name = 'Matt' THEN 'svendiamond'
+            WHEN player_name = 'Andy' THEN 'scratchysaurus'
+            WHEN player_name = 'Ryan' THEN 'tuckletheknuckle'
+            WHEN player_name = 'Sally' THEN 'sat1056'
+            WHEN player_name = 'Bob' THEN 'SSIBob'
+            WHEN player_name = 'Steve' THEN 'RabbiFerret'
+            ELSE player_name
+        END AS user_name,
+        'daily' AS game_name,
+        concat(floor(solving_seconds / 60), ':', lpad(mod(solving_seconds, 60), 2, '0')) AS game_score,
+        print_date AS game_date,
+        1 AS added_rank
+    FROM games.nyt_history
+    WHERE print_date BETWEEN %(start_date)s AND %(end_date)s
+        AND 'daily' = %(game_name)s
+        AND puzzle_type = 'daily'
+        AND solved = 1
+),
+all_games AS (
+    SELECT
+        x.game_date,
+        x.game_name,
+        x.user_name,
+        g.scoring_type,
+        CASE
+            WHEN g.scoring_type = 'timed'
+                THEN cast((substring_index(x.game_score, ':', 1) * 60) + substring_index(x.game_score, ':', -1) as signed)
+            WHEN g.scoring_type = 'guesses' THEN
+                CASE
+                    WHEN left(x.game_score, 1) IN ('X', '?') THEN 0
+                    WHEN regexp_like(substring_index(x.game_score, '/', 1), '^-?[0-9]+$') THEN cast(substring_index(x.game_score, '/', 1) as signed)
+                    WHEN left(x.game_score, 1) = '+' THEN cast(replace(x.game_score, '+', '') as signed)
+                    ELSE NULL
+                END
+            WHEN g.scoring_type = 'points' THEN
+                CASE WHEN regexp_like(x.game_score, '^-?[0-9]+$') THEN cast(x.game_score as signed) ELSE NULL END
+        END AS score_as_int,
+        CASE
+            WHEN left(x.game_score, 1) IN ('X', '?') OR (x.game_name = 'boxoffice' AND x.game_score = '0') THEN 0
+            ELSE 1
+        END AS game_completed
+    FROM latest_records x
+    LEFT JOIN games.game_details g
+        ON x.game_name = g.game_name
+    WHERE x.added_rank = 1
+),
+games_by_guild AS (
+    SELECT
+        x.game_name,
+        x.score_as_int,
+        x.game_completed,
+        CASE
+            WHEN x.game_completed = 0 THEN NULL
+            WHEN x.scoring_type IN ('timed', 'guesses')
+                THEN DENSE_RANK() OVER (PARTITION BY guild_nm, x.game_date, x.game_name ORDER BY x.game_completed DESC, x.score_as_int)
+            WHEN x.scoring_type = 'points'
+                THEN DENSE_RANK() OVER (PARTITION BY guild_nm, x.game_date, x.game_name ORDER BY x.score_as_int DESC)
+        END AS game_rank,
+        player_name
+    FROM all_games x
+    JOIN matt.user_view y
+        ON lower(x.user_name) = lower(member_nm) OR lower(x.user_name) = lower(alt_member_nm)
+    WHERE guild_nm = 'global'
+),
+mini_latest AS (
+    SELECT
+        x.game_date,
+        x.player_id,
+        x.game_time,
+        x.added_ts
+    FROM (
+        SELECT
+            game_date,
+            player_id,
+            game_time,
+            added_ts,
+            ROW_NUMBER() OVER (PARTITION BY game_date, player_id ORDER BY added_ts) AS added_rank
+        FROM matt.mini_history
+        WHERE game_date BETWEEN %(start_date)s AND %(end_date)s
+            AND 'mini' = %(game_name)s
+    ) x
+    WHERE x.added_rank = 1
+    UNION ALL
+    SELECT
+        print_date,
+        CASE
+            WHEN player_name = 'Brice' THEN 'acowinthecrowd'
+            WHEN player_name = 'Whit' THEN 'croasus'
+            WHEN player_name = 'Zach' THEN 'Throoper'
+            WHEN player_name = 'Matt' THEN 'Matt'
+            WHEN player_name = 'Sally' THEN 'mama56'
+            WHEN player_name = 'Andy' THEN 'Andy'
+            WHEN player_name = 'Ryan' THEN 'Tuckle'
+            WHEN player_name = 'Andrew' THEN 'aromatt'
+            WHEN player_name = 'Ben' THEN 'Benji'
+            WHEN player_name = 'Steve' THEN 'RabbiFerret'
+            ELSE player_name
+        END AS player_id,
+        concat(floor(solving_seconds / 60), ':', lpad(mod(solving_seconds, 60), 2, '0')) AS game_time,
+        left(solved_datetime, 19) AS added_ts
+    FROM games.nyt_history
+    WHERE print_date BETWEEN %(start_date)s AND %(end_date)s
+        AND 'mini' = %(game_name)s
+        AND puzzle_type = 'mini'
+        AND solved = 1
+),
+mini_no_dupes AS (
+    SELECT
+        mini_latest.*,
+        ROW_NUMBER() OVER (PARTITION BY game_date, player_id ORDER BY added_ts DESC) AS rnk
+    FROM mini_latest
+),
+mini AS (
+    SELECT DISTINCT
+        guild_id,
+        guild_nm,
+        x.game_date,
+        player_name,
+        member_nm,
+        x.game_time,
+        (60 * substring_index(x.game_time, ':', 1)) + substring_index(x.game_time, ':', -1) AS seconds,
+        x.added_ts,
+        DENSE_RANK() OVER (
+            PARTITION BY guild_nm, x.game_date
+            ORDER BY (60 * substring_index(x.game_time, ':', 1)) + substring_index(x.game_time, ':', -1)
+        ) AS game_rank
+    FROM mini_no_dupes x
+    JOIN matt.user_view y
+        ON lower(x.player_id) = lower(nyt_id)
+    WHERE x.rnk = 1
+        AND guild_id = 'global'
+),
+combined AS (
+    SELECT
+        game_name,
+        player_name,
+        game_rank,
+        cast(CASE WHEN game_completed = 0 THEN 0 ELSE pow(11 - game_rank, 2) END as signed) AS points,
+        CASE WHEN score_as_int = 0 THEN NULL ELSE score_as_int END AS seconds
+    FROM games_by_guild
+    UNION ALL
+    SELECT
+        'mini' AS game_name,
+        player_name,
+        game_rank,
+        cast(CASE WHEN game_rank > 10 THEN 0 ELSE pow(11 - game_rank, 2) END as signed) AS points,
+        seconds
+    FROM mini
+)
+SELECT
+    %(game_name)s AS game_name,
+    %(start_date)s AS month_start,
+    player_name,
+    COUNT(*) AS games,
+    SUM(points) AS points,
+    SUM(case when game_name = 'daily' then (seconds / 60.0) else seconds end) AS score_sum,
+    COUNT(seconds) AS score_count,
+    COUNT(CASE WHEN game_rank = 1 THEN 1 END) AS first_place,
+    COUNT(CASE WHEN game_rank = 2 THEN 1 END) AS second_place,
+    COUNT(CASE WHEN game_rank = 3 THEN 1 END) AS third_place,
+    COUNT(CASE WHEN game_rank = 4 THEN 1 END) AS fourth_place,
+    COUNT(CASE WHEN game_rank = 5 THEN 1 END) AS fifth_place,
+    %(refreshed_ts)s AS refreshed_ts
+FROM combined
+WHERE game_name = %(game_name)s
+GROUP BY player_name
+ON DUPLICATE KEY UPDATE
+    games = VALUES(games),
+    points = VALUES(points),
+    score_sum = VALUES(score_sum),
+    score_count = VALUES(score_count),
+    first_place = VALUES(first_place),
+    second_place = VALUES(second_place),
+    third_place = VALUES(third_place),
+    fourth_place = VALUES(fourth_place),
+    fifth_place = VALUES(fifth_place),
+    refreshed_ts = VALUES(refreshed_ts)
@@ -0,0 +1,10 @@
+-- Cheap change check for everything scored on one date (daily winners and other
+-- end-of-day posts): row counts and latest timestamps per source table. Each
+-- subquery is an index range scan on the table's date column.
+SELECT
+    (SELECT count(*) FROM games.game_history WHERE game_date = %(game_date)s) AS game_rows,
+    (SELECT max(added_ts) FROM games.game_history WHERE game_date = %(game_date)s) AS game_latest,
+    (SELECT count(*) FROM games.nyt_history WHERE print_date = %(game_date)s) AS nyt_rows,
+    (SELECT max(solved_datetime) FROM games.nyt_history WHERE print_date = %(game_date)s) AS nyt_latest,
+    (SELECT count(*) FROM matt.mini_history WHERE game_date = %(game_date)s) AS mini_rows,
+    (SELECT max(added_ts) FROM matt.mini_history WHERE game_date = %(game_date)s) AS mini_latest
@@ -0,0 +1,7 @@
+select 
+    player_name,
+    game_time
+from matt.mini_view
+where game_date = %s
+and game_rank = 1
+and guild_nm = 'Global'
@@ -0,0 +1,522 @@
+-- Local SQLite stand-in for the games/matt MySQL schemas
+-- Used by bot.functions.local_db for offline benchmarks and tests.
+-- Schema-qualified names are flattened: games.game_history -> games_game_history.
+-- Views are ports of files/queries/views/*.sql and must return the same rows.
+
+-- ============================================================
+-- Tables
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS games_game_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    added_ts TEXT,
+    user_name TEXT COLLATE NOCASE,
+    game_name TEXT COLLATE NOCASE,
+    game_score TEXT,
+    game_date TEXT,
+    game_detail TEXT,
+    game_bonuses TEXT,
+    source_desc TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_game_history_date_game ON games_game_history (game_date, game_name);
+CREATE INDEX IF NOT EXISTS idx_game_history_user ON games_game_history (user_name, game_name, game_date);
+
+CREATE TABLE IF NOT EXISTS games_nyt_history (
+    print_date TEXT,
+    player_name TEXT COLLATE NOCASE,
+    puzzle_type TEXT COLLATE NOCASE,
+    solving_seconds INTEGER,
+    solved INTEGER,
+    clean_solve INTEGER,
+    percent_filled INTEGER,
+    star TEXT,
+    solved_datetime TEXT,
+    bot_added_ts TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_nyt_history_date ON games_nyt_history (print_date, puzzle_type);
+
+CREATE TABLE IF NOT EXISTS matt_mini_history (
+    game_date TEXT,
+    player_id TEXT COLLATE NOCASE,
+    game_time TEXT,
+    added_ts TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_mini_history_date ON matt_mini_history (game_date);
+
+CREATE TABLE IF NOT EXISTS games_xref_users (
+    sys_name TEXT,
+    sys_user TEXT COLLATE NOCASE,
+    player_name TEXT
+);
+
+CREATE TABLE IF NOT EXISTS games_game_details (
+    game_name TEXT PRIMARY KEY COLLATE NOCASE,
+    scoring_type TEXT
+);
+
+CREATE TABLE IF NOT EXISTS games_octordle_xref (
+    game_nbr INTEGER PRIMARY KEY,
+    game_date TEXT
+);
+
+CREATE TABLE IF NOT EXISTS matt_user_details (
+    player_name TEXT,
+    discord_id TEXT COLLATE NOCASE,
+    discord_id_nbr INTEGER,
+    nyt_id TEXT COLLATE NOCASE,
+    phone_nbr TEXT,
+    phone_carr_cd TEXT,
+    mini_warning_text INTEGER,
+    mini_warning_tag INTEGER,
+    warning_hours INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS matt_user_history (
+    member_id INTEGER,
+    member_nm TEXT COLLATE NOCASE,
+    guild_id TEXT,
+    guild_nm TEXT
+);
+
+CREATE TABLE IF NOT EXISTS games_mini_warning_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    warning_date TEXT,
+    player_name TEXT,
+    discord_id_nbr INTEGER,
+    warning_sent INTEGER,
+    success INTEGER,
+    error_message TEXT,
+    warning_type TEXT,
+    warning_timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+    -- legacy text-warning columns still read by mini_not_completed
+    user_name TEXT,
+    warning_dttm TEXT,
+    message_status TEXT,
+    UNIQUE (warning_date, discord_id_nbr, warning_type)
+);
+
+-- files/queries/tables/games_daily_standings.sql
+CREATE TABLE IF NOT EXISTS games_daily_standings (
+    game_name TEXT NOT NULL COLLATE NOCASE,
+    game_date TEXT NOT NULL,
+    player_name TEXT NOT NULL COLLATE NOCASE,
+    game_rank INTEGER,
+    points INTEGER,
+    game_score TEXT,
+    score_as_int INTEGER,
+    game_completed REAL,
+    game_detail TEXT,
+    game_bonuses TEXT,
+    added_ts TEXT,
+    refreshed_ts TEXT NOT NULL,
+    PRIMARY KEY (game_name, game_date, player_name)
+);
+CREATE INDEX IF NOT EXISTS idx_daily_standings_date_rank ON games_daily_standings (game_date, game_rank);
+
+-- files/queries/tables/games_monthly_rollups.sql
+CREATE TABLE IF NOT EXISTS games_monthly_rollups (
+    game_name TEXT NOT NULL COLLATE NOCASE,
+    month_start TEXT NOT NULL,
+    player_name TEXT NOT NULL COLLATE NOCASE,
+    games INTEGER NOT NULL,
+    points INTEGER,
+    score_sum REAL,
+    score_count INTEGER NOT NULL,
+    first_place INTEGER NOT NULL,
+    second_place INTEGER NOT NULL,
+    third_place INTEGER NOT NULL,
+    fourth_place INTEGER NOT NULL,
+    fifth_place INTEGER NOT NULL,
+    refreshed_ts TEXT NOT NULL,
+    PRIMARY KEY (game_name, month_start, player_name)
+);
+
+CREATE TABLE IF NOT EXISTS games_monthly_rollup_months (
+    game_name TEXT NOT NULL COLLATE NOCASE,
+    month_start TEXT NOT NULL,
+    refreshed_ts TEXT NOT NULL,
+    PRIMARY KEY (game_name, month_start)
+);
+
+-- ============================================================
+-- Views
+-- ============================================================
+
+CREATE VIEW IF NOT EXISTS matt_user_view AS
+WITH
+discord_members AS (
+    SELECT
+        member_id,
+        MAX(CASE WHEN nm_rank = 1 THEN member_nm END) AS member_nm,
+        MAX(CASE WHEN nm_rank = 2 THEN member_nm END) AS alt_member_nm
+    FROM (
+        SELECT
+            member_id,
+            member_nm,
+            RANK() OVER (PARTITION BY member_id ORDER BY CASE WHEN member_nm LIKE '%#%' THEN 1 ELSE 0 END) AS nm_rank
+        FROM (SELECT DISTINCT member_id, member_nm FROM matt_user_history)
+    )
+    GROUP BY member_id
+),
+guild_users AS (
+    SELECT a.member_id, a.member_nm, a.alt_member_nm, b.guild_id, b.guild_nm
+    FROM discord_members a
+    JOIN (SELECT DISTINCT member_id, guild_id, guild_nm FROM matt_user_history) b
+        ON a.member_id = b.member_id
+)
+SELECT DISTINCT
+    c.player_name,
+    c.nyt_id,
+    a.member_id,
+    a.member_nm,
+    a.alt_member_nm,
+    COALESCE(a.guild_id, 'Global') COLLATE NOCASE AS guild_id,
+    COALESCE(a.guild_nm, 'Global') COLLATE NOCASE AS guild_nm
+FROM matt_user_details c
+LEFT JOIN guild_users a
+    ON a.member_nm = c.discord_id OR a.alt_member_nm = c.discord_id
+UNION
+SELECT DISTINCT
+    c.player_name,
+    c.nyt_id,
+    a.member_id,
+    a.member_nm,
+    a.alt_member_nm,
+    'Global' COLLATE NOCASE AS guild_id,
+    'Global' COLLATE NOCASE AS guild_nm
+FROM matt_user_details c
+JOIN guild_users a
+    ON a.member_nm = c.discord_id OR a.alt_member_nm = c.discord_id;
+
+CREATE VIEW IF NOT EXISTS games_daily_view AS
+WITH
+raw_games AS (
+    SELECT
+        game_date,
+        game_detail,
+        source_desc,
+        user_name,
+        (upper(substr(game_name, 1, 1)) || lower(substr(game_name, 2))) COLLATE NOCASE AS game_name,
+        game_score,
+        CASE
+            WHEN game_score LIKE '%:%' AND regexp_like(game_score, '^[0-9]+:[0-5][0-9]$')
+                THEN CAST(substring_index(game_score, ':', 1) AS INTEGER) * 60 + CAST(substring_index(game_score, ':', -1) AS INTEGER)
+            WHEN game_score LIKE '%/%' AND regexp_like(substring_index(game_score, '/', 1), '^-?[0-9]+$')
+                THEN CAST(substring_index(game_score, '/', 1) AS INTEGER)
+            WHEN game_score LIKE '+%' AND regexp_like(replace(game_score, '+', ''), '^[0-9]+$')
+                THEN CAST(replace(game_score, '+', '') AS INTEGER)
+            WHEN substr(game_score, 1, 1) IN ('X', '?')
+                THEN 0
+            WHEN regexp_like(game_score, '^-?[0-9]+$')
+                THEN CAST(game_score AS INTEGER)
+            ELSE NULL
+        END AS score_as_int,
+        game_bonuses,
+        added_ts,
+        CASE WHEN game_score LIKE '%X%' OR game_score LIKE '%?%' THEN 0 ELSE 1 END AS game_completed
+    FROM games_game_history
+),
+raw_nyt AS (
+    SELECT
+        print_date AS game_date,
+        dayname(print_date) AS game_detail,
+        'NYT_Automated' AS source_desc,
+        player_name AS user_name,
+        puzzle_type COLLATE NOCASE AS game_name,
+        CASE
+            WHEN solving_seconds >= 3600
+                THEN (solving_seconds / 3600) || ':' || printf('%02d', (solving_seconds % 3600) / 60) || ':' || printf('%02d', solving_seconds % 60)
+            ELSE (solving_seconds / 60) || ':' || printf('%02d', solving_seconds % 60)
+        END AS game_score,
+        CASE WHEN solved = 0 THEN 100 - CAST(percent_filled AS INTEGER) ELSE CAST(solving_seconds AS INTEGER) END AS score_as_int,
+        CASE
+            WHEN puzzle_type <> 'daily' THEN NULL
+            WHEN star IS NOT NULL THEN 'Gold!'
+            WHEN solved = 1 AND clean_solve = 1 THEN 'Solved clean'
+            WHEN solved = 1 THEN 'Solved with help'
+            ELSE 'Solving... ' || CAST(percent_filled AS TEXT) || '%'
+        END AS game_bonuses,
+        bot_added_ts AS added_ts,
+        CASE
+            WHEN solved = 1 AND clean_solve = 1 THEN 1
+            WHEN solved = 1 AND clean_solve = 0 THEN 0.5
+            ELSE 0
+        END AS game_completed
+    FROM games_nyt_history
+    WHERE puzzle_type <> 'mini' OR percent_filled >= 100
+),
+raw_nyt_legacy AS (
+    SELECT
+        game_date,
+        dayname(game_date) AS game_detail,
+        'NYT_Legacy' AS source_desc,
+        player_id AS user_name,
+        'Mini' COLLATE NOCASE AS game_name,
+        game_time AS game_score,
+        CASE
+            WHEN game_time LIKE '%:%' AND regexp_like(game_time, '^[0-9]+:[0-5][0-9]$')
+                THEN CAST(substring_index(game_time, ':', 1) AS INTEGER) * 60 + CAST(substring_index(game_time, ':', -1) AS INTEGER)
+            ELSE NULL
+        END AS score_as_int,
+        NULL AS game_bonuses,
+        added_ts,
+        1 AS game_completed
+    FROM matt_mini_history
+),
+raw_data AS (
+    SELECT * FROM raw_games
+    UNION ALL
+    SELECT * FROM raw_nyt
+    UNION ALL
+    SELECT * FROM raw_nyt_legacy
+),
+added_user AS (
+    SELECT
+        x.*,
+        COALESCE(y.player_name, x.user_name) AS player_name,
+        ROW_NUMBER() OVER (
+            PARTITION BY x.game_date, x.game_name, COALESCE(y.player_name, x.user_name)
+            ORDER BY x.added_ts DESC
+        ) AS row_nbr
+    FROM raw_data x
+    LEFT JOIN games_xref_users y
+        ON x.source_desc = y.sys_name AND x.user_name = y.sys_user
+),
+deduped_and_ranked AS (
+    SELECT
+        *,
+        CASE
+            WHEN game_completed = 0 THEN NULL
+            WHEN game_name IN ('timeguessr', 'boxoffice')
+                THEN RANK() OVER (PARTITION BY game_date, game_name ORDER BY game_completed DESC, score_as_int DESC)
+            ELSE RANK() OVER (PARTITION BY game_date, game_name ORDER BY game_completed DESC, score_as_int)
+        END AS game_rank
+    FROM added_user
+    WHERE row_nbr = 1
+)
+SELECT
+    game_date,
+    game_name,
+    game_rank,
+    player_name,
+    user_name,  -- not in the extracted view file, but daily_myscores.sql reads it
+    game_score,
+    score_as_int,
+    game_completed,
+    CASE WHEN game_rank > 10 THEN 0 ELSE pow(11 - game_rank, 2) END AS points,
+    game_detail,
+    game_bonuses,
+    date_format(added_ts, '%l:%i%p') AS added_at
+FROM deduped_and_ranked
+ORDER BY game_date, game_name, COALESCE(game_rank, 9999);
+
+CREATE VIEW IF NOT EXISTS matt_mini_view AS
+WITH
+mini_history_latest AS (
+    SELECT game_date, player_id, game_time, added_ts, added_rank, 0 AS from_cookie
+    FROM (
+        SELECT
+            game_date,
+            player_id,
+            game_time,
+            added_ts,
+            ROW_NUMBER() OVER (PARTITION BY game_date, player_id ORDER BY added_ts) AS added_rank
+        FROM matt_mini_history
+    )
+    WHERE added_rank = 1
+    UNION ALL
+    SELECT
+        print_date,
+        player_name AS player_id,
+        (solving_seconds / 60) || ':' || printf('%02d', solving_seconds % 60) AS game_time,
+        substr(solved_datetime, 1, 19) AS added_ts,
+        1 AS added_rank,
+        1 AS from_cookie
+    FROM games_nyt_history
+    WHERE puzzle_type = 'mini' AND solved = 1
+),
+mini_history_no_dupes AS (
+    SELECT
+        *,
+        ROW_NUMBER() OVER (PARTITION BY game_date, player_id ORDER BY added_ts DESC) AS rnk
+    FROM mini_history_latest
+),
+mini AS (
+    SELECT DISTINCT
+        guild_id,
+        guild_nm,
+        x.game_date,
+        player_name,
+        member_nm,
+        x.game_time,
+        60 * CAST(substring_index(x.game_time, ':', 1) AS INTEGER) + CAST(substring_index(x.game_time, ':', -1) AS INTEGER) AS seconds,
+        DENSE_RANK() OVER (PARTITION BY player_name ORDER BY x.game_date) AS player_game_nbr,
+        x.added_ts,
+        DENSE_RANK() OVER (
+            PARTITION BY guild_nm, x.game_date
+            ORDER BY 60 * CAST(substring_index(x.game_time, ':', 1) AS INTEGER) + CAST(substring_index(x.game_time, ':', -1) AS INTEGER)
+        ) AS game_rank,
+        x.from_cookie
+    FROM mini_history_no_dupes x
+    JOIN matt_user_view y
+        ON lower(x.player_id) = lower(nyt_id)
+    WHERE x.rnk = 1 AND guild_id = 'global'
+)
+SELECT
+    guild_id,
+    guild_nm,
+    game_date,
+    player_name,
+    member_nm,
+    game_time,
+    seconds,
+    player_game_nbr,
+    added_ts,
+    game_rank,
+    CASE WHEN game_rank > 10 THEN 0 ELSE pow(11 - game_rank, 2) END AS points
+FROM mini;
+
+CREATE VIEW IF NOT EXISTS games_game_view AS
+WITH
+latest_records AS (
+    SELECT
+        id, added_ts, user_name, game_name, game_score, game_date, game_detail, game_bonuses, source_desc,
+        ROW_NUMBER() OVER (PARTITION BY game_name, game_date, user_name ORDER BY added_ts DESC) AS added_rank
+    FROM games_game_history
+    UNION ALL
+    SELECT
+        NULL, NULL, player_name, 'daily',
+        (solving_seconds / 60) || ':' || printf('%02d', solving_seconds % 60),
+        print_date, NULL, NULL, NULL, 1
+    FROM games_nyt_history
+    WHERE puzzle_type = 'daily' AND solved = 1
+),
+all_games AS (
+    SELECT
+        x.game_date,
+        x.game_name,
+        x.game_score,
+        x.added_ts,
+        x.user_name,
+        x.game_detail,
+        g.scoring_type,
+        CASE
+            WHEN g.scoring_type = 'timed'
+                THEN CAST(substring_index(x.game_score, ':', 1) AS INTEGER) * 60 + CAST(substring_index(x.game_score, ':', -1) AS INTEGER)
+            WHEN g.scoring_type = 'guesses' THEN
+                CASE
+                    WHEN substr(x.game_score, 1, 1) IN ('X', '?') THEN 0
+                    WHEN regexp_like(substring_index(x.game_score, '/', 1), '^-?[0-9]+$') THEN CAST(substring_index(x.game_score, '/', 1) AS INTEGER)
+                    WHEN substr(x.game_score, 1, 1) = '+' THEN CAST(replace(x.game_score, '+', '') AS INTEGER)
+                    ELSE NULL
+                END
+            WHEN g.scoring_type = 'points' THEN
+                CASE WHEN regexp_like(x.game_score, '^-?[0-9]+$') THEN CAST(x.game_score AS INTEGER) ELSE NULL END
+        END AS score_as_int,
+        CASE
+            WHEN substr(x.game_score, 1, 1) IN ('X', '?') OR (x.game_name = 'boxoffice' AND x.game_score = '0') THEN 0
+            ELSE 1
+        END AS game_completed
+    FROM latest_records x
+    LEFT JOIN games_game_details g
+        ON x.game_name = g.game_name
+    WHERE x.added_rank = 1
+),
+games_by_guild AS (
+    SELECT
+        x.*,
+        CASE
+            WHEN x.game_completed = 0 THEN NULL
+            WHEN x.scoring_type IN ('timed', 'guesses')
+                THEN DENSE_RANK() OVER (PARTITION BY guild_nm, x.game_date, x.game_name ORDER BY x.game_completed DESC, x.score_as_int)
+            WHEN x.scoring_type = 'points'
+                THEN DENSE_RANK() OVER (PARTITION BY guild_nm, x.game_date, x.game_name ORDER BY x.score_as_int DESC)
+        END AS game_rank,
+        player_name,
+        member_nm
+    FROM all_games x
+    JOIN matt_user_view y
+        ON lower(x.user_name) = lower(member_nm) OR lower(x.user_name) = lower(alt_member_nm)
+    WHERE guild_nm = 'global'
+),
+combined AS (
+    SELECT
+        game_name,
+        game_date,
+        player_name,
+        member_nm,
+        game_score,
+        game_rank,
+        game_completed,
+        CAST(CASE WHEN game_completed = 0 THEN 0 ELSE pow(11 - game_rank, 2) END AS INTEGER) AS points,
+        CASE WHEN score_as_int = 0 THEN NULL ELSE score_as_int END AS seconds,
+        added_ts,
+        game_detail
+    FROM games_by_guild
+    UNION ALL
+    SELECT
+        'mini',
+        game_date,
+        player_name,
+        member_nm,
+        game_time,
+        game_rank,
+        1,
+        CAST(points AS INTEGER),
+        seconds,
+        added_ts,
+        NULL
+    FROM matt_mini_view
+    WHERE guild_id = 'global'
+)
+SELECT
+    *,
+    ROW_NUMBER() OVER (PARTITION BY player_name, game_name ORDER BY game_date) AS player_game_nbr
+FROM combined;
+
+CREATE VIEW IF NOT EXISTS matt_mini_not_completed AS
+WITH
+users AS (
+    SELECT *
+    FROM (
+        SELECT
+            player_name, discord_id, discord_id_nbr, nyt_id, phone_nbr, phone_carr_cd,
+            mini_warning_text, mini_warning_tag, warning_hours,
+            ROW_NUMBER() OVER (PARTITION BY player_name ORDER BY CASE WHEN discord_id LIKE '%#%' THEN 1 ELSE 0 END) AS id_rank
+        FROM matt_user_details
+    )
+    WHERE id_rank = 1
+),
+details AS (
+    SELECT DISTINCT
+        x.player_name,
+        x.discord_id,
+        x.discord_id_nbr,
+        x.phone_nbr,
+        x.phone_carr_cd,
+        COALESCE(x.mini_warning_text, 0) AS wants_text,
+        COALESCE(x.mini_warning_tag, CASE WHEN z.player_id IS NOT NULL THEN 1 ELSE 0 END) AS wants_tag
+    FROM users x
+    LEFT JOIN (SELECT DISTINCT player_id FROM matt_mini_history WHERE game_date = date('now', 'localtime')) y
+        ON x.nyt_id = y.player_id
+    LEFT JOIN (SELECT DISTINCT player_id FROM matt_mini_history WHERE game_date >= date('now', 'localtime', '-7 days')) z
+        ON x.nyt_id = z.player_id
+    WHERE y.player_id IS NULL AND z.player_id IS NOT NULL
+),
+notification_history AS (
+    SELECT user_name AS player_name, MAX(warning_dttm) AS last_msg_sent
+    FROM games_mini_warning_history
+    WHERE message_status = 'Sent'
+    GROUP BY user_name
+)
+SELECT
+    a.player_name,
+    a.discord_id,
+    a.discord_id_nbr,
+    a.wants_text,
+    a.wants_tag,
+    b.last_msg_sent,
+    CAST((julianday('now', 'localtime') - julianday(b.last_msg_sent)) * 24 AS INTEGER) AS hours_since_last_text
+FROM details a
+LEFT JOIN notification_history b
+    ON a.player_name = b.player_name;
@@ -0,0 +1,11 @@
+-- Table: games.bot_task_state
+-- State the task leader hands over to the next one (see bot/connections/task_leader.py):
+-- the scheduler's last fire times and the current mini leaders. Maintained by
+-- bot/functions/shared_state.py; each process also keeps a copy in its local state store.
+
+CREATE TABLE IF NOT EXISTS games.bot_task_state (
+    state_key VARCHAR(255) NOT NULL,
+    value_json TEXT NOT NULL,
+    updated_ts DATETIME NOT NULL,
+    PRIMARY KEY (state_key)
+);
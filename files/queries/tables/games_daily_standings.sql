@@ -0,0 +1,22 @@
+-- Table: games.daily_standings
+-- One row per (game, date, player) with the same rank/points/score as games.daily_view.
+-- Maintained by bot/functions/daily_standings.py: each score insert re-ranks its
+-- (game_name, game_date) partition, and the reconcile_daily_standings task rebuilds
+-- recent partitions to pick up rows written outside the bot (NYT history).
+
+CREATE TABLE IF NOT EXISTS games.daily_standings (
+    game_name VARCHAR(50) NOT NULL,
+    game_date DATE NOT NULL,
+    player_name VARCHAR(100) NOT NULL,
+    game_rank INT NULL,
+    points INT NULL,
+    game_score VARCHAR(50) NULL,
+    score_as_int INT NULL,
+    game_completed DECIMAL(2,1) NULL,
+    game_detail VARCHAR(255) NULL,
+    game_bonuses VARCHAR(255) NULL,
+    added_ts DATETIME NULL,
+    refreshed_ts DATETIME(6) NOT NULL,
+    PRIMARY KEY (game_name, game_date, player_name),
+    KEY idx_daily_standings_date_rank (game_date, game_rank)
+);
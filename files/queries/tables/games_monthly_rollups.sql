@@ -0,0 +1,32 @@
+-- Tables: games.monthly_rollups, games.monthly_rollup_months
+-- Per (game, month, player) totals of what game_aggregate_stats.sql adds up per day:
+-- games played, points, the score sum/count behind the average and the 1st-5th finishes.
+-- Ranks are per day, so whole months add up exactly; range leaderboards sum the months
+-- inside the range and only rank the partial months at its edges from the source tables.
+-- Maintained by bot/functions/monthly_rollups.py (see refresh_monthly_rollup.sql).
+-- monthly_rollup_months records which (game, month) pairs have been built, including
+-- months nobody played, so an unbuilt month is never mistaken for an empty one.
+
+CREATE TABLE IF NOT EXISTS games.monthly_rollups (
+    game_name VARCHAR(50) NOT NULL,
+    month_start DATE NOT NULL,
+    player_name VARCHAR(100) NOT NULL,
+    games INT NOT NULL,
+    points INT NULL,
+    score_sum DOUBLE NULL,
+    score_count INT NOT NULL,
+    first_place INT NOT NULL,
+    second_place INT NOT NULL,
+    third_place INT NOT NULL,
+    fourth_place INT NOT NULL,
+    fifth_place INT NOT NULL,
+    refreshed_ts DATETIME(6) NOT NULL,
+    PRIMARY KEY (game_name, month_start, player_name)
+);
+
+CREATE TABLE IF NOT EXISTS games.monthly_rollup_months (
+    game_name VARCHAR(50) NOT NULL,
+    month_start DATE NOT NULL,
+    refreshed_ts DATETIME(6) NOT NULL,
+    PRIMARY KEY (game_name, month_start)
+);